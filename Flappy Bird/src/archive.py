@@ -0,0 +1,151 @@
+"""
+Hash-indexed genome archive used for the hall of fame.
+
+Genomes are keyed by a content hash of their weight bytes, so membership
+tests are O(1) instead of comparing ``tuple(weights.tolist())`` against every
+entry. The archive keeps the ``capacity`` fittest distinct genomes in a
+min-heap ordered by fitness. With ``quantum`` set, genomes that round to the
+same grid cell are treated as near-duplicates of each other.
+"""
+import hashlib
+import heapq
+import itertools
+
+import numpy as np
+
+
+def genome_key(genome):
+    """
+    Content hash of a genome's weight bytes.
+
+    Args:
+        genome (np.ndarray): Flat genome.
+
+    Returns:
+        bytes: 16-byte BLAKE2b digest.
+    """
+    return hashlib.blake2b(np.ascontiguousarray(genome).tobytes(), digest_size=16).digest()
+
+
+class GenomeArchive:
+    """
+    Bounded top-K archive of distinct genomes ordered by fitness.
+
+    Attributes:
+        capacity (int): Maximum number of genomes kept.
+        quantum (float or None): Grid size for near-duplicate detection.
+    """
+    def __init__(self, capacity=5, quantum=None):
+        """
+        Initialize an empty archive.
+
+        Args:
+            capacity (int): Maximum number of genomes kept.
+            quantum (float, optional): When set, genomes whose weights round
+                to the same multiples of ``quantum`` count as duplicates.
+        """
+        self.capacity = capacity
+        self.quantum = quantum
+        self._entries = {}   # key -> (fitness, seq, genome, payload)
+        self._heap = []      # (fitness, -seq, key), may hold stale entries
+        self._seq = itertools.count()
+
+    def key(self, genome):
+        """Archive key of ``genome``: exact or quantized content hash."""
+        if self.quantum is None:
+            return genome_key(genome)
+        return genome_key(np.round(np.asarray(genome) / self.quantum).astype(np.int64))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, genome):
+        return self.key(genome) in self._entries
+
+    def min_fitness(self):
+        """Fitness an entry must beat to enter a full archive."""
+        self._drop_stale()
+        if len(self._entries) < self.capacity or not self._heap:
+            return -np.inf
+        return self._heap[0][0]
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap:
+            fitness, neg_seq, key = heap[0]
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == -neg_seq:
+                return
+            heapq.heappop(heap)
+
+    def add(self, genome, fitness, payload=None):
+        """
+        Offer a genome to the archive.
+
+        A duplicate only replaces its existing entry when it is strictly
+        fitter; on ties the entry already in the archive wins, as does the
+        weakest entry of a full archive.
+
+        Args:
+            genome (np.ndarray): Flat genome. A copy is stored.
+            fitness (float): Fitness of the genome.
+            payload: Optional object kept alongside (e.g. the ``Bird``).
+
+        Returns:
+            bool: True if the archive changed.
+        """
+        key = self.key(genome)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if fitness <= entry[0]:
+                return False
+        elif len(self._entries) >= self.capacity:
+            if fitness <= self.min_fitness():
+                return False
+            _, neg_seq, weakest = heapq.heappop(self._heap)
+            del self._entries[weakest]
+        seq = next(self._seq)
+        self._entries[key] = (fitness, seq, np.array(genome), payload)
+        # Earlier entries pop last among equal fitness, so newcomers are evicted first
+        heapq.heappush(self._heap, (fitness, -seq, key))
+        if len(self._heap) > 4 * self.capacity + 16:
+            self._heap = [(f, -s, k) for k, (f, s, _, _) in self._entries.items()]
+            heapq.heapify(self._heap)
+        return True
+
+    def add_many(self, genomes, fitness, payloads=None):
+        """
+        Offer a whole population, fittest first.
+
+        Only genomes that can still enter the archive are hashed, so adding a
+        large population to a small archive costs little more than a sort.
+
+        Args:
+            genomes (np.ndarray): Genomes of shape (n, n_params).
+            fitness (np.ndarray): Fitness of every genome.
+            payloads (list, optional): Object kept alongside each genome.
+
+        Returns:
+            int: Number of genomes that changed the archive.
+        """
+        fitness = np.asarray(fitness)
+        order = np.argsort(-fitness, kind="stable")
+        changed = 0
+        for i in order:
+            if len(self._entries) >= self.capacity and fitness[i] <= self.min_fitness():
+                break
+            changed += self.add(genomes[i], fitness[i], None if payloads is None else payloads[i])
+        return changed
+
+    def best(self, k=None):
+        """
+        Entries from fittest to weakest.
+
+        Args:
+            k (int, optional): Return at most this many entries.
+
+        Returns:
+            list: (fitness, genome, payload) tuples; equal fitness keeps insertion order.
+        """
+        entries = sorted(self._entries.values(), key=lambda e: (-e[0], e[1]))
+        return [(f, g, p) for f, _, g, p in entries[:k]]
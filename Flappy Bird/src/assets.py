@@ -0,0 +1,147 @@
+"""
+Process-wide sprite and mask cache.
+
+Each sprite is decoded from disk once; scaled surfaces and their collision
+masks are memoized by (asset, size). Pipe sizes come from a small integer
+range, so the whole pipe set can be built up front with ``preload_pipes`` and
+generation turnover then does no file I/O at all.
+
+Bird tilt is an integer clamped to [-25, 25], so ``rotated`` keeps a lookup
+table of every rotated bird sprite with its mask and center offset.
+
+pygame is imported on the first cache miss, so importing this module (and
+``bird`` or ``pipe``) does not load pygame or SDL.
+"""
+import os
+from functools import lru_cache
+
+from constants import (
+    SCREEN_HEIGHT, GROUND_HEIGHT, PIPE_WIDTH, BIRD_SIZE,
+    PIPE_HEIGHT_RANGE, PIPE_GAP_RANGE, MIN_BOTTOM_HEIGHT,
+)
+
+# Enough for every top and bottom pipe size plus the bird and backgrounds
+CACHE_SIZE = 1024
+
+BIRD_SPRITE = 'flap.png'
+BIRD_ANGLES = range(-25, 26)
+
+
+def get_asset_path(fn):
+    return os.path.join(os.path.dirname(__file__), "sprites", fn)
+
+
+@lru_cache(maxsize=None)
+def load(name, convert_alpha=False):
+    """
+    Decode a sprite from disk once per process.
+
+    Args:
+        name (str): File name inside the ``sprites`` directory.
+        convert_alpha (bool): Convert to the display's per-pixel alpha format.
+            Requires a display mode to be set.
+
+    Returns:
+        pygame.Surface: The decoded image. Shared, do not modify.
+    """
+    if convert_alpha:
+        return load(name, False).convert_alpha()
+    import pygame
+    return pygame.image.load(get_asset_path(name))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def scaled(name, size, convert_alpha=False):
+    """
+    Return ``name`` scaled to ``size``, memoized by (asset, size).
+
+    Args:
+        name (str): File name inside the ``sprites`` directory.
+        size (tuple): Target (width, height) in pixels.
+        convert_alpha (bool): Scale the alpha-converted image.
+
+    Returns:
+        pygame.Surface: The scaled image. Shared, do not modify.
+    """
+    import pygame
+    return pygame.transform.scale(load(name, convert_alpha), size)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def mask(name, size, convert_alpha=False):
+    """
+    Return the collision mask of ``scaled(name, size)``.
+
+    Args:
+        name (str): File name inside the ``sprites`` directory.
+        size (tuple): Target (width, height) in pixels.
+        convert_alpha (bool): Build the mask from the alpha-converted image.
+
+    Returns:
+        pygame.Mask: The mask. Shared, do not modify.
+    """
+    import pygame
+    return pygame.mask.from_surface(scaled(name, size, convert_alpha))
+
+
+def preload_pipes(screen_height=SCREEN_HEIGHT, ground_height=GROUND_HEIGHT, convert_alpha=True):
+    """
+    Build every pipe surface and mask a ``Pipe`` can ask for.
+
+    Args:
+        screen_height (int): Height of the game screen.
+        ground_height (int): Height of the ground strip.
+        convert_alpha (bool): Prepare the display-converted images, as
+            drawn pipes use. Headless pipes build their masks from the
+            unconverted images, which need no display.
+
+    Returns:
+        int: Number of (asset, size) entries prepared.
+    """
+    lo_h, hi_h = PIPE_HEIGHT_RANGE
+    lo_gap = PIPE_GAP_RANGE[0]
+    tops = range(lo_h, hi_h + 1)
+    bottoms = range(MIN_BOTTOM_HEIGHT, screen_height - ground_height - lo_h - lo_gap + 1)
+    for name, heights in (("pipe_top.png", tops), ("pipe_bottom.png", bottoms)):
+        for h in heights:
+            mask(name, (PIPE_WIDTH, h), convert_alpha)
+    return len(tops) + len(bottoms)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def rotated(name, size, angle):
+    """
+    Return ``scaled(name, size)`` rotated by ``angle`` degrees, with its mask.
+
+    The offset places the rotated image so it stays centered on the unrotated
+    sprite: add it to the sprite's top-left corner to get the blit position.
+
+    Args:
+        name (str): File name inside the ``sprites`` directory.
+        size (tuple): Unrotated (width, height) in pixels.
+        angle (int): Counter-clockwise rotation in degrees.
+
+    Returns:
+        tuple: (pygame.Surface, pygame.Mask, (dx, dy) offset). Shared, do not modify.
+    """
+    import pygame
+    rot = pygame.transform.rotate(scaled(name, size), angle)
+    rect = rot.get_rect(center=(size[0] // 2, size[1] // 2))
+    return rot, pygame.mask.from_surface(rot), rect.topleft
+
+
+def preload_bird(name=BIRD_SPRITE, size=(BIRD_SIZE, BIRD_SIZE), angles=BIRD_ANGLES):
+    """
+    Build the rotated sprite, mask and offset of every bird tilt angle.
+
+    Args:
+        name (str): Bird sprite file name.
+        size (tuple): Bird sprite size.
+        angles (iterable): Tilt angles to prepare.
+
+    Returns:
+        int: Number of angles prepared.
+    """
+    for a in angles:
+        rotated(name, size, a)
+    return len(angles)
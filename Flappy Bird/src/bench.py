@@ -0,0 +1,411 @@
+"""
+Benchmark suite for the training loop.
+
+Measures simulated steps and bird-steps per second of the SoA headless engine,
+steps per second of the pygame ``eval_population`` loop (including late frames
+with only a few survivors left), breeding speed of ``next_gen`` and
+``ga.breed_population``, and a per-bird ``NeuralNetwork.forward`` loop against
+one batched ``PopulationNetwork.forward``, the startup latency of a headless
+run (importing ``flappy_ai`` in a fresh interpreter and training its first
+generation), the memory per agent of classic and compact populations, and
+scoring on several courses in one ``MultiCourseSim`` batch against one run
+per course. Everything runs headless with fixed
+seeds, on a population of noisy "hover" genomes that steer toward the gap
+centre, so most birds stay alive and every run does the same work.
+
+Run ``python bench.py`` to write ``bench_results/<commit>.json``, and
+``python bench.py --compare OLD.json`` to print the speedup against an
+earlier run on the same machine.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import ga
+from budget import EvalBudget
+from constants import HEADLESS_DT_MS
+from course import Course
+from headless import HeadlessSim, MultiCourseSim
+from nn import NeuralNetwork, PopulationNetwork
+
+SUITES = ("headless", "pygame", "breed", "forward", "startup", "memory", "courses")
+POP_SIZES = (10, 100, 1_000, 10_000, 100_000)
+PYGAME_POP_SIZES = (10, 100, 1_000)
+OBJECT_BREED_SIZES = (150, 1_000, 10_000)
+STARTUP_POP = 150
+# Living birds in the late-generation benchmark
+TAIL_SURVIVORS = 10
+# Courses per genome in the multi-course benchmark
+BENCH_COURSES = 8
+
+# Run in a fresh interpreter: import the training entry point, then train one generation
+STARTUP_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import flappy_ai
+from budget import EvalBudget
+from trainer import Trainer
+imported = time.perf_counter()
+Trainer({pop}, seed={seed}, verbose=False, budget=EvalBudget(max_sim_seconds=60)).step()
+done = time.perf_counter()
+print(json.dumps({{"import_s": imported - start, "first_gen_s": done - imported,
+                  "pygame_loaded": "pygame" in sys.modules}}))
+"""
+
+
+def hover_population(n, seed=0, noise=0.3):
+    """
+    Genomes that flap whenever the bird is below the next gap centre.
+
+    Args:
+        n (int): Number of genomes.
+        seed (int): Seed of the per-weight noise.
+        noise (float): Standard deviation of the noise added to every weight.
+
+    Returns:
+        np.ndarray: Genomes of shape (n, 31) for the default 3-6-1 network.
+    """
+    genomes = np.zeros((n, ga.param_count()))
+    genomes[:, 0], genomes[:, 1] = 10.0, -10.0   # hidden 0 ~ bird y - gap centre
+    genomes[:, 24] = 5.0                          # output follows hidden 0
+    genomes += np.random.default_rng(seed).normal(scale=noise, size=genomes.shape)
+    return genomes
+
+
+def best_of(fn, repeat):
+    """Smallest wall time of ``repeat`` calls to ``fn`` and its last result."""
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def bench_headless(pop_sizes, steps, seed, repeat):
+    results = []
+    for n in pop_sizes:
+        brains = PopulationNetwork.from_weights(hover_population(n, seed))
+
+        def run():
+            sim = HeadlessSim(brains, course=Course(seed))
+            bird_steps = 0
+            for _ in range(steps):
+                if not sim.alive.any():
+                    break
+                bird_steps += int(sim.alive.sum())
+                sim.step()
+            return sim.steps, bird_steps
+
+        seconds, (done, bird_steps) = best_of(run, repeat)
+        results.append({
+            "name": "headless.step", "pop": n, "steps": done, "seconds": seconds,
+            "steps_per_s": done / seconds, "bird_steps_per_s": bird_steps / seconds,
+        })
+    return results
+
+
+def bench_pygame(pop_sizes, steps, seed, repeat):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    from flappy_ai import bird_from_weights, eval_population
+    results = []
+    for n in pop_sizes:
+        genomes = hover_population(n, seed)
+
+        if n in PYGAME_POP_SIZES:
+            def run():
+                pop = [bird_from_weights(w) for w in genomes]
+                budget = EvalBudget(max_sim_seconds=steps * HEADLESS_DT_MS / 1000)
+                eval_population(pop, course=Course(seed), budget=budget)
+                return budget.reason
+
+            seconds, reason = best_of(run, repeat)
+            # Bird lifetimes are not observable here, so only whole steps are reported;
+            # without a budget stop the population died early and the rate is a lower bound
+            results.append({
+                "name": "eval_population", "pop": n, "steps": steps, "seconds": seconds,
+                "steps_per_s": steps / seconds, "complete": reason is not None,
+            })
+
+        # Late-generation frames: everyone but the first TAIL_SURVIVORS birds is already dead
+        dead = [bird_from_weights(w) for w in genomes[TAIL_SURVIVORS:]]
+        for b in dead:
+            b.alive = False
+
+        def run_tail():
+            pop = [bird_from_weights(w) for w in genomes[:TAIL_SURVIVORS]] + dead
+            eval_population(pop, course=Course(seed),
+                            budget=EvalBudget(max_sim_seconds=steps * HEADLESS_DT_MS / 1000))
+            return sum(b.alive for b in pop)
+
+        seconds, survivors = best_of(run_tail, repeat)
+        results.append({
+            "name": "eval_population.tail", "pop": n, "steps": steps, "seconds": seconds,
+            "steps_per_s": steps / seconds, "survivors": survivors,
+        })
+    return results
+
+
+def bench_breed(pop_sizes, seed, repeat):
+    from flappy_ai import bird_from_weights, next_gen
+    results = []
+    for n in pop_sizes:
+        genomes = hover_population(n, seed)
+        fitness = np.random.default_rng(seed).random(n)
+
+        def vector():
+            return ga.breed_population(genomes, fitness, np.random.default_rng(seed))
+
+        seconds, _ = best_of(vector, repeat)
+        results.append({"name": "ga.breed_population", "pop": n, "seconds": seconds,
+                        "genomes_per_s": n / seconds})
+
+        if n in OBJECT_BREED_SIZES:
+            pop = [bird_from_weights(w) for w in genomes]
+            for b, f in zip(pop, fitness):
+                b.fitness = f
+
+            def objects():
+                random.seed(seed)
+                np.random.seed(seed)
+                return next_gen(pop, pop[:3], elite_k=3, reinject_k=3, mrate=0.04)
+
+            seconds, _ = best_of(objects, repeat)
+            results.append({"name": "next_gen", "pop": n, "seconds": seconds,
+                            "genomes_per_s": n / seconds})
+    return results
+
+
+def bench_forward(pop_sizes, seed, repeat):
+    results = []
+    rng = np.random.default_rng(seed)
+    for n in pop_sizes:
+        genomes = hover_population(n, seed)
+        X = rng.random((n, 3))
+        batched = PopulationNetwork.from_weights(genomes)
+        networks = [NeuralNetwork(params=w) for w in genomes]
+
+        single_s, _ = best_of(lambda: [nn.forward(x) for nn, x in zip(networks, X)], repeat)
+        batched_s, _ = best_of(lambda: batched.forward(X), repeat)
+        results.append({"name": "NeuralNetwork.forward", "pop": n, "seconds": single_s,
+                        "forwards_per_s": n / single_s})
+        results.append({"name": "PopulationNetwork.forward", "pop": n, "seconds": batched_s,
+                        "forwards_per_s": n / batched_s, "speedup": single_s / batched_s})
+    return results
+
+
+def bench_startup(seed, repeat):
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = STARTUP_SNIPPET.format(pop=STARTUP_POP, seed=seed)
+
+    def run():
+        out = subprocess.run([sys.executable, "-c", code], cwd=here, check=True,
+                             capture_output=True, text=True).stdout
+        return json.loads(out.strip().splitlines()[-1])
+
+    seconds, stats = best_of(run, repeat)
+    return [dict({"name": "startup.headless", "pop": STARTUP_POP, "seconds": seconds}, **stats)]
+
+
+def traced(fn):
+    """Wall time, result, and retained and peak bytes allocated by ``fn``."""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        out = fn()
+        seconds = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, out, current, peak
+
+
+def bench_memory(pop_sizes, steps, seed):
+    from flappy_ai import Bird, birds_from_genomes
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in pop_sizes:
+        def classic():
+            return [Bird(brain=NeuralNetwork()) for _ in range(n)]
+
+        def compact():
+            return birds_from_genomes(ga.init_population(n, rng, dtype=np.float32))
+
+        def simulate():
+            genomes = hover_population(n, seed).astype(np.float32)
+            sim = HeadlessSim(PopulationNetwork.from_weights(genomes), course=Course(seed))
+            sim.run(max_steps=steps)
+            return sim
+
+        for name, fn in (("memory.birds", classic), ("memory.birds_compact", compact),
+                         ("memory.headless_float32", simulate)):
+            seconds, out, current, peak = traced(fn)
+            del out
+            results.append({"name": name, "pop": n, "seconds": seconds,
+                            "bytes_per_agent": peak / n, "peak_mb": peak / 2**20,
+                            "retained_mb": current / 2**20})
+    return results
+
+
+def bench_courses(pop_sizes, steps, seed, repeat, k=BENCH_COURSES):
+    results = []
+    seeds = [seed + j for j in range(k)]
+    for n in pop_sizes:
+        genomes = hover_population(n, seed)
+        brains = PopulationNetwork.from_weights(genomes)
+
+        def budget():
+            return EvalBudget(max_sim_seconds=steps * HEADLESS_DT_MS / 1000)
+
+        def batched():
+            return MultiCourseSim(brains, [Course(s) for s in seeds]).run(budget=budget())
+
+        def separate():
+            return np.stack([HeadlessSim(brains, course=Course(s)).run(budget=budget()) for s in seeds], axis=1)
+
+        runs = [("courses.batched", batched), ("courses.headless", separate)]
+        if n in PYGAME_POP_SIZES:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            from flappy_ai import bird_from_weights, eval_population
+
+            def objects():
+                for s in seeds:
+                    eval_population([bird_from_weights(w) for w in genomes], course=Course(s), budget=budget())
+
+            runs.append(("courses.eval_population", objects))
+        for name, fn in runs:
+            seconds, _ = best_of(fn, repeat)
+            results.append({"name": name, "pop": n, "courses": k, "seconds": seconds,
+                            "genome_courses_per_s": n * k / seconds})
+    return results
+
+
+def machine_info():
+    """Interpreter, library versions and commit the results were measured on."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_suite(suites=SUITES, pop_sizes=POP_SIZES, steps=300, seed=0, repeat=3, verbose=True):
+    """
+    Run the selected benchmarks.
+
+    Args:
+        suites (iterable): Names from ``SUITES``.
+        pop_sizes (iterable): Population sizes; the pygame suite only runs
+            full populations for the ones in ``PYGAME_POP_SIZES``.
+        steps (int): Simulation steps per engine run.
+        seed (int): Seed of genomes, courses and breeding.
+        repeat (int): Runs per measurement; the fastest is kept.
+        verbose (bool): Print every result as it is measured.
+
+    Returns:
+        dict: ``meta`` (machine and settings) and ``results`` (one dict per measurement).
+    """
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        raise ValueError(f"Unknown suites {sorted(unknown)}, expected some of {SUITES}")
+    pop_sizes = list(pop_sizes)
+    results = []
+    for suite in suites:
+        if suite == "headless":
+            found = bench_headless(pop_sizes, steps, seed, repeat)
+        elif suite == "pygame":
+            found = bench_pygame(pop_sizes, steps, seed, repeat)
+        elif suite == "breed":
+            found = bench_breed(pop_sizes, seed, repeat)
+        elif suite == "forward":
+            found = bench_forward(pop_sizes, seed, repeat)
+        elif suite == "memory":
+            found = bench_memory(pop_sizes, steps, seed)
+        elif suite == "courses":
+            found = bench_courses(pop_sizes, steps, seed, repeat)
+        else:
+            found = bench_startup(seed, repeat)
+        if verbose:
+            for r in found:
+                print(format_result(r))
+        results.extend(found)
+    meta = dict(machine_info(), seed=seed, steps=steps, repeat=repeat)
+    return {"meta": meta, "results": results}
+
+
+def format_result(r):
+    parts = []
+    for k, v in r.items():
+        if k.endswith("_per_s") or k.startswith("bytes_"):
+            parts.append(f"{k}={v:,.0f}")
+        elif k.endswith("_mb"):
+            parts.append(f"{k}={v:,.1f} MB")
+        elif k.endswith("_s"):
+            parts.append(f"{k}={v * 1000:.1f} ms")
+        elif isinstance(v, bool):
+            parts.append(f"{k}={v}")
+    rates = "   ".join(parts)
+    return f"{r['name']:<26} pop={r['pop']:<7} {r['seconds'] * 1000:9.2f} ms   {rates}"
+
+
+def compare(base, new):
+    """
+    Print the speedup of every measurement in ``new`` against ``base``.
+
+    Args:
+        base (dict): Results of an earlier ``run_suite``.
+        new (dict): Results of the current ``run_suite``.
+    """
+    old = {(r["name"], r["pop"]): r["seconds"] for r in base["results"]}
+    print(f"Speedup against {base['meta'].get('commit')} (>1 is faster):")
+    for r in new["results"]:
+        key = (r["name"], r["pop"])
+        if key in old:
+            print(f"  {r['name']:<26} pop={r['pop']:<7} {old[key] / r['seconds']:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flappy Bird AI training loop benchmarks")
+    parser.add_argument("--suite", choices=SUITES, action="append",
+                        help="Benchmark to run; repeat for several (default: all)")
+    parser.add_argument("--pop-sizes", type=int, nargs="+", default=list(POP_SIZES),
+                        help="Population sizes to measure")
+    parser.add_argument("--steps", type=int, default=300, help="Simulation steps per engine run")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, fastest kept")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of genomes, courses and breeding")
+    parser.add_argument("--output", default=None,
+                        help="JSON results file (default: bench_results/<commit>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    report = run_suite(args.suite or SUITES, args.pop_sizes, args.steps, args.seed, args.repeat)
+    output = args.output or os.path.join("bench_results", f"{report['meta']['commit'] or 'latest'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
-import pygame
-import os
+import assets
+from constants import BIRD_SIZE, PIPE_SPEED
+from features import population_inputs, shared_features
 
 
 class Bird:
@@ -11,7 +12,7 @@ class Bird:
         speed (float): Current vertical speed.
         angle (int): Current tilt angle for drawing.
         last_flap_time (int): Time of last flap (ms).
-        sprite (pygame.Surface): Bird image.
+        sprite (pygame.Surface): Bird image, shared by all birds.
         brain: Neural network controlling the bird.
         alive (bool): Whether the bird is alive.
         fitness (int): Fitness score for evolution.
@@ -22,6 +23,10 @@ class Bird:
         bird_x (int): Horizontal position for drawing.
         screen_height (int): Height of the game screen.
     """
+    # No per-instance __dict__, so large populations stay small
+    __slots__ = ("y", "speed", "angle", "last_flap_time", "brain", "alive", "fitness", "is_elite",
+                 "flap_velocity", "gravity", "tilt_delay", "bird_x", "screen_height")
+
     def __init__(self, brain, is_elite=False, screen_height=600, bird_x=50, flap_velocity=-200.0, gravity=400.0, tilt_delay=500):
         """
         Initialize a Bird agent.
@@ -39,10 +44,6 @@ class Bird:
         self.speed = 0.0
         self.angle = 0
         self.last_flap_time = 0
-        self.sprite = pygame.transform.scale(
-            pygame.image.load(os.path.join(os.path.dirname(__file__), "sprites", 'flap.png')),
-            (45, 45)
-        )
         self.brain = brain
         self.alive = True
         self.fitness = 0
@@ -53,30 +54,57 @@ class Bird:
         self.bird_x = bird_x
         self.screen_height = screen_height
 
-    def flap(self):
+    @property
+    def sprite(self):
+        """Bird image, loaded on first use so headless birds never touch pygame."""
+        return assets.scaled(assets.BIRD_SPRITE, (BIRD_SIZE, BIRD_SIZE))
+
+    def flap(self, now=None):
         """
         Instantly applies upward velocity and tilts the bird up.
+
+        Args:
+            now (float, optional): Current time in ms on the same clock that is
+                passed to ``update``. Defaults to ``pygame.time.get_ticks()``.
         """
         self.speed = self.flap_velocity
-        now = pygame.time.get_ticks()
+        if now is None:
+            import pygame
+            now = pygame.time.get_ticks()
         self.last_flap_time = now
         self.angle = min(self.angle + 32, 25)
 
-    def think(self, pipes):
+    def sense(self, pipes, scroll_speed=PIPE_SPEED):
         """
-        Decides whether to flap based on neural network output and pipe positions.
+        Builds the neural network input for the next pipe ahead of the bird.
+
+        Populations should build the shared next-pipe features once per frame
+        with ``features.shared_features`` instead of calling this per bird.
 
         Args:
             pipes (list): List of Pipe objects in the game.
+            scroll_speed (float): Current pipe speed, used by networks with
+                more than three inputs.
+
+        Returns:
+            np.ndarray or None: Normalized inputs, or None if no pipe is ahead.
         """
         nxt = next((p for p in pipes if p.x + p.width > self.bird_x), None)
-        if not nxt: return
-        import numpy as np
-        inp = np.array([
-            self.y / self.screen_height,
-            (nxt.height + nxt.gap/2) / self.screen_height,
-            (nxt.x - self.bird_x) / 400
-        ])
+        if not nxt: return None
+        shared = shared_features(nxt.x, nxt.height, nxt.gap, scroll_speed,
+                                 self.bird_x, self.screen_height)
+        return population_inputs([self.y], shared, self.brain.sizes[0], self.screen_height)[0]
+
+    def think(self, pipes, scroll_speed=PIPE_SPEED):
+        """
+        Decides whether to flap based on neural network output and pipe positions.
+
+        Args:
+            pipes (list): List of Pipe objects in the game.
+            scroll_speed (float): Current pipe speed.
+        """
+        inp = self.sense(pipes, scroll_speed)
+        if inp is None: return
         if self.brain.forward(inp)[0,0] > 0.5:
             self.flap()
 
@@ -92,7 +120,7 @@ class Bird:
         """
         self.speed += self.gravity * dt_s
         self.y += self.speed * dt_s
-        if self.y > ground_y - self.sprite.get_height() or self.y < 0:
+        if self.y > ground_y - BIRD_SIZE or self.y < 0:
             self.alive = False
         if space_pressed:
             self.last_flap_time = now
@@ -106,27 +134,31 @@ class Bird:
 
         Args:
             screen (pygame.Surface): The game screen to draw on.
+
+        Returns:
+            pygame.Rect: Screen area that was drawn on.
         """
-        rot = pygame.transform.rotate(self.sprite, self.angle)
-        rect = rot.get_rect(
-            center=self.sprite.get_rect(topleft=(self.bird_x, int(self.y))).center
-        )
-        screen.blit(rot, rect.topleft)
+        import pygame
+        rot, _, (dx, dy) = assets.rotated(assets.BIRD_SPRITE, (BIRD_SIZE, BIRD_SIZE), int(self.angle))
+        pos = (self.bird_x + dx, int(self.y) + dy)
+        rect = screen.blit(rot, pos)
         if self.is_elite:
-            pygame.draw.circle(
-                screen, (255,0,0), rect.center,
-                max(rect.width, rect.height)//2 + 4, 3
-            )
+            w, h = rot.get_size()
+            rect = rect.union(pygame.draw.circle(
+                screen, (255,0,0), (pos[0] + w//2, pos[1] + h//2),
+                max(w, h)//2 + 4, 3
+            ))
+        return rect
 
     def get_mask(self):
         """
         Returns a mask and rect for pixel-perfect collision detection.
 
+        The rotated mask comes from the shared per-angle table in ``assets``.
+
         Returns:
             tuple: (pygame.Mask, pygame.Rect)
         """
-        rot = pygame.transform.rotate(self.sprite, self.angle)
-        rect = rot.get_rect(
-            center=self.sprite.get_rect(topleft=(self.bird_x, int(self.y))).center
-        )
-        return pygame.mask.from_surface(rot), rect
+        import pygame
+        rot, mask, (dx, dy) = assets.rotated(assets.BIRD_SPRITE, (BIRD_SIZE, BIRD_SIZE), int(self.angle))
+        return mask, pygame.Rect((self.bird_x + dx, int(self.y) + dy), rot.get_size())
@@ -0,0 +1,106 @@
+"""
+Per-generation evaluation budgets.
+
+A good genome never dies, so without a budget a headless generation only ends
+when the simulation is killed. ``EvalBudget`` stops a generation after a number
+of pipes, simulated seconds or wall-clock seconds. Birds still alive at that
+point keep their capped pipe count plus a tie-break bonus below half a pipe
+for flying close to the centre of the next gap.
+"""
+import time
+
+import numpy as np
+
+from constants import SCREEN_HEIGHT
+
+# Largest tie-break bonus, reached when a survivor is exactly on the gap centre
+TIEBREAK_SCALE = 0.5
+
+
+def gap_tiebreak(bird_center_y, gap_center_y, screen_height=SCREEN_HEIGHT):
+    """
+    Tie-break bonus for survivors, in [0, TIEBREAK_SCALE].
+
+    Args:
+        bird_center_y (float or np.ndarray): Vertical centre of each bird.
+        gap_center_y (float): Vertical centre of the next gap.
+        screen_height (int): Height of the game screen.
+
+    Returns:
+        float or np.ndarray: Bonus, larger when closer to the gap centre.
+    """
+    dist = np.abs(np.asarray(bird_center_y) - gap_center_y) / screen_height
+    return TIEBREAK_SCALE * (1 - np.minimum(dist, 1))
+
+
+class EvalBudget:
+    """
+    Limits on how long one generation may be simulated.
+
+    Attributes:
+        max_pipes (int or None): Stop once this many pipes have been passed.
+        max_sim_seconds (float or None): Stop after this much simulated time.
+        max_wall_seconds (float or None): Stop after this much real time.
+        reason (str or None): Which limit ended the last run, if any.
+    """
+    def __init__(self, max_pipes=None, max_sim_seconds=None, max_wall_seconds=None):
+        self.max_pipes = max_pipes
+        self.max_sim_seconds = max_sim_seconds
+        self.max_wall_seconds = max_wall_seconds
+        self.reason = None
+        self._wall_start = None
+
+    def __bool__(self):
+        return any(v is not None for v in (self.max_pipes, self.max_sim_seconds, self.max_wall_seconds))
+
+    @property
+    def deterministic(self):
+        """False when a wall-clock limit can make results depend on machine load."""
+        return self.max_wall_seconds is None
+
+    def key(self):
+        """Cache namespace component describing the deterministic limits."""
+        return f"pipes={self.max_pipes}:sim={self.max_sim_seconds}"
+
+    def start(self):
+        """Reset before a run starts."""
+        self.reason = None
+        self._wall_start = time.perf_counter()
+
+    def check(self, pipes_passed, sim_ms):
+        """
+        Check the limits after a simulation step.
+
+        Args:
+            pipes_passed (int): Pipes passed so far in this run.
+            sim_ms (float): Simulated time so far in ms.
+
+        Returns:
+            str or None: Name of the exhausted limit, also stored in ``reason``.
+        """
+        if self.max_pipes is not None and pipes_passed >= self.max_pipes:
+            self.reason = "pipes"
+        elif self.max_sim_seconds is not None and sim_ms >= self.max_sim_seconds * 1000:
+            self.reason = "sim time"
+        elif (self.max_wall_seconds is not None and self._wall_start is not None
+              and time.perf_counter() - self._wall_start >= self.max_wall_seconds):
+            self.reason = "wall time"
+        return self.reason
+
+    def check_cached(self, fitness):
+        """
+        Apply the pipe limit to fitness served from a cache instead of simulated.
+
+        Capped genomes score at least ``max_pipes``, so a cached one means this
+        run would have hit the limit too.
+
+        Args:
+            fitness (np.ndarray): Fitness of every genome of the generation.
+
+        Returns:
+            str or None: Name of the exhausted limit, also stored in ``reason``.
+        """
+        if (not self.reason and self.max_pipes is not None and len(fitness)
+                and np.max(fitness) >= self.max_pipes):
+            self.reason = "pipes"
+        return self.reason
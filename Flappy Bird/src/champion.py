@@ -0,0 +1,126 @@
+"""
+Publish the current champion genome to other processes without blocking.
+
+The trainer writes the best genome into a small memory-mapped file guarded by
+a sequence counter (a seqlock): the counter is odd while a write is in
+progress and is bumped to the next even value when it completes. Readers map
+the same file, copy the genome and retry if the counter changed underneath
+them, so the trainer never waits for a reader and readers can attach to or
+detach from a running job at any time. ``spectator.py`` is such a reader.
+"""
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+# seq, generation, fitness, n_params
+HEADER = struct.Struct("<QQdQ")
+
+
+class ChampionPublisher:
+    """
+    Writer side of the champion file.
+
+    Attributes:
+        path (str): Memory-mapped file readers attach to.
+        best (float): Fitness of the last published genome.
+    """
+    def __init__(self, path, n_params):
+        """
+        Create the champion file, or take over the one of an earlier run.
+
+        An existing file is resized in place rather than recreated, so
+        readers still attached to it keep working and see the new run's
+        champions as newer versions.
+
+        Args:
+            path (str): File to map.
+            n_params (int): Genome length.
+        """
+        self.path = path
+        self.n_params = n_params
+        self.best = -np.inf
+        size = HEADER.size + 8 * n_params
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a+b")
+        if os.fstat(self._file.fileno()).st_size != size:
+            self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._genome = np.frombuffer(self._map, dtype=np.float64, count=n_params, offset=HEADER.size)
+        seq = HEADER.unpack_from(self._map, 0)[0]
+        self._seq = seq + seq % 2
+
+    def publish(self, genome, fitness, generation):
+        """
+        Publish ``genome`` if it beats the last published champion.
+
+        Returns:
+            bool: True if the champion file changed.
+        """
+        if fitness <= self.best:
+            return False
+        self.best = fitness
+        self._seq += 1   # odd: write in progress
+        HEADER.pack_into(self._map, 0, self._seq, generation, fitness, self.n_params)
+        self._genome[:] = genome
+        self._seq += 1
+        HEADER.pack_into(self._map, 0, self._seq, generation, fitness, self.n_params)
+        return True
+
+    def close(self):
+        """Unmap the file; it stays on disk for late readers."""
+        self._genome = None
+        self._map.close()
+        self._file.close()
+
+
+class ChampionReader:
+    """
+    Reader side of the champion file.
+
+    Attributes:
+        path (str): Memory-mapped file written by a ``ChampionPublisher``.
+        seq (int): Sequence number of the last genome returned by ``read``.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.seq = 0
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def version(self):
+        """Sequence number currently in the file; even when no write is in progress."""
+        return HEADER.unpack_from(self._map, 0)[0]
+
+    def changed(self):
+        """True if a newer champion than the last one read has been published."""
+        seq = self.version()
+        return seq != self.seq and seq % 2 == 0 and seq > 0
+
+    def read(self, retries=1000):
+        """
+        Copy the current champion.
+
+        Returns:
+            tuple or None: (genome, fitness, generation), or None if nothing
+            has been published yet or no consistent copy could be taken.
+        """
+        for _ in range(retries):
+            seq, generation, fitness, n = HEADER.unpack_from(self._map, 0)
+            if seq == 0:
+                return None
+            if seq % 2 == 0:
+                genome = np.frombuffer(self._map, dtype=np.float64, count=n, offset=HEADER.size).copy()
+                if HEADER.unpack_from(self._map, 0)[0] == seq:
+                    self.seq = seq
+                    return genome, fitness, generation
+            time.sleep(0)
+        return None
+
+    def close(self):
+        self._map.close()
+        self._file.close()
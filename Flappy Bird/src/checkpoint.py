@@ -0,0 +1,195 @@
+"""
+Compact checkpoints for long training runs.
+
+A checkpoint is one uncompressed ``.npz`` file holding the population genome
+matrix, the hall of fame, the fitness history and any other arrays, plus a
+JSON ``meta`` blob for scalars and RNG state. Files are written to a
+temporary name and atomically renamed, by a background thread so the
+training loop never waits on the disk.
+
+Every run writes into its own subdirectory of the checkpoint directory, so
+pruning and resuming never mix up the files of different runs.
+"""
+import glob
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+
+import numpy as np
+
+CHECKPOINT_PATTERN = "gen_{:06d}.npz"
+RUN_PREFIX = "run_"
+
+
+def save_checkpoint(path, arrays, meta):
+    """
+    Atomically write a checkpoint.
+
+    Args:
+        path (str): Destination ``.npz`` file.
+        arrays (dict): Name to ``np.ndarray``.
+        meta (dict): JSON-serializable scalars and RNG state.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path):
+    """
+    Read a checkpoint written by ``save_checkpoint``.
+
+    Args:
+        path (str): Checkpoint file.
+
+    Returns:
+        tuple: (arrays dict, meta dict).
+    """
+    with np.load(path) as data:
+        arrays = {k: data[k] for k in data.files if k != "meta"}
+        meta = json.loads(str(data["meta"]))
+    return arrays, meta
+
+
+def latest_checkpoint(directory):
+    """
+    Path of the newest checkpoint in ``directory``, or None if there is none.
+    """
+    numbered = []
+    for p in glob.glob(os.path.join(directory, "gen_*.npz")):
+        m = re.search(r"gen_(\d+)\.npz$", p)
+        if m:
+            numbered.append((int(m.group(1)), p))
+    return max(numbered)[1] if numbered else None
+
+
+def new_run_name():
+    """Subdirectory name for a new run: start time and process id."""
+    return f"{RUN_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+
+def latest_run(directory):
+    """
+    Run subdirectory of ``directory`` whose newest checkpoint was written
+    last, or None if no run has a checkpoint.
+    """
+    runs = []
+    for run in glob.glob(os.path.join(directory, "*", "")):
+        newest = latest_checkpoint(run)
+        if newest:
+            runs.append((os.path.getmtime(newest), os.path.normpath(run)))
+    return max(runs)[1] if runs else None
+
+
+def checkpoint_mode(meta):
+    """
+    GA mode (``objects`` or ``vector``) that wrote a checkpoint.
+
+    Checkpoints from before the mode was recorded are told apart by their
+    RNG state: only the vector path stores ``sizes``.
+    """
+    return meta.get("ga") or ("vector" if "sizes" in meta else "objects")
+
+
+def python_rng_state():
+    """Global ``random`` and ``np.random`` state as JSON-serializable data."""
+    version, internal, gauss = random.getstate()
+    name, keys, pos, has_gauss, cached = np.random.get_state()
+    return {
+        "random": [version, list(internal), gauss],
+        "np_random": [name, keys.tolist(), pos, has_gauss, cached],
+    }
+
+
+def seed_python_rngs(seed):
+    """Seed the global ``random`` and ``np.random`` generators the object GA draws from."""
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+
+
+def restore_python_rng_state(state):
+    """Restore the state captured by ``python_rng_state``."""
+    version, internal, gauss = state["random"]
+    random.setstate((version, tuple(internal), gauss))
+    name, keys, pos, has_gauss, cached = state["np_random"]
+    np.random.set_state((name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached))
+
+
+class CheckpointWriter:
+    """
+    Background writer that keeps the newest ``keep`` checkpoints of a run.
+
+    ``submit`` snapshots the arrays and returns immediately. If the disk is
+    slower than the training loop, a pending checkpoint that has not started
+    writing yet is replaced by the newer one.
+
+    Attributes:
+        directory (str): Where checkpoints are written; one run's own
+            subdirectory, as everything matching the pattern there is pruned.
+        keep (int): Number of checkpoint files retained.
+    """
+    def __init__(self, directory, keep=3):
+        """
+        Start the writer thread.
+
+        Args:
+            directory (str): Where checkpoints are written. Created if missing.
+            keep (int): Number of checkpoint files retained.
+        """
+        self.directory = directory
+        self.keep = keep
+        os.makedirs(directory, exist_ok=True)
+        self._queue = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, generation, arrays, meta):
+        """
+        Queue a checkpoint for ``generation``.
+
+        Args:
+            generation (int): Generations completed; names the file.
+            arrays (dict): Name to ``np.ndarray``, copied before returning.
+            meta (dict): JSON-serializable scalars and RNG state.
+        """
+        job = (generation, {k: np.array(v) for k, v in arrays.items()}, meta)
+        while True:
+            try:
+                self._queue.put_nowait(job)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                generation, arrays, meta = job
+                path = os.path.join(self.directory, CHECKPOINT_PATTERN.format(generation))
+                save_checkpoint(path, arrays, meta)
+                self._prune()
+            finally:
+                self._queue.task_done()
+
+    def _prune(self):
+        paths = sorted(glob.glob(os.path.join(self.directory, "gen_*.npz")))
+        for old in paths[:-self.keep]:
+            os.remove(old)
+
+    def close(self):
+        """Write any pending checkpoint and stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,325 @@
+"""
+Analytic bird/pipe collision that needs neither pygame nor per-frame mask rotation.
+
+The bird sprite is described by a handful of axis-aligned bands traced from its
+45x45 pixel mask. Each band is rotated with the bird and tested against the
+pipe body and cap rectangles with the separating axis theorem, vectorized over
+all birds and limited to the pipes that overlap the bird horizontally. A
+bounding-circle test first drops birds that cannot touch the pipe, e.g. the
+many flying well inside the gap, so only the rest pay for the exact test.
+
+Run ``python collision.py`` to compare the geometric verdicts with the
+pixel-mask path on recorded headless trajectories.
+"""
+import numpy as np
+
+from constants import BIRD_X, BIRD_SIZE, PIPE_WIDTH, SCREEN_HEIGHT, GROUND_HEIGHT
+
+# Opaque bands of the scaled flap.png mask as (x0, y0, x1, y1) in sprite pixels
+BIRD_BANDS = np.array([
+    (16,  1, 32,  4),
+    (11,  4, 35,  8),
+    ( 9,  8, 38, 12),
+    ( 6, 12, 40, 16),
+    ( 3, 16, 40, 23),
+    ( 1, 23, 43, 27),
+    ( 1, 27, 45, 31),
+    ( 3, 31, 43, 34),
+    ( 6, 34, 43, 38),
+    ( 9, 38, 40, 42),
+    (14, 42, 27, 45),
+], dtype=float)
+
+# Opaque regions of the pipe sprites (270x830 source) as fractions of the scaled size.
+# Columns are (x0, x1) of the image width, rows (y0, y1) of the image height.
+PIPE_BODY_COLS = (20 / 270, 250 / 270)
+PIPE_CAP_COLS  = (10 / 270, 260 / 270)
+TOP_BODY_ROWS    = (10 / 830, 690 / 830)
+TOP_CAP_ROWS     = (690 / 830, 810 / 830)
+BOTTOM_CAP_ROWS  = (20 / 830, 140 / 830)
+BOTTOM_BODY_ROWS = (140 / 830, 820 / 830)
+
+# Farthest a rotated band corner can reach from the sprite center
+BIRD_REACH = np.sqrt(2) * BIRD_SIZE / 2
+
+# Largest gap in pixels between the points a swept test checks
+SWEEP_STEP = 5.0
+# Birds per block of the SAT test; keeps its (birds, bands, rects) temporaries in cache
+OVERLAP_CHUNK = 1024
+
+
+def pipe_rects(pipe_x, pipe_height, pipe_gap, screen_height=SCREEN_HEIGHT,
+               ground_height=GROUND_HEIGHT):
+    """
+    Build the opaque rectangles of every pipe.
+
+    Args:
+        pipe_x (np.ndarray): Left edge of each pipe.
+        pipe_height (np.ndarray): Top pipe height of each pipe.
+        pipe_gap (np.ndarray): Gap size of each pipe.
+        screen_height (int): Height of the game screen.
+        ground_height (int): Height of the ground strip.
+
+    Returns:
+        np.ndarray: Rectangles (x0, y0, x1, y1) of shape (n_pipes * 4, 4).
+    """
+    pipe_x = np.asarray(pipe_x, dtype=float)
+    top_h = np.asarray(pipe_height, dtype=float)
+    bottom_y = top_h + pipe_gap
+    bottom_h = screen_height - bottom_y - ground_height
+    rects = []
+    for cols, y0, h, rows in (
+        (PIPE_BODY_COLS, 0.0, top_h, TOP_BODY_ROWS),
+        (PIPE_CAP_COLS, 0.0, top_h, TOP_CAP_ROWS),
+        (PIPE_CAP_COLS, bottom_y, bottom_h, BOTTOM_CAP_ROWS),
+        (PIPE_BODY_COLS, bottom_y, bottom_h, BOTTOM_BODY_ROWS),
+    ):
+        rects.append(np.stack([
+            pipe_x + cols[0] * PIPE_WIDTH,
+            y0 + rows[0] * h,
+            pipe_x + cols[1] * PIPE_WIDTH,
+            y0 + rows[1] * h,
+        ], axis=-1))
+    return np.stack(rects, axis=1).reshape(-1, 4)
+
+
+def nearby_pipes(pipe_x, bird_x=BIRD_X, limit=2):
+    """
+    Indices of the (at most ``limit``) pipes that can touch a bird at ``bird_x``.
+
+    Args:
+        pipe_x (np.ndarray): Left edge of each pipe, in spawn order.
+        bird_x (float): Left edge of the bird sprite.
+        limit (int): Maximum number of pipes to return.
+
+    Returns:
+        np.ndarray: Indices into ``pipe_x``.
+    """
+    cx = bird_x + BIRD_SIZE / 2
+    near = (pipe_x < cx + BIRD_REACH) & (pipe_x + PIPE_WIDTH > cx - BIRD_REACH)
+    return np.flatnonzero(near)[:limit]
+
+
+def hits(y, angle, pipe_x, pipe_height, pipe_gap, bird_x=BIRD_X):
+    """
+    Geometric collision test of many birds against the nearby pipes.
+
+    Args:
+        y (np.ndarray): Vertical position (sprite top) of each bird.
+        angle (np.ndarray): Tilt angle in degrees of each bird.
+        pipe_x (np.ndarray): Left edge of each pipe on screen.
+        pipe_height (np.ndarray): Top pipe height of each pipe on screen.
+        pipe_gap (np.ndarray): Gap size of each pipe on screen.
+        bird_x (float): Left edge of the bird sprite.
+
+    Returns:
+        np.ndarray: Boolean mask, True where the bird overlaps a pipe.
+    """
+    y = np.asarray(y, dtype=float)
+    pipe_x = np.asarray(pipe_x, dtype=float)
+    hit = np.zeros(len(y), dtype=bool)
+    k = nearby_pipes(pipe_x, bird_x)
+    if not len(k) or not len(y):
+        return hit
+    pipe_height, pipe_gap = np.asarray(pipe_height)[k], np.asarray(pipe_gap)[k]
+    test = np.flatnonzero(_may_hit(y[:, None], pipe_x[k], pipe_height, pipe_gap, bird_x).any(axis=1))
+    if len(test):
+        rects = pipe_rects(pipe_x[k], pipe_height, pipe_gap)
+        hit[test] = _overlaps(y[test], np.asarray(angle)[test], rects[None], bird_x)
+    return hit
+
+
+def hits_each(y, angle, pipe_x, pipe_height, pipe_gap, bird_x=BIRD_X):
+    """
+    Geometric collision test of every bird against its own pipe.
+
+    Used when birds play separate games, e.g. in ``env.BatchFlappyEnv``.
+    Pass the pipe nearest to the bird; pipes out of reach never hit.
+
+    Args:
+        y (np.ndarray): Vertical position (sprite top) of each bird.
+        angle (np.ndarray): Tilt angle in degrees of each bird.
+        pipe_x (np.ndarray): Left edge of each bird's pipe.
+        pipe_height (np.ndarray): Top pipe height of each bird's pipe.
+        pipe_gap (np.ndarray): Gap size of each bird's pipe.
+        bird_x (float): Left edge of the bird sprite.
+
+    Returns:
+        np.ndarray: Boolean mask, True where the bird overlaps its pipe.
+    """
+    y = np.asarray(y, dtype=float)
+    pipe_x = np.broadcast_to(np.asarray(pipe_x, dtype=float), y.shape)
+    pipe_height = np.broadcast_to(pipe_height, y.shape)
+    pipe_gap = np.broadcast_to(pipe_gap, y.shape)
+    hit = np.zeros(len(y), dtype=bool)
+    near = np.flatnonzero(_may_hit(y, pipe_x, pipe_height, pipe_gap, bird_x))
+    if not len(near):
+        return hit
+    rects = pipe_rects(pipe_x[near], pipe_height[near], pipe_gap[near]).reshape(len(near), 4, 4)
+    hit[near] = _overlaps(y[near], np.broadcast_to(angle, y.shape)[near], rects, bird_x)
+    return hit
+
+
+def hits_swept(y0, y1, angle, pipe_x, pipe_height, pipe_gap, scroll_dx, bird_x=BIRD_X,
+               max_step=SWEEP_STEP, each=False):
+    """
+    Collision test along each bird's motion since the previous test.
+
+    Within one step a bird moves from ``y0`` to ``y1`` while the pipes scroll
+    left by ``scroll_dx``. Relative to the pipes that is a straight segment,
+    which is tested at evenly spaced points no more than ``max_step`` pixels
+    apart, so large timesteps cannot skip past a pipe corner.
+
+    Args:
+        y0 (np.ndarray): Vertical position of each bird at the previous test.
+        y1 (np.ndarray): Vertical position of each bird now.
+        angle (np.ndarray): Tilt angle in degrees of each bird now.
+        pipe_x (np.ndarray): Left edge of each pipe on screen now.
+        pipe_height (np.ndarray): Top pipe height of each pipe.
+        pipe_gap (np.ndarray): Gap size of each pipe.
+        scroll_dx (float or np.ndarray): Distance the pipes moved since the
+            previous test, per bird with ``each``.
+        bird_x (float): Left edge of the bird sprite.
+        max_step (float): Largest distance in pixels between tested points.
+        each (bool): The pipe arrays hold one pipe per bird, as in ``hits_each``.
+
+    Returns:
+        np.ndarray: Boolean mask, True where the bird touched a pipe.
+    """
+    y0 = np.asarray(y0, dtype=float)
+    dy = np.asarray(y1, dtype=float) - y0
+    angle = np.asarray(angle)
+    pipe_x = np.asarray(pipe_x, dtype=float)
+    scroll_dx = np.asarray(scroll_dx, dtype=float)
+    hit = np.zeros(len(y0), dtype=bool)
+    if not len(y0):
+        return hit
+    # Sample count per bird, so a bird's result does not depend on the others in the batch
+    samples = np.maximum(1, np.ceil(np.maximum(np.abs(dy), np.abs(scroll_dx)) / max_step)).astype(np.int64)
+    samples = np.broadcast_to(samples, hit.shape)
+    for s in range(1, int(samples.max()) + 1):
+        test = np.flatnonzero(~hit & (samples >= s))
+        t = s / samples[test]
+        y = y0[test] + dy[test] * t
+        if each:
+            dx = scroll_dx[test] if scroll_dx.ndim else scroll_dx
+            hit[test] = hits_each(y, angle[test], pipe_x[test] + (1 - t) * dx,
+                                  np.asarray(pipe_height)[test], np.asarray(pipe_gap)[test], bird_x)
+        else:
+            # Sample times differ per bird, so test each distinct pipe offset on its own
+            for frac in np.unique(t):
+                sel = t == frac
+                hit[test[sel]] = hits(y[sel], angle[test[sel]], pipe_x + (1 - frac) * scroll_dx,
+                                      pipe_height, pipe_gap, bird_x)
+    return hit
+
+
+def _may_hit(y, pipe_x, pipe_height, pipe_gap, bird_x):
+    # Bounding-circle pre-rejection: a bird whose BIRD_REACH circle is clear of the
+    # pipe column or fully inside the gap cannot overlap the pipe
+    cx = bird_x + BIRD_SIZE / 2
+    cy = np.floor(y) + BIRD_SIZE / 2
+    clear = (pipe_x >= cx + BIRD_REACH) | (pipe_x + PIPE_WIDTH <= cx - BIRD_REACH)
+    inside = (cy >= pipe_height + BIRD_REACH) & (cy <= pipe_height + pipe_gap - BIRD_REACH)
+    return ~(clear | inside)
+
+
+def _overlaps(y, angle, rects, bird_x):
+    if len(y) <= OVERLAP_CHUNK:
+        return _overlaps_block(y, angle, rects, bird_x)
+    angle = np.asarray(angle)
+    out = np.empty(len(y), dtype=bool)
+    for i in range(0, len(y), OVERLAP_CHUNK):
+        block = slice(i, i + OVERLAP_CHUNK)
+        out[block] = _overlaps_block(y[block], angle[block], rects if len(rects) == 1 else rects[block], bird_x)
+    return out
+
+
+def _overlaps_block(y, angle, rects, bird_x):
+    # SAT test of the rotated bird bands against rects of shape (1 or n, r, 4)
+    R_c = (rects[..., :2] + rects[..., 2:]) / 2       # (m, r, 2)
+    R_h = (rects[..., 2:] - rects[..., :2]) / 2       # (m, r, 2)
+
+    theta = np.radians(np.asarray(angle, dtype=float))
+    c, s = np.cos(theta)[:, None], np.sin(theta)[:, None]   # (n, 1)
+    half = BIRD_SIZE / 2
+    local = (BIRD_BANDS[:, :2] + BIRD_BANDS[:, 2:]) / 2 - half   # band centers
+    hx, hy = (BIRD_BANDS[:, 2] - BIRD_BANDS[:, 0]) / 2, (BIRD_BANDS[:, 3] - BIRD_BANDS[:, 1]) / 2
+    # pygame rotates counter-clockwise on screen (y axis pointing down)
+    bx = bird_x + half + local[:, 0] * c + local[:, 1] * s            # (n, b)
+    by = np.floor(y)[:, None] + half - local[:, 0] * s + local[:, 1] * c
+
+    dx = bx[:, :, None] - R_c[:, None, :, 0]          # (n, b, r)
+    dy = by[:, :, None] - R_c[:, None, :, 1]
+    ac, as_ = np.abs(c)[:, :, None], np.abs(s)[:, :, None]
+    hx, hy = hx[None, :, None], hy[None, :, None]
+    Hx, Hy = R_h[:, None, :, 0], R_h[:, None, :, 1]
+    c3, s3 = c[:, :, None], s[:, :, None]
+    sep = (
+        (np.abs(dx) >= Hx + ac * hx + as_ * hy)
+        | (np.abs(dy) >= Hy + as_ * hx + ac * hy)
+        | (np.abs(dx * c3 - dy * s3) >= hx + Hx * ac + Hy * as_)
+        | (np.abs(dx * s3 + dy * c3) >= hy + Hx * as_ + Hy * ac)
+    )
+    return (~sep).any(axis=(1, 2))
+
+
+def verify(seeds=(0, 1, 2), pop_size=300, max_steps=2000):
+    """
+    Compare geometric verdicts with the pixel-mask path on recorded trajectories.
+
+    Runs headless generations with random networks, records every bird state
+    that was tested for collision and replays it through ``check_collision``.
+
+    Args:
+        seeds (tuple): Course and network seeds to record.
+        pop_size (int): Birds per recorded generation.
+        max_steps (int): Step limit per recorded generation.
+
+    Returns:
+        dict: Sample count, agreements and the two kinds of disagreement.
+    """
+    import os
+    from types import SimpleNamespace
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    import assets
+    from bird import Bird
+    from flappy_ai import check_collision
+    from headless import HeadlessSim
+    from nn import NeuralNetwork, PopulationNetwork
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    def mask_pipe(x, h, gap):
+        bottom_h = int(SCREEN_HEIGHT - (h + gap) - GROUND_HEIGHT)
+        return SimpleNamespace(x=x, height=int(h), gap=int(gap),
+                               top_mask=assets.mask("pipe_top.png", (PIPE_WIDTH, int(h)), True),
+                               bottom_mask=assets.mask("pipe_bottom.png", (PIPE_WIDTH, bottom_h), True))
+
+    bird = Bird(brain=None)
+    stats = {"samples": 0, "agree": 0, "mask_only": 0, "geometric_only": 0}
+    for seed in seeds:
+        np.random.seed(seed)
+        brains = PopulationNetwork.from_networks([NeuralNetwork() for _ in range(pop_size)])
+        sim = HeadlessSim(brains, rng=np.random.default_rng(seed))
+        sim.trace = []
+        sim.run(max_steps=max_steps)
+        for ys, angles, px, ph, pg in sim.trace:
+            pipes = [mask_pipe(*p) for p in zip(px, ph, pg)]
+            geo = hits(ys, angles, px, ph, pg)
+            for y, a, g in zip(ys, angles, geo):
+                bird.y, bird.angle = y, int(a)
+                m = check_collision(bird, pipes)
+                stats["samples"] += 1
+                stats["agree"] += m == g
+                stats["mask_only"] += m and not g
+                stats["geometric_only"] += g and not m
+    return stats
+
+
+if __name__ == "__main__":
+    s = verify()
+    print(f"Samples: {s['samples']}  agreement: {s['agree'] / max(s['samples'], 1):.4%}")
+    print(f"  mask-only hits: {s['mask_only']}   geometric-only hits: {s['geometric_only']}")
@@ -0,0 +1,38 @@
+"""
+Game and physics constants shared by the pygame trainer and the headless engine.
+
+Kept free of pygame so headless tooling can import it on bare compute nodes.
+"""
+
+# ─── Screen ──────────────────────────────────────────────────────────────────
+SCREEN_WIDTH, SCREEN_HEIGHT = 400, 600
+BIRD_X = 50
+FPS = 240
+MAX_LAG_MS = 250     # real-time display drops simulated time it falls further behind than this
+
+# ─── Physics ─────────────────────────────────────────────────────────────────
+GRAVITY       = 400.0    # px/sec²
+FLAP_VELOCITY = -200.0   # px/sec (instant jump)
+PIPE_SPEED    = 120.0    # px/sec
+
+TILT_DELAY    = 500      # ms before tilting down
+PIPE_SPACING  = 200      # horizontal space between pipes
+
+# ─── Headless simulation ─────────────────────────────────────────────────────
+SIM_FPS         = 60.0
+HEADLESS_DT_MS  = 5000.0 / SIM_FPS   # simulated ms per headless step
+GROUND_HEIGHT   = 100                # ground strip height without the sprite
+GROUND_Y        = SCREEN_HEIGHT - GROUND_HEIGHT
+
+# ─── Bird & pipes ────────────────────────────────────────────────────────────
+BIRD_SIZE         = 45
+PIPE_WIDTH        = 60
+PIPE_HEIGHT_RANGE = (200, 350)   # inclusive, top pipe height
+PIPE_GAP_RANGE    = (120, 170)   # inclusive, gap between top and bottom pipe
+MIN_BOTTOM_HEIGHT = 50
+INITIAL_PIPES     = 5
+
+# ─── Difficulty ──────────────────────────────────────────────────────────────
+SPEEDUP_EVERY  = 20      # pipes passed between speed increases
+SPEEDUP_STEP   = 5       # px/sec added per increase
+MAX_PIPE_SPEED = 170     # px/sec
@@ -0,0 +1,168 @@
+"""
+Deterministic pipe courses and a fitness cache for genomes already scored on them.
+
+A ``Course`` turns a seed into the same sequence of pipe heights and gaps for
+both the pygame and the headless engine. ``FitnessCache`` remembers the
+fitness of every (genome hash, course seed, rules) triple, so elites and hall
+of fame genomes replayed on a course they already played skip simulation.
+"""
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from archive import genome_key
+from constants import (
+    SCREEN_HEIGHT, GROUND_HEIGHT,
+    PIPE_HEIGHT_RANGE, PIPE_GAP_RANGE, MIN_BOTTOM_HEIGHT,
+)
+
+# Bump whenever physics, collision, scoring or course generation change what a genome scores
+RULES_VERSION = 2
+
+# Pipes generated at a time when a course runs out
+COURSE_CHUNK = 256
+
+
+def valid_pipes(screen_height=SCREEN_HEIGHT, ground_height=GROUND_HEIGHT):
+    """
+    Every (height, gap) pair whose bottom pipe is at least ``MIN_BOTTOM_HEIGHT`` tall.
+
+    Drawing uniformly from these pairs gives the same distribution as the
+    rejection loop in ``Pipe.__init__``, without rejecting anything.
+
+    Returns:
+        np.ndarray: Pairs of shape (n, 2).
+    """
+    heights = np.arange(PIPE_HEIGHT_RANGE[0], PIPE_HEIGHT_RANGE[1] + 1)
+    gaps = np.arange(PIPE_GAP_RANGE[0], PIPE_GAP_RANGE[1] + 1)
+    h, g = np.meshgrid(heights, gaps, indexing="ij")
+    ok = screen_height - (h + g) - ground_height >= MIN_BOTTOM_HEIGHT
+    return np.stack([h[ok], g[ok]], axis=1)
+
+
+VALID_PIPES = valid_pipes()
+
+
+class Course:
+    """
+    Seeded sequence of pipes, pregenerated in vectorized chunks.
+
+    ``course[i]`` is the (height, gap) of the i-th pipe spawned in a run, and
+    ``heights`` / ``gaps`` hold the whole generated prefix as arrays. Every
+    pair is drawn from ``VALID_PIPES``, so no pipe needs rejection sampling.
+
+    Attributes:
+        seed (int or None): Seed the course was generated from.
+        heights (np.ndarray): Top pipe heights generated so far.
+        gaps (np.ndarray): Gaps generated so far.
+    """
+    def __init__(self, seed=None, rng=None, length=COURSE_CHUNK):
+        """
+        Initialize a course.
+
+        Args:
+            seed (int, optional): Course seed.
+            rng (np.random.Generator, optional): Use this generator instead
+                of one created from ``seed``.
+            length (int): Pipes to pregenerate.
+        """
+        self.seed = seed
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.heights = np.empty(0, dtype=np.int64)
+        self.gaps = np.empty(0, dtype=np.int64)
+        self.extend(length)
+
+    def __len__(self):
+        return len(self.heights)
+
+    def extend(self, n=COURSE_CHUNK):
+        """Generate ``n`` more pipes."""
+        pairs = VALID_PIPES[self.rng.integers(len(VALID_PIPES), size=n)]
+        self.heights = np.concatenate([self.heights, pairs[:, 0]])
+        self.gaps = np.concatenate([self.gaps, pairs[:, 1]])
+
+    def __getitem__(self, i):
+        while len(self.heights) <= i:
+            self.extend(max(COURSE_CHUNK, len(self.heights)))
+        return int(self.heights[i]), int(self.gaps[i])
+
+
+def shared_course(seed):
+    """
+    Per-process ``Course`` for ``seed``, reused across generations and calls.
+
+    Courses are deterministic, so every worker process rebuilds the same
+    arrays from the seed once and then keeps them. A None seed gets a fresh
+    random course.
+    """
+    return Course() if seed is None else _cached_course(seed)
+
+
+@lru_cache(maxsize=16)
+def _cached_course(seed):
+    return Course(seed)
+
+
+def rules_key(engine, collision_mode="geometric", budget=None, clock=None, courses=None):
+    """Cache namespace for an engine, collision mode, budget, clock and course set under the current rules."""
+    key = f"v{RULES_VERSION}:{engine}:{collision_mode}"
+    if budget:
+        key = f"{key}:{budget.key()}"
+    if clock is not None:
+        key = f"{key}:{clock.key()}"
+    return f"{key}:{courses.key()}" if courses is not None else key
+
+
+class FitnessCache:
+    """
+    Fitness memo keyed by (genome hash, course seed, rules).
+
+    Attributes:
+        max_entries (int): Oldest entries are dropped beyond this size.
+        hits (int): Genomes served from the cache so far.
+        misses (int): Genomes that had to be simulated so far.
+    """
+    def __init__(self, max_entries=1_000_000):
+        self.max_entries = max_entries
+        self._fitness = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._fitness)
+
+    def evaluate(self, genomes, seed, rules, simulate):
+        """
+        Return the fitness of every genome, simulating only the unseen ones.
+
+        Args:
+            genomes (np.ndarray): Flat genomes of shape (n, n_params).
+            seed (int): Course seed every genome plays.
+            rules (str): Engine and rules namespace, see ``rules_key``.
+            simulate (callable): Maps the indices of the uncached genomes to
+                their fitness array.
+
+        Returns:
+            tuple: (fitness array, number of cache hits).
+        """
+        keys = [(genome_key(g), seed, rules) for g in genomes]
+        fitness = np.zeros(len(keys))
+        missing = []
+        for i, k in enumerate(keys):
+            f = self._fitness.get(k)
+            if f is None:
+                missing.append(i)
+            else:
+                fitness[i] = f
+        if missing:
+            fresh = simulate(np.array(missing))
+            fitness[missing] = fresh
+            for i, f in zip(missing, fresh):
+                self._fitness[keys[i]] = float(f)
+            while len(self._fitness) > self.max_entries:
+                self._fitness.popitem(last=False)
+        hits = len(keys) - len(missing)
+        self.hits += hits
+        self.misses += len(missing)
+        return fitness, hits
@@ -0,0 +1,153 @@
+"""
+Vectorized, gym-style batch environment of independent Flappy Bird games.
+
+``BatchFlappyEnv`` advances N games in lockstep with the same physics
+constants and step order as ``HeadlessSim``, but every game has its own bird,
+pipes, clock and difficulty, and the agent is external: ``step`` takes one
+flap decision per game and returns observation, reward and done arrays.
+Finished games are reset in place, so a training loop never has to stop.
+
+Example:
+    env = BatchFlappyEnv()
+    obs = env.reset(1024, seed=0)
+    while True:
+        obs, reward, done, info = env.step(brains.decide(obs[:, :brains.in_sz]))
+"""
+import numpy as np
+
+import collision
+from constants import (
+    SCREEN_HEIGHT, GRAVITY, FLAP_VELOCITY, TILT_DELAY,
+    HEADLESS_DT_MS, GROUND_HEIGHT, BIRD_SIZE,
+)
+from features import SHARED_FEATURES
+from lanes import PipeLanes
+
+# Observation columns: the bird's normalized height, then the shared features
+OBS_FEATURES = ("y",) + SHARED_FEATURES
+
+
+class BatchFlappyEnv:
+    """
+    N independent Flappy Bird games stepped together.
+
+    Attributes:
+        n (int): Number of games.
+        course (Course or None): Course every game plays, or None for a
+            fresh random course per episode.
+        max_episode_steps (int or None): Truncate episodes after this many steps.
+        y, speed, angle, last_flap (np.ndarray): Bird state of every game, as
+            in ``HeadlessSim``.
+        lanes (PipeLanes): Pipes, clock, speed and score of every game.
+        steps (np.ndarray): Steps taken in the current episode of each game.
+        total_steps (int): Environment steps taken since ``reset``, summed
+            over all games.
+    """
+    def __init__(self, dt_ms=HEADLESS_DT_MS, course=None, max_episode_steps=None):
+        """
+        Args:
+            dt_ms (float): Simulated milliseconds per step.
+            course (Course, optional): Course every episode replays, e.g. to
+                compare with ``HeadlessSim`` on the same pipes.
+            max_episode_steps (int, optional): Truncate longer episodes.
+        """
+        self.dt_ms = dt_ms
+        self.dt_s = dt_ms / 1000.0
+        self.course = course
+        self.max_episode_steps = max_episode_steps
+        self.ground_y = SCREEN_HEIGHT - GROUND_HEIGHT
+        self.n = 0
+        self.lanes = None
+
+    @property
+    def score(self):
+        """Pipes passed in the current episode of each game."""
+        return self.lanes.score
+
+    def reset(self, n, seed=None):
+        """
+        Start ``n`` new games.
+
+        Args:
+            n (int): Number of games.
+            seed (int, optional): Seed of the random courses.
+
+        Returns:
+            np.ndarray: Observations of shape (n, len(OBS_FEATURES)).
+        """
+        self.n = n
+        self.y = np.empty(n)
+        self.speed = np.empty(n)
+        self.angle = np.empty(n, dtype=np.int64)
+        self.last_flap = np.empty(n)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self.lanes = PipeLanes(n, self.dt_ms, None if self.course is None else [self.course],
+                               rng=np.random.default_rng(seed))
+        self.total_steps = 0
+        self._reset_games(np.arange(n), fresh=True)
+        return self._observe()
+
+    def _reset_games(self, idx, fresh=False):
+        """Put games ``idx`` back at the start of a new episode."""
+        self.y[idx] = SCREEN_HEIGHT / 2
+        self.speed[idx] = 0.0
+        self.angle[idx] = 0
+        self.last_flap[idx] = 0.0
+        self.steps[idx] = 0
+        if not fresh:
+            self.lanes.reset(idx)
+        self.lanes.advance(idx)
+
+    def _observe(self):
+        obs = np.empty((self.n, len(OBS_FEATURES)))
+        obs[:, 0] = self.y / SCREEN_HEIGHT
+        obs[:, 1:] = self.lanes.features()
+        return obs
+
+    def _collide(self):
+        """Mask of games whose bird overlaps the pipe nearest to it."""
+        return collision.hits_each(self.y, self.angle, *self.lanes.pipes(self.lanes.nearest()))
+
+    def step(self, actions):
+        """
+        Flap where ``actions`` is true and advance every game by one step.
+
+        Args:
+            actions (np.ndarray): One truthy flap decision per game.
+
+        Returns:
+            tuple: ``(obs, reward, done, info)``. ``reward`` counts the pipes
+            passed in this step. Games with ``done`` set have been reset, so
+            their ``obs`` row starts the next episode; ``info`` holds the
+            finished episodes' ``score`` and ``steps`` and whether they were
+            ``truncated`` rather than crashed.
+        """
+        flap = np.flatnonzero(np.asarray(actions, dtype=bool))
+        self.speed[flap] = FLAP_VELOCITY
+        self.last_flap[flap] = self.lanes.now[flap]
+        self.angle[flap] = np.minimum(self.angle[flap] + 32, 25)
+
+        self.speed += GRAVITY * self.dt_s
+        self.y += self.speed * self.dt_s
+        tilt = self.lanes.now - self.last_flap > TILT_DELAY
+        self.angle[tilt] = np.maximum(self.angle[tilt] - 1, -25)
+        crashed = (self.y > self.ground_y - BIRD_SIZE) | (self.y < 0) | self._collide()
+
+        self.steps += 1
+        self.total_steps += self.n
+        truncated = ~crashed
+        if self.max_episode_steps is not None:
+            truncated &= self.steps >= self.max_episode_steps
+        else:
+            truncated[:] = False
+        done = crashed | truncated
+
+        reward = np.zeros(self.n, dtype=np.int64)
+        live = np.flatnonzero(~done)
+        reward[live] = self.lanes.advance(live)
+        info = {"score": np.where(done, self.score, 0), "steps": np.where(done, self.steps, 0),
+                "truncated": truncated}
+        ended = np.flatnonzero(done)
+        if len(ended):
+            self._reset_games(ended)
+        return self._observe(), reward, done, info
@@ -0,0 +1,78 @@
+"""
+Network inputs built once per frame for the whole population.
+
+Every bird flies at the same ``BIRD_X``, so the next pipe ahead and every
+feature derived from it are identical for all birds. They are computed once
+per frame as a shared feature vector; only the bird's own height differs per
+bird. The input row of a bird is ``[y] + shared[:in_sz - 1]``, so a network
+with more inputs picks up further shared features at no extra cost.
+"""
+import numpy as np
+
+from constants import BIRD_X, PIPE_WIDTH, SCREEN_HEIGHT, MAX_PIPE_SPEED
+
+# Shared features in input order, after the bird's own normalized height
+SHARED_FEATURES = ("gap_center", "distance", "speed")
+
+# Horizontal distance that normalizes to 1
+DISTANCE_SCALE = 400
+
+
+def next_pipe(pipe_x, bird_x=BIRD_X, width=PIPE_WIDTH):
+    """
+    Index of the first pipe whose right edge is still ahead of the birds.
+
+    Args:
+        pipe_x (np.ndarray): Left edge of every pipe, in spawn order.
+        bird_x (float): Horizontal position of the birds.
+        width (float): Pipe width.
+
+    Returns:
+        int or None: Index into ``pipe_x``, or None if no pipe is ahead.
+    """
+    ahead = np.flatnonzero(np.asarray(pipe_x) + width > bird_x)
+    return int(ahead[0]) if len(ahead) else None
+
+
+def shared_features(x, height, gap, scroll_speed, bird_x=BIRD_X, screen_height=SCREEN_HEIGHT):
+    """
+    Features of the next pipe, in ``SHARED_FEATURES`` order.
+
+    Args:
+        x (float): Left edge of the next pipe.
+        height (float): Top pipe height of the next pipe.
+        gap (float): Gap of the next pipe.
+        scroll_speed (float): Current pipe speed in pixels per second.
+        bird_x (float): Horizontal position of the birds.
+        screen_height (int): Height of the game screen.
+
+    Returns:
+        np.ndarray: Normalized gap centre, distance and speed.
+    """
+    return np.array([
+        (height + gap / 2) / screen_height,
+        (x - bird_x) / DISTANCE_SCALE,
+        scroll_speed / MAX_PIPE_SPEED,
+    ])
+
+
+def population_inputs(y, shared, in_sz=3, screen_height=SCREEN_HEIGHT):
+    """
+    Input matrix of every bird from its height and the shared features.
+
+    Args:
+        y (np.ndarray): Vertical position of every bird.
+        shared (np.ndarray): Output of ``shared_features``.
+        in_sz (int): Number of network inputs.
+        screen_height (int): Height of the game screen.
+
+    Returns:
+        np.ndarray: Inputs of shape (len(y), in_sz).
+    """
+    if in_sz - 1 > len(shared):
+        raise ValueError(f"Networks with {in_sz} inputs need more than the "
+                         f"{len(shared)} shared features {SHARED_FEATURES}")
+    X = np.empty((len(y), in_sz))
+    X[:, 0] = np.asarray(y) / screen_height
+    X[:, 1:] = shared[:in_sz - 1]
+    return X
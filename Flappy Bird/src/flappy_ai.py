@@ -1,43 +1,44 @@
-import pygame
-import sys
 import os
+import sys
 import random
 import numpy as np
 from bird import Bird
-from pipe import Pipe
-from nn import NeuralNetwork
+from pipe import PipePool
+from nn import NeuralNetwork, PopulationNetwork
+import headless
+from parallel import ParallelEvaluator
+from trainer import Trainer
+from course import Course, FitnessCache, rules_key, shared_course
+from budget import EvalBudget, gap_tiebreak
+from profiling import profiler
+from simclock import SimClock
+from robust import AGGREGATES, CourseSet, course_report, format_report, parse_aggregate
+from features import population_inputs, shared_features
+from champion import ChampionPublisher
+from archive import GenomeArchive, genome_key
+from checkpoint import (
+    CheckpointWriter, checkpoint_mode, latest_checkpoint, latest_run, load_checkpoint,
+    new_run_name, python_rng_state, restore_python_rng_state, seed_python_rngs,
+)
+import collision
+import assets
 import argparse
 
 # ─── Constants ────────────────────────────────────────────────────────────────
-SCREEN_WIDTH, SCREEN_HEIGHT = 400, 600
-BIRD_X = 50
-FPS = 240
-#changes traced
-GRAVITY       = 400.0    # px/sec²
-FLAP_VELOCITY = -200.0   # px/sec (instant jump)
-PIPE_SPEED    = 120.0    # px/sec
-
-TILT_DELAY    = 500      # ms before tilting down
-PIPE_SPACING  = 200      # horizontal space between pipes
-
-# ─── Assets Path ─────────────────────────────────────────────────────────────
-def get_asset_path(fn):
-    return os.path.join(os.path.dirname(__file__), "sprites", fn)
+from constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, BIRD_X, FPS, MAX_LAG_MS,
+    PIPE_SPEED, PIPE_SPACING,
+    HEADLESS_DT_MS, GROUND_HEIGHT, INITIAL_PIPES, BIRD_SIZE,
+    SPEEDUP_EVERY, SPEEDUP_STEP, MAX_PIPE_SPEED,
+)
 
 # ─── Neural Network & GA Helpers ────────────────────────────────────────────
-
-def crossover(w1, w2):
-    mask = np.random.rand(len(w1)) < 0.5
-    return np.where(mask, w1, w2)
-
-def mutate(w, rate=0.1, scale=0.5):
-    for i in range(len(w)):
-        if random.random() < rate:
-            w[i] += np.random.randn() * scale
+from ga import crossover, init_population, mutate, param_count
 
 # ─── Game Entities ───────────────────────────────────────────────────────────
 
 def check_collision(bird, pipes):
+    # Pixel-perfect reference; collision.hits is the fast geometric equivalent
     b_mask, b_rect = bird.get_mask()
     for p in pipes:
         if b_mask.overlap(p.top_mask,     (p.x - b_rect.x, 0 - b_rect.y)):      return True
@@ -45,34 +46,40 @@ def check_collision(bird, pipes):
     return False
 
 # ─── Evolution & Simulation ─────────────────────────────────────────────────
-def eval_population(pop, display=False):
-    pygame.init()
+def eval_population(pop, display=False, collision_mode="mask", course=None, budget=None,
+                    render_every=None, render_fps=None, top_k=None, clock=None):
+    # The pygame engine needs pygame for masks; only drawing needs a display
+    import pygame
 
+    # Fast visual mode: fixed timestep as fast as possible, thinned dirty-rect rendering
+    fast = display and bool(render_every or render_fps)
     if display:
+        from render import Renderer
+        pygame.init()
         screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        font   = pygame.font.SysFont(None, 30)
-
-        # ── Load & scale background after display init ─────────
-        raw_bg = pygame.image.load(get_asset_path('background.png')).convert()
-        bg_img = pygame.transform.scale(raw_bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
-
-        # load ground and key out the sky‐fill color
-        ground_img = pygame.image.load(get_asset_path('ground.png')).convert()
-        ground_img.set_colorkey((112, 192, 238))
-        GROUND_Y = SCREEN_HEIGHT - ground_img.get_height()
+        renderer = Renderer(screen, dirty_rects=fast, top_k=top_k,
+                            render_every=render_every, render_fps=render_fps)
     else:
-        # Initialize a hidden display for headless mode to allow image loading
-        os.environ['SDL_VIDEODRIVER'] = 'dummy'
-        screen = pygame.display.set_mode((1, 1))
-        font = None
-        bg_img = ground_img = None
-        GROUND_Y = SCREEN_HEIGHT - 100
-
-    clock   = pygame.time.Clock()
+        renderer = None
+    # Same ground as the headless engines in every mode, so displayed runs score alike
+    GROUND_Y = SCREEN_HEIGHT - GROUND_HEIGHT
+
+    assets.preload_pipes(convert_alpha=display)
+    assets.preload_bird()
+
+    # Fixed timestep: real-time display defaults to one physics step per display frame
+    if clock is None:
+        clock = SimClock(1000 / FPS if display and not fast else HEADLESS_DT_MS)
+    realtime = display and not fast
+    dt_ms = clock.sub_dt_ms
+    dt_s = dt_ms / 1000.0
     sim_now = 0.0
-    SIM_FPS = 60.0
+    wall_start = pygame.time.get_ticks()
 
-    pipes = [Pipe(SCREEN_WIDTH + i * PIPE_SPACING, display=display) for i in range(5)]
+    pipes = PipePool(course if course is not None else Course(), display=display)
+    for i in range(INITIAL_PIPES):
+        pipes.spawn(SCREEN_WIDTH + i * PIPE_SPACING)
+    brains = PopulationNetwork.from_networks([b.brain for b in pop])
     bg_scroll = ground_scroll = 0
     scroll_speed = PIPE_SPEED
     pipe_spacing = PIPE_SPACING  # Use a local variable for dynamic spacing
@@ -80,115 +87,219 @@ def eval_population(pop, display=False):
     run = True
     pipes_passed_total = 0  # Track total pipes passed
     last_report = 0         # Track last report milestone
-    while run and any(b.alive for b in pop):
-        if display:
-            dt_ms = clock.tick(FPS)
-            sim_now = pygame.time.get_ticks()
-        else:
-            dt_ms = 5000.0 / SIM_FPS
+    best = max((b.fitness for b in pop), default=0)
+    # Living birds and their population indices, compacted only when birds die,
+    # so per-frame work scales with the survivors rather than the population
+    alive = [b for b in pop if b.alive]
+    alive_idx = np.array([i for i, b in enumerate(pop) if b.alive], dtype=np.intp)
+    if budget:
+        budget.start()
+    while run and alive:
+        render = display and renderer.due()
+        if realtime:
+            # Wait until this step is due on the wall clock; when behind, skip
+            # drawing to catch up, and give up on lags too long to recover
+            with profiler.phase("tick"):
+                lag = sim_now + clock.dt_ms - (pygame.time.get_ticks() - wall_start)
+                if lag > 0:
+                    pygame.time.wait(int(lag))
+                elif lag < -MAX_LAG_MS:
+                    wall_start -= lag
+                else:
+                    render = lag > -clock.dt_ms
+
+        if render or realtime:
+            with profiler.phase("events"):
+                for ev in pygame.event.get():
+                    if ev.type == pygame.QUIT:
+                        pygame.quit(); sys.exit()
+
+        for sub in range(clock.substeps):
             sim_now += dt_ms
 
-        dt_s = dt_ms / 1000.0
-
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                pygame.quit(); sys.exit()
-
-        # ── Scroll updates ─────────────────────────────────────────
-        bg_scroll     = (bg_scroll - scroll_speed * dt_s * 0.5) % SCREEN_WIDTH
-        ground_scroll = (ground_scroll - scroll_speed * dt_s)       % SCREEN_WIDTH
-
-        # ── Pipes update ───────────────────────────────────────────
-        rem = []; add = False
-        for p in pipes:
-            p.update(dt_s, speed=scroll_speed)
-            if not p.passed and p.x < BIRD_X:
-                p.passed = True
-                add = True
-                for b in pop:
-                    if b.alive: b.fitness += 1
-                pipes_passed_total += 1
-                # Live update every 5000 pipes
-                if pipes_passed_total // 5000 > last_report:
-                    last_report = pipes_passed_total // 5000
-                    print(f"  [Live] Pipes passed: {pipes_passed_total}")
-                # Increase difficulty every 20 pipes
-                if pipes_passed_total % 20 == 0:
-                    scroll_speed = min(scroll_speed + 5, 170)   # Increase pipe speed more gradually, max 170
-                    
-                    print(f"  [Difficulty] PIPE_SPEED: {scroll_speed}")
-            if p.x + p.width < 0:
-                rem.append(p)
-        for r in rem:
-            pipes.remove(r)
-        if add:
-            pipes.append(Pipe(pipes[-1].x + pipe_spacing, display=display))
-
-        # ── Birds update ───────────────────────────────────────────
-        for b in pop:
-            if b.alive:
-                b.think(pipes)
-                b.update(dt_s, False, sim_now, GROUND_Y)
+            # ── Scroll updates ─────────────────────────────────────────
+            bg_scroll     = (bg_scroll - scroll_speed * dt_s * 0.5) % SCREEN_WIDTH
+            ground_scroll = (ground_scroll - scroll_speed * dt_s)       % SCREEN_WIDTH
+
+            # ── Pipes update ───────────────────────────────────────────
+            with profiler.phase("pipes"):
+                add = False
+                for p in pipes:
+                    p.update(dt_s, speed=scroll_speed)
+                    if not p.passed and p.x < BIRD_X:
+                        p.passed = True
+                        add = True
+                        for b in alive:
+                            b.fitness += 1
+                        pipes_passed_total += 1
+                        # Live update every 5000 pipes
+                        if pipes_passed_total // 5000 > last_report:
+                            last_report = pipes_passed_total // 5000
+                            print(f"  [Live] Pipes passed: {pipes_passed_total}")
+                        # Increase difficulty every 20 pipes
+                        if pipes_passed_total % SPEEDUP_EVERY == 0:
+                            scroll_speed = min(scroll_speed + SPEEDUP_STEP, MAX_PIPE_SPEED)   # Increase pipe speed more gradually
+
+                            print(f"  [Difficulty] PIPE_SPEED: {scroll_speed}")
+                pipes.recycle()
+            with profiler.phase("spawn"):
+                if add:
+                    pipes.spawn(pipes[-1].x + pipe_spacing)
+
+            # ── Birds think once per control step (one batched forward pass) ─
+            if sub == 0:
+                with profiler.phase("think"):
+                    # The next pipe is the same for every bird: look it up once per frame
+                    nxt = next((p for p in pipes if p.x + p.width > BIRD_X), None)
+                    if nxt is not None:
+                        shared = shared_features(nxt.x, nxt.height, nxt.gap, scroll_speed)
+                        X = population_inputs([b.y for b in alive], shared, brains.in_sz)
+                        flaps = brains.decide(X, alive_idx)
+                        for j in np.flatnonzero(flaps):
+                            alive[j].flap(sim_now)
+
+            # ── Birds update ───────────────────────────────────────────
+            with profiler.phase("update"):
+                y0 = [b.y for b in alive] if clock.swept else None
+                for b in alive:
+                    b.update(dt_s, False, sim_now, GROUND_Y)
+                    # Ground collision check (works for both display and headless)
+                    if b.y + getattr(b, 'height', 24) >= GROUND_Y:
+                        b.alive = False
+            with profiler.phase("collision"):
                 # Consistent mask-based collision for both modes
-                if check_collision(b, pipes):
-                    b.alive = False
-                # Ground collision check (works for both display and headless)
-                if b.y + getattr(b, 'height', 24) >= GROUND_Y:
-                    b.alive = False
+                if collision_mode == "mask":
+                    for b in alive:
+                        if b.alive and check_collision(b, pipes):
+                            b.alive = False
+                elif collision_mode == "geometric":
+                    tested = [j for j, b in enumerate(alive) if b.alive]
+                    y1 = [alive[j].y for j in tested]
+                    angle = [alive[j].angle for j in tested]
+                    pipe_args = ([p.x for p in pipes], [p.height for p in pipes], [p.gap for p in pipes])
+                    if clock.swept:
+                        hit = collision.hits_swept([y0[j] for j in tested], y1, angle, *pipe_args,
+                                                   scroll_speed * dt_s)
+                    else:
+                        hit = collision.hits(y1, angle, *pipe_args)
+                    for j, h in zip(tested, hit):
+                        if h:
+                            alive[j].alive = False
+                keep = [j for j, b in enumerate(alive) if b.alive]
+                if len(keep) < len(alive):
+                    alive = [alive[j] for j in keep]
+                    alive_idx = alive_idx[keep]
+            if not alive:
+                break
+
+        # ── Budget: cap survivors, break ties by distance to the gap centre ─
+        if budget and budget.check(pipes_passed_total, sim_now):
+            nxt = next((p for p in pipes if p.x + p.width > BIRD_X), None)
+            for b in alive:
+                if nxt is not None:
+                    b.fitness += float(gap_tiebreak(b.y + BIRD_SIZE / 2, nxt.height + nxt.gap / 2))
+            print(f"  [Budget] run ended ({budget.reason}) after {pipes_passed_total} pipes")
+            run = False
 
         # ── Drawing ────────────────────────────────────────────────
-        if display:
-            # draw tiled background
-            for x in range(-int(bg_scroll), SCREEN_WIDTH, bg_img.get_width()):
-                screen.blit(bg_img, (x, 0))
-
-            # draw pipes
-            for p in pipes:
-                p.draw(screen)
-
-            # draw birds
-            for b in pop:
-                if b.alive and not b.is_elite:
-                    b.draw(screen)
-            for b in pop:
-                if b.alive and b.is_elite:
-                    b.draw(screen)
-
-            # draw tiled ground
-            for x in range(-int(ground_scroll), SCREEN_WIDTH, ground_img.get_width()):
-                screen.blit(ground_img, (x, GROUND_Y))
-
-            # UI
-            best = max((b.fitness for b in pop), default=0)
-            txt  = font.render(f"Pipes: {best}", True, (255,255,255))
-            screen.blit(txt, (10,10))
-
-            pygame.display.flip()
-
-        if not any(b.alive for b in pop):
-            run = False
+        if render:
+            with profiler.phase("draw"):
+                # Survivors passed every pipe, so one of them holds the best score
+                best = max((b.fitness for b in alive), default=best)
+                renderer.draw(pipes, alive, best, bg_scroll, ground_scroll)
 
     if display:
         pygame.quit()
 
+def eval_population_soa(pop, seed=None, evaluator=None, budget=None, clock=None, courses=None):
+    if evaluator is not None:
+        fitness = evaluator.evaluate(np.stack([b.brain.get_weights() for b in pop]), seed, budget, clock, courses)
+    elif courses is not None:
+        brains = PopulationNetwork.from_networks([b.brain for b in pop])
+        fitness = headless.evaluate_courses(brains, courses.courses(seed), verbose=True, budget=budget, clock=clock)
+    else:
+        brains = PopulationNetwork.from_networks([b.brain for b in pop])
+        fitness = headless.evaluate(brains, course=shared_course(seed), verbose=True, budget=budget, clock=clock)
+    if courses is not None:
+        print(format_report(course_report(fitness)))
+        fitness = courses.combine(fitness)
+    for b, f in zip(pop, fitness):
+        b.fitness = float(f)
+        b.alive = False
+
+def eval_population_headless(pop, seed, engine="pygame", collision_mode="mask",
+                             evaluator=None, cache=None, budget=None, clock=None, courses=None):
+    """
+    Score ``pop`` headless on the course generated from ``seed``, or with
+    ``courses`` on the K courses derived from it (SoA engine only).
+
+    With a ``cache``, genomes already scored on this course under the same
+    engine, rules, budget, clock and course set reuse their fitness and only
+    the rest are simulated. A wall-clock budget disables the cache.
+
+    Returns:
+        int: Number of genomes served from the cache.
+    """
+    use_soa = engine == "soa" or evaluator is not None or courses is not None
+    rules = (rules_key("soa", "geometric", budget, clock, courses) if use_soa
+             else rules_key("pygame", collision_mode, budget, clock))
+
+    def simulate(idx):
+        sub = [pop[i] for i in idx]
+        if use_soa:
+            eval_population_soa(sub, seed=seed, evaluator=evaluator, budget=budget, clock=clock, courses=courses)
+        else:
+            eval_population(sub, display=False, collision_mode=collision_mode, course=shared_course(seed),
+                            budget=budget, clock=clock)
+        return np.array([b.fitness for b in sub])
+
+    if budget:
+        budget.reason = None
+    if cache is None or (budget and not budget.deterministic):
+        simulate(np.arange(len(pop)))
+        return 0
+    fitness, hits = cache.evaluate([b.brain.get_weights() for b in pop], seed, rules, simulate)
+    if budget:
+        budget.check_cached(fitness)
+    for b, f in zip(pop, fitness):
+        b.fitness = float(f)
+        b.alive = False
+    return hits
+
+def bird_from_weights(weights, is_elite=False):
+    return Bird(brain=NeuralNetwork(params=np.array(weights)), is_elite=is_elite)
+
+def birds_from_genomes(genomes, dtype=None):
+    """Birds whose brains are views into the rows of one genome matrix, without copies."""
+    genomes = np.ascontiguousarray(genomes, dtype=dtype)
+    return [Bird(brain=NeuralNetwork(params=row)) for row in genomes]
+
 def next_gen(old, hall_of_fame, elite_k=3, reinject_k=3, mrate=0.01):
     graded    = sorted(old, key=lambda b: b.fitness, reverse=True)
     top_group = graded[:elite_k]
     new_pop   = []
+    # Every child's genome is a row of one matrix in the parents' dtype, like birds_from_genomes
+    parent_params = old[0].brain.params
+    genomes = np.empty((len(old), parent_params.size), dtype=parent_params.dtype)
+
+    def child_bird(weights, is_elite=False):
+        row = genomes[len(new_pop)]
+        row[:] = weights
+        return Bird(brain=NeuralNetwork(params=row), is_elite=is_elite)
 
     # elitism
     for i, parent in enumerate(top_group):
-        nn = NeuralNetwork()
-        nn.set_weights(parent.brain.get_weights())
-        new_pop.append(Bird(brain=nn, is_elite=(i==0)))
+        new_pop.append(child_bird(parent.brain.get_weights(), is_elite=(i==0)))
 
     # reinject hall of fame
+    seen = {genome_key(b.brain.get_weights()) for b in new_pop}
     for champ in hall_of_fame[:reinject_k]:
-        weights = tuple(champ.brain.get_weights().tolist())
-        if not any(tuple(b.brain.get_weights().tolist())==weights for b in new_pop):
-            nn = NeuralNetwork()
-            nn.set_weights(champ.brain.get_weights())
-            new_pop.append(Bird(brain=nn))
+        if len(new_pop) == len(old):
+            break
+        weights = champ.brain.get_weights()
+        if genome_key(weights) not in seen:
+            seen.add(genome_key(weights))
+            new_pop.append(child_bird(weights))
 
     # breed children
     while len(new_pop) < len(old):
@@ -196,16 +307,75 @@ def next_gen(old, hall_of_fame, elite_k=3, reinject_k=3, mrate=0.01):
         w1, w2  = p1.brain.get_weights(), p2.brain.get_weights()
         child = crossover(w1, w2)
         mutate(child, rate=mrate)
-        nn = NeuralNetwork()
-        nn.set_weights(child)
-        new_pop.append(Bird(brain=nn))
+        new_pop.append(child_bird(child))
 
     return new_pop
 
 def main():
     parser = argparse.ArgumentParser(description="Flappy Bird AI Trainer")
     parser.add_argument("--headless", action="store_true", help="Run in headless (no graphics) mode")
+    parser.add_argument("--collision", choices=("mask", "geometric"), default="mask",
+                        help="Collision test for the pygame engine: pixel masks or analytic hitboxes")
+    parser.add_argument("--engine", choices=("pygame", "soa"), default="pygame",
+                        help="Simulation used for headless generations: pygame objects or the vectorized SoA engine")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Evaluate headless generations on this many processes (implies --engine soa)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for the headless pipe courses, one course per generation")
+    parser.add_argument("--ga", choices=("objects", "vector"), default="objects",
+                        help="Genetic algorithm: per-Bird objects or the vectorized genome-matrix path (headless)")
+    parser.add_argument("--checkpoint-dir", default="checkpoints",
+                        help="Directory for training checkpoints; every run writes into its own subdirectory")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="Write a checkpoint every N generations (default: 0, no checkpoints)")
+    parser.add_argument("--run", default=None, metavar="NAME",
+                        help="Checkpoint subdirectory of this run (default: a new timestamped name); "
+                             "with --resume, the run to continue (default: the one written last)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume from the latest checkpoint of --run in --checkpoint-dir")
+    parser.add_argument("--course-seed", type=int, default=None,
+                        help="Play this one seeded course every generation; unchanged genomes then reuse cached fitness")
+    parser.add_argument("--max-pipes", type=int, default=None,
+                        help="End a generation once this many pipes have been passed")
+    parser.add_argument("--max-sim-seconds", type=float, default=None,
+                        help="End a generation after this much simulated time")
+    parser.add_argument("--max-wall-seconds", type=float, default=None,
+                        help="End a generation after this much real time (disables the fitness cache)")
+    parser.add_argument("--render-every", type=int, default=None, metavar="N",
+                        help="Visual generations: simulate at a fixed timestep as fast as possible and draw every Nth step")
+    parser.add_argument("--render-fps", type=float, default=None,
+                        help="Visual generations: simulate as fast as possible and draw at most this many frames per second")
+    parser.add_argument("--top-k", type=int, default=None,
+                        help="Visual generations: draw only the first K living birds (elites and hall of fame first)")
+    parser.add_argument("--publish-champion", default=None, metavar="PATH",
+                        help="Publish every new best genome to PATH for spectator.py to play")
+    parser.add_argument("--dt-ms", type=float, default=None,
+                        help=f"Fixed simulation timestep in ms (default: {HEADLESS_DT_MS:g}, real-time display: {1000 / FPS:g})")
+    parser.add_argument("--substeps", type=int, default=1,
+                        help="Physics steps per timestep; birds still decide once per timestep")
+    parser.add_argument("--swept", action="store_true",
+                        help="Test collisions along each physics step's motion (needs --collision geometric "
+                             "unless the SoA engine is used)")
+    parser.add_argument("--courses", type=int, default=1, metavar="K",
+                        help="Score every genome on K seeded courses per headless generation, in one batched "
+                             "SoA simulation")
+    parser.add_argument("--aggregate", type=parse_aggregate, default="mean", metavar="AGG",
+                        help=f"How --courses scores combine into fitness: {', '.join(AGGREGATES)} "
+                             "or a quantile qP, e.g. q0.25")
+    parser.add_argument("--compact", action="store_true",
+                        help="Store genomes as float32 rows of one shared matrix to train large populations in less memory")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-generation breakdown of time spent in each phase of the frame loop")
+    parser.add_argument("--profile-trace", default=None, metavar="PATH",
+                        help="Also write the profiled phases as a Chrome trace (implies --profile)")
     args = parser.parse_args()
+    pygame_engine = args.ga == "objects" and (not args.headless or (args.engine == "pygame" and not args.workers))
+    if args.swept and args.collision == "mask" and pygame_engine:
+        parser.error("--swept needs --collision geometric; the pixel-mask test is not swept")
+    if args.courses < 1:
+        parser.error("--courses must be at least 1")
+    if args.courses > 1 and args.ga == "objects" and args.engine == "pygame" and not args.workers:
+        parser.error("--courses needs --engine soa, --workers or --ga vector")
 
     # Set VISUAL_EVERY based on headless argument
     if args.headless:
@@ -213,28 +383,139 @@ def main():
     else:
         VISUAL_EVERY = 1
 
-    POP_SIZE, GENS = 150, 40
-    hall_of_fame   = []
+    if args.profile or args.profile_trace:
+        profiler.configure(True, args.profile_trace)
 
-    pop = [Bird(brain=NeuralNetwork()) for _ in range(POP_SIZE)]
-    for g in range(GENS):
+    POP_SIZE, GENS = 150, 40
+    hall_of_fame   = GenomeArchive(capacity=5)
+
+    course_rng = np.random.default_rng(args.seed)
+    if args.seed is not None:
+        # The object GA and NeuralNetwork() draw from the global generators
+        seed_python_rngs(args.seed)
+    cache = FitnessCache()
+    budget = EvalBudget(args.max_pipes, args.max_sim_seconds, args.max_wall_seconds)
+    clock = SimClock(args.dt_ms or HEADLESS_DT_MS, args.substeps, args.swept)
+    courses = CourseSet(args.courses, args.aggregate) if args.courses > 1 else None
+    # Real-time visual generations keep one step per display frame unless a timestep was chosen
+    fast_visual = bool(args.render_every or args.render_fps)
+    display_clock = clock if args.dt_ms or fast_visual else SimClock(1000 / FPS, args.substeps, args.swept)
+    # Only headless generations use the worker pool; display-only runs never start it
+    headless_eval = args.ga == "vector" or VISUAL_EVERY == 0
+    evaluator = ParallelEvaluator(args.workers) if args.workers > 0 and headless_eval else None
+
+    run_dir, resume_from = None, None
+    if args.resume:
+        run_dir = os.path.join(args.checkpoint_dir, args.run) if args.run else latest_run(args.checkpoint_dir)
+        resume_from = latest_checkpoint(run_dir) if run_dir else None
+        if resume_from is None:
+            print(f"No checkpoint in {run_dir or args.checkpoint_dir}, starting fresh")
+    if resume_from:
+        resume_state = load_checkpoint(resume_from)
+        mode = checkpoint_mode(resume_state[1])
+        if mode != args.ga:
+            parser.error(f"{resume_from} was written with --ga {mode}; resume it with --ga {mode}")
+    else:
+        run_dir = os.path.join(args.checkpoint_dir, args.run or new_run_name())
+    checkpoints = CheckpointWriter(run_dir) if args.checkpoint_every > 0 else None
+    publisher = ChampionPublisher(args.publish_champion, param_count()) if args.publish_champion else None
+
+    if args.ga == "vector":
+        trainer = Trainer(POP_SIZE, seed=args.seed, evaluator=evaluator,
+                          course_seed=args.course_seed, cache=cache, budget=budget,
+                          publisher=publisher, dtype=np.float32 if args.compact else np.float64,
+                          clock=clock, courses=courses)
+        if resume_from:
+            trainer.restore(*resume_state)
+            print(f"Resumed from {resume_from} (generation {trainer.generation})")
+        best = trainer.run(GENS, checkpoints, args.checkpoint_every)
+        if evaluator:
+            evaluator.close()
+        if checkpoints:
+            checkpoints.close()
+        if publisher:
+            publisher.close()
+        if profiler.write_trace():
+            print(f"Profile trace written to {profiler.trace_path}")
+        eval_population([bird_from_weights(best, is_elite=True)], display=True)
+        return
+
+    if args.compact:
+        pop = birds_from_genomes(init_population(POP_SIZE, np.random.default_rng(args.seed), dtype=np.float32))
+    else:
+        pop = [Bird(brain=NeuralNetwork()) for _ in range(POP_SIZE)]
+    history = []
+    start_gen = 0
+    if resume_from:
+        arrays, meta = resume_state
+        pop = birds_from_genomes(arrays["genomes"], dtype=np.float32 if args.compact else np.float64)
+        pop[0].is_elite = True
+        for w, f in zip(arrays["hof_genomes"], arrays["hof_fitness"]):
+            champ = bird_from_weights(w)
+            champ.fitness = float(f)
+            hall_of_fame.add(w, float(f), payload=champ)
+        history = arrays["history"].tolist()
+        start_gen = meta["generation"]
+        course_rng.bit_generator.state = meta["course_rng"]
+        restore_python_rng_state(meta["python_rng"])
+        print(f"Resumed from {resume_from} (generation {start_gen})")
+
+    for g in range(start_gen, GENS):
         do_display = (VISUAL_EVERY and ((g % VISUAL_EVERY == 0) or (g == GENS-1)))
         print(f"Gen {g+1}/{GENS} — display={'ON' if do_display else 'OFF'}")
-        eval_population(pop, display=do_display)
+        course_seed = args.course_seed if args.course_seed is not None else int(course_rng.integers(2**32))
+        if do_display:
+            eval_population(pop, display=True, collision_mode=args.collision,
+                            course=shared_course(course_seed), budget=budget,
+                            render_every=args.render_every, render_fps=args.render_fps, top_k=args.top_k,
+                            clock=display_clock)
+        else:
+            hits = eval_population_headless(pop, course_seed, args.engine, args.collision,
+                                            evaluator=evaluator, cache=cache, budget=budget, clock=clock,
+                                            courses=courses)
+            if hits:
+                print(f"  [Cache] {hits}/{len(pop)} genomes already scored on this course, simulation skipped")
 
         fits = [b.fitness for b in pop]
-        print(f"  Best: {max(fits)}   Avg: {sum(fits)/len(fits):.1f}")
+        print(f"  Best: {max(fits):g}   Avg: {sum(fits)/len(fits):.1f}")
+        history.append((max(fits), sum(fits)/len(fits)))
 
         # update hall of fame
-        candidates = hall_of_fame + pop
-        unique = {}
-        for b in sorted(candidates, key=lambda b: b.fitness, reverse=True):
-            key = tuple(b.brain.get_weights().tolist())
-            if key not in unique and len(unique) < 5:
-                unique[key] = b
-        hall_of_fame = list(unique.values())
-
-        pop = next_gen(pop, hall_of_fame, elite_k=3, reinject_k=3, mrate=0.04)
+        hall_of_fame.add_many([b.brain.get_weights() for b in pop], fits, payloads=pop)
+        if publisher:
+            champ_fitness, champ_genome, _ = hall_of_fame.best(1)[0]
+            publisher.publish(champ_genome, champ_fitness, g + 1)
+
+        with profiler.phase("next_gen"):
+            pop = next_gen(pop, [b for _, _, b in hall_of_fame.best()], elite_k=3, reinject_k=3, mrate=0.04)
+        profiler.report()
+
+        if checkpoints and (g + 1) % args.checkpoint_every == 0:
+            best = hall_of_fame.best()
+            checkpoints.submit(g + 1, {
+                "genomes": np.stack([b.brain.get_weights() for b in pop]),
+                "hof_genomes": np.array([w for _, w, _ in best]),
+                "hof_fitness": np.array([f for f, _, _ in best]),
+                "history": np.array(history, dtype=float).reshape(-1, 2),
+            }, {
+                "ga": "objects",
+                "generation": g + 1,
+                "course_rng": course_rng.bit_generator.state,
+                "python_rng": python_rng_state(),
+            })
+
+        if budget.reason:
+            print(f"  [Budget] {budget.reason} limit reached, stopping training")
+            break
+
+    if evaluator:
+        evaluator.close()
+    if checkpoints:
+        checkpoints.close()
+    if publisher:
+        publisher.close()
+    if profiler.write_trace():
+        print(f"Profile trace written to {profiler.trace_path}")
 
     if not VISUAL_EVERY:
         champ = max(pop, key=lambda b: b.fitness)
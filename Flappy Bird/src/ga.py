@@ -0,0 +1,90 @@
+"""
+Genetic algorithm helpers that work on flat genomes (``NeuralNetwork.get_weights``
+layout) and need no pygame.
+"""
+import random
+
+import numpy as np
+
+
+def crossover(w1, w2):
+    mask = np.random.rand(len(w1)) < 0.5
+    return np.where(mask, w1, w2)
+
+def mutate(w, rate=0.1, scale=0.5):
+    for i in range(len(w)):
+        if random.random() < rate:
+            w[i] += np.random.randn() * scale
+
+# ─── Population-level operators ──────────────────────────────────────────────
+
+def param_count(sizes=(3, 6, 1)):
+    """Number of weights and biases in a network with layer ``sizes``."""
+    in_sz, hid_sz, out_sz = sizes
+    return hid_sz * in_sz + hid_sz + out_sz * hid_sz + out_sz
+
+def init_population(pop_size, rng, sizes=(3, 6, 1), dtype=np.float64):
+    """
+    Draw fresh genomes distributed like ``NeuralNetwork()``: standard normal
+    weights and zero biases.
+
+    Args:
+        pop_size (int): Number of genomes.
+        rng (np.random.Generator): Random source.
+        sizes (tuple): (in_sz, hid_sz, out_sz) of the networks.
+        dtype (np.dtype): Floating point type of the genome matrix.
+
+    Returns:
+        np.ndarray: Genomes of shape (pop_size, n_params).
+    """
+    in_sz, hid_sz, out_sz = sizes
+    genomes = rng.standard_normal((pop_size, param_count(sizes))).astype(dtype, copy=False)
+    b1 = slice(hid_sz * in_sz, hid_sz * in_sz + hid_sz)
+    genomes[:, b1] = 0
+    genomes[:, -out_sz:] = 0
+    return genomes
+
+def breed_population(genomes, fitness, rng, elite_k=3, mrate=0.04, scale=0.5, reinject=None):
+    """
+    Vectorized ``breed``: selection, crossover, mutation and elitism as
+    whole-array operations on the genome matrix.
+
+    Every child picks two distinct elites, takes each weight from either
+    parent with probability 0.5 and mutates each weight with probability
+    ``mrate`` by Gaussian noise of std ``scale``.
+
+    Args:
+        genomes (np.ndarray): Current genomes, shape (pop, n_params).
+        fitness (np.ndarray): Fitness of every genome.
+        rng (np.random.Generator): Seeded random source.
+        elite_k (int): Number of elites kept and used as parents.
+        mrate (float): Per-weight mutation probability.
+        scale (float): Standard deviation of the mutation noise.
+        reinject (np.ndarray, optional): Extra genomes (e.g. hall of fame)
+            copied after the elites, like ``next_gen`` does.
+
+    Returns:
+        np.ndarray: New genomes, shape (pop, n_params), elites first.
+    """
+    pop, n_params = genomes.shape
+    order = np.argsort(-np.asarray(fitness), kind="stable")
+    elites = genomes[order[:elite_k]]
+    keep = elites if reinject is None or not len(reinject) else np.concatenate([elites, reinject])
+    keep = keep[:pop]
+    n_children = pop - len(keep)
+    k = len(elites)
+
+    p1 = rng.integers(k, size=n_children)
+    p2 = (p1 + rng.integers(1, k, size=n_children)) % k if k > 1 else p1
+    out = np.empty_like(genomes)
+    out[:len(keep)] = keep
+    children = out[len(keep):]
+    # One random bit per weight decides which parent it comes from
+    bits = np.frombuffer(rng.bytes((n_children * n_params + 7) // 8), dtype=np.uint8)
+    pick = np.unpackbits(bits, count=n_children * n_params).view(bool).reshape(n_children, n_params)
+    np.copyto(children, elites[p1])
+    np.copyto(children, elites[p2], where=pick)
+    # Draw noise only for the weights that actually mutate
+    hit = np.flatnonzero(rng.random((n_children, n_params), dtype=np.float32) < mrate)
+    children.flat[hit] += rng.standard_normal(len(hit)) * scale
+    return out
@@ -0,0 +1,432 @@
+"""
+Pygame-free, structure-of-arrays headless simulation of a Flappy Bird population.
+
+Bird state (``y``, ``speed``, ``angle``, ``alive``, ``fitness``) lives in NumPy
+arrays and the pipes on screen are stored as arrays too, so each step applies
+the same gravity, flap, scroll and difficulty rules as ``Bird.update`` and
+``Pipe.update`` to the whole population at once. A ``SimClock`` sets the
+timestep, physics substeps and swept collision.
+"""
+import numpy as np
+
+import collision
+from budget import gap_tiebreak
+from constants import (
+    SCREEN_HEIGHT, SCREEN_WIDTH, BIRD_X,
+    GRAVITY, FLAP_VELOCITY, PIPE_SPEED, TILT_DELAY, PIPE_SPACING,
+    HEADLESS_DT_MS, GROUND_HEIGHT, BIRD_SIZE, PIPE_WIDTH, INITIAL_PIPES,
+    SPEEDUP_EVERY, SPEEDUP_STEP, MAX_PIPE_SPEED,
+)
+from course import Course
+from features import next_pipe, population_inputs, shared_features
+from lanes import PipeLanes
+from profiling import profiler
+from simclock import SimClock
+
+
+class HeadlessSim:
+    """
+    Vectorized headless simulation of a whole population.
+
+    Attributes:
+        brains (PopulationNetwork): Batched network deciding every bird's flaps.
+        course (Course): Pipe course being played.
+        y (np.ndarray): Vertical position of every bird.
+        speed (np.ndarray): Vertical speed of every bird.
+        angle (np.ndarray): Tilt angle of every bird.
+        last_flap (np.ndarray): Simulated time (ms) of each bird's last flap.
+        alive (np.ndarray): Boolean mask of living birds.
+        fitness (np.ndarray): Pipes passed by each bird while alive.
+        pipe_x (np.ndarray): Horizontal position of the pipes on screen.
+        pipe_height (np.ndarray): Top pipe height of the pipes on screen.
+        pipe_gap (np.ndarray): Gap size of the pipes on screen.
+        pipe_passed (np.ndarray): Whether each pipe on screen has been passed.
+        scroll_speed (float): Current pipe speed in px/sec.
+        pipes_passed (int): Total pipes passed so far.
+        clock (SimClock): Timestep, substeps and collision sweeping.
+        now (float): Simulated time in ms.
+        steps (int): Number of control steps simulated.
+        trace (list or None): When a list, every collision test appends the
+            tested birds' ``(y, angle)`` and the pipe arrays to it.
+    """
+    def __init__(self, brains, rng=None, dt_ms=HEADLESS_DT_MS, verbose=False, course=None, clock=None):
+        """
+        Initialize the simulation with every bird alive at the start position.
+
+        Args:
+            brains (PopulationNetwork): Batched network for the population.
+            rng (np.random.Generator, optional): Random source for the pipe
+                course when no ``course`` is given. Defaults to a fresh
+                unseeded generator.
+            dt_ms (float): Simulated milliseconds per step, when no ``clock``
+                is given.
+            verbose (bool): Print live progress and difficulty changes like
+                ``eval_population`` does.
+            course (Course, optional): Pipe course to play.
+            clock (SimClock, optional): Timestep, physics substeps and swept
+                collision. Defaults to ``SimClock(dt_ms)``.
+        """
+        n = len(brains)
+        self.brains = brains
+        self.course = course if course is not None else Course(rng=rng)
+        self.clock = clock if clock is not None else SimClock(dt_ms)
+        # Physics runs at the substep; the birds decide once per control step
+        self.dt_ms = self.clock.sub_dt_ms
+        self.dt_s = self.dt_ms / 1000.0
+        self.verbose = verbose
+        self.ground_y = SCREEN_HEIGHT - GROUND_HEIGHT
+
+        self.y = np.full(n, SCREEN_HEIGHT / 2)
+        self.speed = np.zeros(n)
+        self.angle = np.zeros(n, dtype=np.int64)
+        self.last_flap = np.zeros(n)
+        self.alive = np.ones(n, dtype=bool)
+        self.fitness = np.zeros(n)
+
+        heights, gaps = zip(*(self.course[i] for i in range(INITIAL_PIPES)))
+        self.spawned = INITIAL_PIPES
+        self.pipe_x = SCREEN_WIDTH + PIPE_SPACING * np.arange(INITIAL_PIPES, dtype=float)
+        self.pipe_height = np.array(heights, dtype=float)
+        self.pipe_gap = np.array(gaps, dtype=float)
+        self.pipe_passed = np.zeros(INITIAL_PIPES, dtype=bool)
+
+        self.scroll_speed = PIPE_SPEED
+        self.pipes_passed = 0
+        self.last_report = 0
+        self.now = 0.0
+        self.steps = 0
+        self.trace = None
+
+    def _update_pipes(self):
+        """Scroll pipes, credit passes, raise difficulty and recycle pipes."""
+        old_speed = self.scroll_speed
+        self.pipe_x -= old_speed * self.dt_s
+        newly = np.flatnonzero(~self.pipe_passed & (self.pipe_x < BIRD_X))
+        for k in newly:
+            self.pipe_passed[k] = True
+            self.fitness[self.alive] += 1
+            self.pipes_passed += 1
+            if self.verbose and self.pipes_passed // 5000 > self.last_report:
+                self.last_report = self.pipes_passed // 5000
+                print(f"  [Live] Pipes passed: {self.pipes_passed}")
+            if self.pipes_passed % SPEEDUP_EVERY == 0:
+                new_speed = min(self.scroll_speed + SPEEDUP_STEP, MAX_PIPE_SPEED)
+                # Pipes after this one in the update order already move at the new speed
+                self.pipe_x[k + 1:] -= (new_speed - self.scroll_speed) * self.dt_s
+                self.scroll_speed = new_speed
+                if self.verbose:
+                    print(f"  [Difficulty] PIPE_SPEED: {self.scroll_speed}")
+
+        keep = self.pipe_x + PIPE_WIDTH >= 0
+        if not keep.all():
+            self.pipe_x = self.pipe_x[keep]
+            self.pipe_height = self.pipe_height[keep]
+            self.pipe_gap = self.pipe_gap[keep]
+            self.pipe_passed = self.pipe_passed[keep]
+        if len(newly):
+            height, gap = self.course[self.spawned]
+            self.spawned += 1
+            self.pipe_x = np.append(self.pipe_x, self.pipe_x[-1] + PIPE_SPACING)
+            self.pipe_height = np.append(self.pipe_height, height)
+            self.pipe_gap = np.append(self.pipe_gap, gap)
+            self.pipe_passed = np.append(self.pipe_passed, False)
+
+    def _think(self, idx):
+        """Flap every living bird whose network fires for the next pipe ahead."""
+        k = next_pipe(self.pipe_x)
+        if k is None:
+            return
+        shared = shared_features(self.pipe_x[k], self.pipe_height[k], self.pipe_gap[k], self.scroll_speed)
+        X = population_inputs(self.y[idx], shared, self.brains.in_sz)
+        flap = idx[self.brains.decide(X, idx)]
+        self.speed[flap] = FLAP_VELOCITY
+        self.last_flap[flap] = self.now
+        self.angle[flap] = np.minimum(self.angle[flap] + 32, 25)
+
+    def _update_birds(self, idx):
+        """Apply gravity and tilt, and kill birds outside the screen."""
+        self.speed[idx] += GRAVITY * self.dt_s
+        self.y[idx] += self.speed[idx] * self.dt_s
+        y = self.y[idx]
+        out = (y > self.ground_y - BIRD_SIZE) | (y < 0)
+        tilt = idx[self.now - self.last_flap[idx] > TILT_DELAY]
+        self.angle[tilt] = np.maximum(self.angle[tilt] - 1, -25)
+        self.alive[idx[out]] = False
+
+    def _collide(self, idx, y0=None):
+        """
+        Kill birds that geometrically overlap one of the nearby pipes.
+
+        With ``y0``, the birds' positions before this physics step, the
+        whole motion of the step is tested instead of its end point.
+        """
+        if self.trace is not None:
+            self.trace.append((self.y[idx].copy(), self.angle[idx].copy(),
+                               self.pipe_x.copy(), self.pipe_height.copy(), self.pipe_gap.copy()))
+        if y0 is None:
+            hit = collision.hits(self.y[idx], self.angle[idx],
+                                 self.pipe_x, self.pipe_height, self.pipe_gap)
+        else:
+            hit = collision.hits_swept(y0, self.y[idx], self.angle[idx], self.pipe_x,
+                                       self.pipe_height, self.pipe_gap, self.scroll_speed * self.dt_s)
+        self.alive[idx[hit]] = False
+
+    def step(self):
+        """Advance the simulation by one control step of ``clock.substeps`` physics steps."""
+        for sub in range(self.clock.substeps):
+            self.now += self.dt_ms
+            with profiler.phase("pipes"):
+                self._update_pipes()
+            idx = np.flatnonzero(self.alive)
+            if sub == 0:
+                with profiler.phase("think"):
+                    self._think(idx)
+            y0 = self.y[idx] if self.clock.swept else None
+            with profiler.phase("update"):
+                self._update_birds(idx)
+            living = self.alive[idx]
+            idx = idx[living]
+            with profiler.phase("collision"):
+                self._collide(idx, None if y0 is None else y0[living])
+        self.steps += 1
+
+    def apply_tiebreak(self):
+        """Add the gap-centre tie-break bonus to every bird still alive."""
+        k = next_pipe(self.pipe_x)
+        if k is None:
+            return
+        idx = np.flatnonzero(self.alive)
+        self.fitness[idx] += gap_tiebreak(self.y[idx] + BIRD_SIZE / 2,
+                                          self.pipe_height[k] + self.pipe_gap[k] / 2)
+
+    def run(self, max_steps=None, budget=None):
+        """
+        Step until every bird is dead or the budget is exhausted.
+
+        Args:
+            max_steps (int, optional): Stop early after this many steps.
+            budget (EvalBudget, optional): Limits for this run. Survivors of
+                an exhausted budget keep their capped score plus a tie-break.
+
+        Returns:
+            np.ndarray: Fitness of every bird.
+        """
+        if budget:
+            budget.start()
+        while self.alive.any():
+            if max_steps is not None and self.steps >= max_steps:
+                break
+            self.step()
+            if budget and budget.check(self.pipes_passed, self.now):
+                self.apply_tiebreak()
+                if self.verbose:
+                    print(f"  [Budget] run ended ({budget.reason}) after {self.pipes_passed} pipes")
+                break
+        return self.fitness
+
+
+class MultiCourseSim:
+    """
+    Vectorized headless simulation of every genome on several courses at once.
+
+    Bird ``i * K + j`` flies genome ``i`` on course ``j``. Each course keeps
+    its own pipes, speed and pipe count in one lane of a ``PipeLanes``, so
+    scoring N genomes on K courses is one simulation of N*K birds rather than
+    K simulations of N birds. On one course it matches ``HeadlessSim``.
+
+    Attributes:
+        brains (PopulationNetwork): Batched network of the N genomes.
+        clock (SimClock): Timestep, substeps and collision sweeping.
+        lanes (PipeLanes): Pipes of every course.
+        genome_of (np.ndarray): Genome index of every bird.
+        course_of (np.ndarray): Course index of every bird.
+        y, speed, angle, last_flap, alive, fitness (np.ndarray): Bird state,
+            as in ``HeadlessSim``, of shape (N*K,).
+        running (np.ndarray): Courses still being simulated.
+        now (float): Simulated time in ms.
+        steps (int): Number of control steps simulated.
+    """
+    def __init__(self, brains, courses, verbose=False, clock=None):
+        """
+        Args:
+            brains (PopulationNetwork): Batched network of the N genomes.
+            courses (list): K ``Course`` objects every genome plays.
+            verbose (bool): Print why the run ended.
+            clock (SimClock, optional): Timestep, substeps and collision sweeping.
+        """
+        n, k = len(brains), len(courses)
+        self.brains = brains
+        self.n_courses = k
+        self.verbose = verbose
+        self.clock = clock if clock is not None else SimClock()
+        self.dt_ms = self.clock.sub_dt_ms
+        self.dt_s = self.dt_ms / 1000.0
+        self.ground_y = SCREEN_HEIGHT - GROUND_HEIGHT
+        self.lanes = PipeLanes(k, self.dt_ms, list(courses))
+
+        self.genome_of = np.repeat(np.arange(n), k)
+        self.course_of = np.tile(np.arange(k), n)
+        self.y = np.full(n * k, SCREEN_HEIGHT / 2)
+        self.speed = np.zeros(n * k)
+        self.angle = np.zeros(n * k, dtype=np.int64)
+        self.last_flap = np.zeros(n * k)
+        self.alive = np.ones(n * k, dtype=bool)
+        self.fitness = np.zeros(n * k)
+        self.running = np.ones(k, dtype=bool)
+        self.now = 0.0
+        self.steps = 0
+
+    def _think(self, idx):
+        """Flap every living bird whose network fires for its course's next pipe."""
+        shared = self.lanes.features()
+        in_sz = self.brains.in_sz
+        if in_sz - 1 > shared.shape[1]:
+            raise ValueError(f"Networks with {in_sz} inputs need more than the "
+                             f"{shared.shape[1]} shared features")
+        X = np.empty((len(idx), in_sz))
+        X[:, 0] = self.y[idx] / SCREEN_HEIGHT
+        X[:, 1:] = shared[self.course_of[idx], :in_sz - 1]
+        flap = idx[self.brains.decide(X, self.genome_of[idx])]
+        self.speed[flap] = FLAP_VELOCITY
+        self.last_flap[flap] = self.now
+        self.angle[flap] = np.minimum(self.angle[flap] + 32, 25)
+
+    def _update_birds(self, idx):
+        """Apply gravity and tilt, and kill birds outside the screen."""
+        self.speed[idx] += GRAVITY * self.dt_s
+        self.y[idx] += self.speed[idx] * self.dt_s
+        y = self.y[idx]
+        out = (y > self.ground_y - BIRD_SIZE) | (y < 0)
+        tilt = idx[self.now - self.last_flap[idx] > TILT_DELAY]
+        self.angle[tilt] = np.maximum(self.angle[tilt] - 1, -25)
+        self.alive[idx[out]] = False
+
+    def _collide(self, idx, y0=None):
+        """
+        Kill birds that overlap the pipe nearest to them on their course.
+
+        With ``y0`` the step's motion is swept against the pipe nearest at
+        its end and, where it differs, the one nearest at its start.
+        """
+        slot = self.lanes.nearest()
+        x, height, gap = self.lanes.pipes(slot)
+        c = self.course_of[idx]
+        if y0 is None:
+            hit = collision.hits_each(self.y[idx], self.angle[idx], x[c], height[c], gap[c])
+            self.alive[idx[hit]] = False
+            return
+        dx = self.lanes.scroll_speed * self.dt_s
+        hit = collision.hits_swept(y0, self.y[idx], self.angle[idx], x[c], height[c], gap[c],
+                                   dx[c], each=True)
+        before = self.lanes.nearest(dx)
+        changed = np.flatnonzero(~hit & (before != slot)[c])
+        if len(changed):
+            x, height, gap = self.lanes.pipes(before)
+            cc = c[changed]
+            hit[changed] = collision.hits_swept(y0[changed], self.y[idx[changed]], self.angle[idx[changed]],
+                                                x[cc], height[cc], gap[cc], dx[cc], each=True)
+        self.alive[idx[hit]] = False
+
+    def step(self):
+        """Advance every running course by one control step."""
+        lanes = np.flatnonzero(self.running)
+        for sub in range(self.clock.substeps):
+            self.now += self.dt_ms
+            with profiler.phase("pipes"):
+                passed = np.zeros(self.n_courses, dtype=bool)
+                passed[lanes] = self.lanes.advance(lanes)
+                self.fitness[self.alive & passed[self.course_of]] += 1
+            idx = np.flatnonzero(self.alive)
+            if sub == 0:
+                with profiler.phase("think"):
+                    self._think(idx)
+            y0 = self.y[idx] if self.clock.swept else None
+            with profiler.phase("update"):
+                self._update_birds(idx)
+            living = self.alive[idx]
+            idx = idx[living]
+            with profiler.phase("collision"):
+                self._collide(idx, None if y0 is None else y0[living])
+        self.running &= np.bincount(self.course_of[self.alive], minlength=self.n_courses) > 0
+        self.steps += 1
+
+    def finish(self, courses):
+        """End ``courses`` now; their survivors get the gap-centre tie-break."""
+        x, height, gap = self.lanes.pipes(self.lanes.next_pipe())
+        idx = np.flatnonzero(self.alive & np.isin(self.course_of, courses))
+        c = self.course_of[idx]
+        self.fitness[idx] += gap_tiebreak(self.y[idx] + BIRD_SIZE / 2, height[c] + gap[c] / 2)
+        self.alive[idx] = False
+        self.running[courses] = False
+
+    def run(self, max_steps=None, budget=None):
+        """
+        Step until every bird is dead or the budget is exhausted.
+
+        A pipe budget caps each course separately; time budgets end all
+        courses together.
+
+        Args:
+            max_steps (int, optional): Stop early after this many steps.
+            budget (EvalBudget, optional): Limits for this run.
+
+        Returns:
+            np.ndarray: Fitness of shape (N, K), genomes by courses.
+        """
+        if budget:
+            budget.start()
+        capped = False
+        while self.running.any():
+            if max_steps is not None and self.steps >= max_steps:
+                break
+            self.step()
+            if not budget:
+                continue
+            if budget.max_pipes is not None:
+                done = np.flatnonzero(self.running & (self.lanes.score >= budget.max_pipes))
+                if len(done):
+                    self.finish(done)
+                    capped = True
+            # Pipes are capped per course above; only the time limits apply here
+            if budget.check(0, self.now):
+                self.finish(np.flatnonzero(self.running))
+        if capped and not budget.reason:
+            budget.reason = "pipes"
+        if self.verbose and budget and budget.reason:
+            print(f"  [Budget] run ended ({budget.reason}) after {self.lanes.score.max()} pipes")
+        return self.fitness.reshape(len(self.brains), self.n_courses)
+
+
+def evaluate_courses(brains, courses, verbose=False, budget=None, clock=None):
+    """
+    Score every genome on every course in one batched simulation.
+
+    Args:
+        brains (PopulationNetwork): Batched network for the population.
+        courses (list): Courses to play.
+        verbose (bool): Print why the run ended.
+        budget (EvalBudget, optional): Limits for this generation.
+        clock (SimClock, optional): Timestep, substeps and collision sweeping.
+
+    Returns:
+        np.ndarray: Fitness of shape (pop, len(courses)).
+    """
+    return MultiCourseSim(brains, courses, verbose=verbose, clock=clock).run(budget=budget)
+
+
+def evaluate(brains, rng=None, verbose=False, course=None, budget=None, clock=None):
+    """
+    Run a full headless generation and return the fitness vector.
+
+    Args:
+        brains (PopulationNetwork): Batched network for the population.
+        rng (np.random.Generator, optional): Random source for the pipe course.
+        verbose (bool): Print live progress like ``eval_population``.
+        course (Course, optional): Pipe course to play instead of ``rng``.
+        budget (EvalBudget, optional): Limits for this generation.
+        clock (SimClock, optional): Timestep, substeps and collision sweeping.
+
+    Returns:
+        np.ndarray: Pipes passed by every bird.
+    """
+    return HeadlessSim(brains, rng=rng, verbose=verbose, course=course, clock=clock).run(budget=budget)
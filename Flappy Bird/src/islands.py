@@ -0,0 +1,209 @@
+"""
+Island-model genetic algorithm with periodic migration.
+
+Each island is a subpopulation evolving independently in its own process on
+its own stream of seeded courses. Every ``interval`` generations the islands
+pause, send their top genomes to a neighbour (ring) or a random other island,
+and overwrite their last-bred children with the migrants they receive. The
+children have not been evaluated yet, so these are arbitrary non-elite
+offspring; the elites are never replaced.
+
+Run ``python islands.py --islands 4`` to train; per-island and global best
+fitness are printed after every migration together with the evaluation
+throughput.
+"""
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+import ga
+import headless
+from budget import EvalBudget
+from course import Course
+from nn import PopulationNetwork
+
+TOPOLOGIES = ("ring", "random")
+# Simulated seconds per generation unless the command line says otherwise
+DEFAULT_MAX_SIM_SECONDS = 300.0
+
+
+def island_worker(conn, island_id, pop_size, seed, elite_k=3, mrate=0.04, budget=None):
+    """
+    Evolve one island, driven by commands from the coordinator.
+
+    Every command is ``(generations, migrants)``: overwrite the last-bred
+    children with ``migrants`` (if any, at most all non-elite rows), evolve
+    for ``generations`` and reply with the
+    per-generation (best, mean) history and the top genomes of the last
+    evaluated generation. ``None`` stops the worker.
+
+    Args:
+        conn (multiprocessing.connection.Connection): Pipe to the coordinator.
+        island_id (int): Index of this island.
+        pop_size (int): Genomes on this island.
+        seed (int, optional): Base seed; the island uses ``seed + island_id``.
+        elite_k (int): Elites kept per generation.
+        mrate (float): Per-weight mutation probability.
+        budget (EvalBudget, optional): Limits for every generation, so a
+            genome that never dies cannot stall the island.
+    """
+    island_seed = None if seed is None else seed + island_id
+    rng = np.random.default_rng(island_seed)
+    genomes = ga.init_population(pop_size, rng)
+
+    while True:
+        msg = conn.recv()
+        if msg is None:
+            break
+        generations, migrants = msg
+        if migrants is not None and len(migrants):
+            migrants = migrants[:pop_size - elite_k]
+            genomes[-len(migrants):] = migrants
+        history = []
+        for _ in range(generations):
+            brains = PopulationNetwork.from_weights(genomes)
+            fitness = headless.evaluate(brains, course=Course(int(rng.integers(2**32))), budget=budget)
+            history.append((float(fitness.max()), float(fitness.mean())))
+            top = genomes[np.argsort(-fitness, kind="stable")]
+            genomes = ga.breed_population(genomes, fitness, rng, elite_k=elite_k, mrate=mrate)
+        conn.send((history, top))
+    conn.close()
+
+
+def route(n_islands, topology, rng):
+    """
+    Pick the destination island of every island's migrants.
+
+    Args:
+        n_islands (int): Number of islands.
+        topology (str): ``"ring"`` sends to the next island, ``"random"`` to
+            a random other island.
+        rng (np.random.Generator): Random source for the random topology.
+
+    Returns:
+        list: ``dest[i]`` is the island receiving island ``i``'s migrants.
+    """
+    if topology == "ring" or n_islands < 2:
+        return [(i + 1) % n_islands for i in range(n_islands)]
+    return [int((i + rng.integers(1, n_islands)) % n_islands) for i in range(n_islands)]
+
+
+def gather_migrants(tops, dest, migrants):
+    """
+    Migrants every island receives.
+
+    Several islands may send to the same destination (random topology), so
+    their migrants are concatenated rather than overwriting each other.
+
+    Args:
+        tops (list): Genomes of every island, fittest first.
+        dest (list): Destination of every island's migrants, from ``route``.
+        migrants (int): Genomes each island sends.
+
+    Returns:
+        list: Per island, the array of migrants it receives, or None.
+    """
+    incoming = [[] for _ in dest]
+    for src, top in enumerate(tops):
+        incoming[dest[src]].append(top[:migrants])
+    return [np.concatenate(rows) if rows else None for rows in incoming]
+
+
+def run_islands(n_islands=4, generations=40, interval=5, migrants=2,
+                topology="ring", pop_size=150, seed=None, verbose=True, budget=None):
+    """
+    Run the island model and return the fitness history.
+
+    Args:
+        n_islands (int): Number of islands (processes).
+        generations (int): Generations evolved on every island.
+        interval (int): Generations between migrations.
+        migrants (int): Genomes each island sends per migration.
+        topology (str): Migration topology, one of ``TOPOLOGIES``.
+        pop_size (int): Genomes per island.
+        seed (int, optional): Base seed for courses, initial genomes and routing.
+        verbose (bool): Print per-island and global best after every migration.
+        budget (EvalBudget, optional): Limits for every generation on every island.
+
+    Returns:
+        dict: ``island_best`` (per-generation best of every island, shape
+        (generations, n_islands)), ``global_best``, ``elapsed`` seconds and
+        ``evals_per_s`` genome evaluations per second.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+    rng = np.random.default_rng(seed)
+    conns, procs = [], []
+    for i in range(n_islands):
+        parent, child = multiprocessing.Pipe()
+        p = multiprocessing.Process(target=island_worker, args=(child, i, pop_size, seed),
+                                    kwargs={"budget": budget}, daemon=True)
+        p.start()
+        conns.append(parent)
+        procs.append(p)
+
+    island_best = []
+    incoming = [None] * n_islands
+    done = 0
+    start = time.perf_counter()
+    try:
+        while done < generations:
+            k = min(interval, generations - done)
+            for conn, mig in zip(conns, incoming):
+                conn.send((k, mig))
+            replies = [conn.recv() for conn in conns]
+            done += k
+            for g in range(k):
+                island_best.append([history[g][0] for history, _ in replies])
+            dest = route(n_islands, topology, rng)
+            incoming = gather_migrants([top for _, top in replies], dest, migrants)
+            if verbose:
+                bests = island_best[-1]
+                print(f"Gen {done}/{generations} — islands best: [{', '.join(f'{b:g}' for b in bests)}]   "
+                      f"global best: {max(max(row) for row in island_best):g}")
+    finally:
+        for conn in conns:
+            conn.send(None)
+        for p in procs:
+            p.join()
+
+    elapsed = time.perf_counter() - start
+    island_best = np.array(island_best)
+    result = {
+        "island_best": island_best,
+        "global_best": float(island_best.max()) if island_best.size else 0.0,
+        "elapsed": elapsed,
+        "evals_per_s": n_islands * pop_size * generations / elapsed if elapsed else 0.0,
+    }
+    if verbose:
+        print(f"Global best: {result['global_best']:g}   "
+              f"{result['evals_per_s']:.0f} genome evaluations/s on {n_islands} islands")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flappy Bird AI island-model trainer")
+    parser.add_argument("--islands", type=int, default=4, help="Number of islands (processes)")
+    parser.add_argument("--generations", type=int, default=40, help="Generations per island")
+    parser.add_argument("--interval", type=int, default=5, help="Generations between migrations")
+    parser.add_argument("--migrants", type=int, default=2, help="Genomes sent per island per migration")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="ring", help="Migration topology")
+    parser.add_argument("--pop-size", type=int, default=150, help="Genomes per island")
+    parser.add_argument("--seed", type=int, default=None, help="Base seed for reproducible runs")
+    parser.add_argument("--max-pipes", type=int, default=None,
+                        help="End a generation once this many pipes have been passed")
+    parser.add_argument("--max-sim-seconds", type=float, default=DEFAULT_MAX_SIM_SECONDS,
+                        help="End a generation after this much simulated time "
+                             f"(default: {DEFAULT_MAX_SIM_SECONDS:g}, so an island never stalls)")
+    parser.add_argument("--max-wall-seconds", type=float, default=None,
+                        help="End a generation after this much real time")
+    args = parser.parse_args()
+    budget = EvalBudget(args.max_pipes, args.max_sim_seconds, args.max_wall_seconds)
+    run_islands(args.islands, args.generations, args.interval, args.migrants,
+                args.topology, args.pop_size, args.seed, budget=budget)
+
+
+if __name__ == "__main__":
+    main()
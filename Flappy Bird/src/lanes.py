@@ -0,0 +1,180 @@
+"""
+Many independent pipe courses advanced together.
+
+``PipeLanes`` holds the pipes of ``n`` lanes in fixed-size slot arrays of
+shape (n, PIPE_SLOTS) and applies the scroll, scoring, speed-up and recycling
+rules of ``HeadlessSim._update_pipes`` to any subset of lanes at once. Each
+lane has its own clock, speed and pipe count. A lane replays one of the given
+courses, or draws random valid pipes when no courses are given.
+``BatchFlappyEnv`` uses one lane per game; ``headless.MultiCourseSim`` one
+lane per course.
+"""
+import numpy as np
+
+from constants import (
+    SCREEN_HEIGHT, SCREEN_WIDTH, BIRD_X, BIRD_SIZE,
+    PIPE_SPEED, PIPE_SPACING, PIPE_WIDTH, INITIAL_PIPES,
+    SPEEDUP_EVERY, SPEEDUP_STEP, MAX_PIPE_SPEED,
+)
+from course import VALID_PIPES
+from features import shared_features
+
+# Pipe slots per lane; one more than ever on screen at once
+PIPE_SLOTS = INITIAL_PIPES + 1
+
+
+class PipeLanes:
+    """
+    Pipe state of ``n`` independent lanes.
+
+    Attributes:
+        n (int): Number of lanes.
+        dt_ms (float): Simulated milliseconds per ``advance``.
+        courses (list or None): Courses the lanes replay.
+        course_of (np.ndarray): Index into ``courses`` of every lane.
+        rng (np.random.Generator): Source of random pipes without courses.
+        x, height, gap, passed, active (np.ndarray): Pipe slots, shape (n, PIPE_SLOTS).
+            Inactive slots have ``x`` at +inf.
+        scroll_speed (np.ndarray): Pipe speed of every lane in px/sec.
+        score (np.ndarray): Pipes passed in every lane.
+        spawned (np.ndarray): Pipes taken from every lane's course so far.
+        now (np.ndarray): Simulated time of every lane in ms.
+    """
+    def __init__(self, n, dt_ms, courses=None, course_of=None, rng=None):
+        """
+        Args:
+            n (int): Number of lanes.
+            dt_ms (float): Simulated milliseconds per ``advance``.
+            courses (list, optional): ``Course`` objects to replay.
+            course_of (np.ndarray, optional): Course index of every lane.
+                Defaults to lane ``i`` playing ``courses[i]``, or every lane
+                playing ``courses[0]`` if there is only one.
+            rng (np.random.Generator, optional): Random pipes when no
+                ``courses`` are given.
+        """
+        self.n = n
+        self.dt_ms = dt_ms
+        self.dt_s = dt_ms / 1000.0
+        self.courses = courses
+        if course_of is None:
+            course_of = np.zeros(n, dtype=np.intp) if not courses or len(courses) == 1 else np.arange(n)
+        self.course_of = np.asarray(course_of, dtype=np.intp)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.x = np.full((n, PIPE_SLOTS), np.inf)
+        self.height = np.zeros((n, PIPE_SLOTS))
+        self.gap = np.zeros((n, PIPE_SLOTS))
+        self.passed = np.zeros((n, PIPE_SLOTS), dtype=bool)
+        self.active = np.zeros((n, PIPE_SLOTS), dtype=bool)
+        self.scroll_speed = np.full(n, PIPE_SPEED)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.spawned = np.zeros(n, dtype=np.int64)
+        self.now = np.zeros(n)
+        self.reset(np.arange(n))
+
+    def _draw(self, idx, count):
+        """Heights and gaps of the next ``count`` pipes of lanes ``idx``."""
+        if self.courses is None:
+            pick = VALID_PIPES[self.rng.integers(len(VALID_PIPES), size=(len(idx), count))]
+            return pick[..., 0], pick[..., 1]
+        k = self.spawned[idx, None] + np.arange(count)
+        heights = np.empty(k.shape, dtype=np.int64)
+        gaps = np.empty(k.shape, dtype=np.int64)
+        of = self.course_of[idx]
+        for c in np.unique(of):
+            sel = of == c
+            course = self.courses[c]
+            course[int(k[sel].max())]   # extend the course far enough
+            heights[sel] = course.heights[k[sel]]
+            gaps[sel] = course.gaps[k[sel]]
+        return heights, gaps
+
+    def reset(self, idx):
+        """Put lanes ``idx`` back at the start of their course."""
+        self.now[idx] = 0.0
+        self.scroll_speed[idx] = PIPE_SPEED
+        self.score[idx] = 0
+        self.spawned[idx] = 0
+        heights, gaps = self._draw(idx, INITIAL_PIPES)
+        self.spawned[idx] = INITIAL_PIPES
+        self.x[idx] = np.inf
+        self.x[idx, :INITIAL_PIPES] = SCREEN_WIDTH + PIPE_SPACING * np.arange(INITIAL_PIPES)
+        self.height[idx, :INITIAL_PIPES] = heights
+        self.gap[idx, :INITIAL_PIPES] = gaps
+        self.passed[idx] = False
+        self.active[idx] = False
+        self.active[idx, :INITIAL_PIPES] = True
+
+    def advance(self, idx):
+        """
+        Move the clock and pipes of lanes ``idx`` one step forward.
+
+        Returns:
+            np.ndarray: Boolean mask over ``idx`` of lanes that passed a pipe.
+        """
+        self.now[idx] += self.dt_ms
+        x = self.x[idx]
+        active = self.active[idx]
+        speed = self.scroll_speed[idx]
+        x -= speed[:, None] * self.dt_s
+
+        newly = active & ~self.passed[idx] & (x < BIRD_X)
+        passed = newly.any(axis=1)
+        self.passed[idx] |= newly
+        score = self.score[idx] + passed
+        self.score[idx] = score
+
+        # Speed-up on every SPEEDUP_EVERY-th pipe; pipes further right already move faster
+        up = np.flatnonzero(passed & (score % SPEEDUP_EVERY == 0))
+        if len(up):
+            new_speed = np.minimum(speed[up] + SPEEDUP_STEP, MAX_PIPE_SPEED)
+            pass_x = np.where(newly[up], x[up], -np.inf).max(axis=1)
+            later = active[up] & (x[up] > pass_x[:, None])
+            x[up] -= later * ((new_speed - speed[up]) * self.dt_s)[:, None]
+            self.scroll_speed[idx[up]] = new_speed
+
+        gone = active & (x + PIPE_WIDTH < 0)
+        active &= ~gone
+        x[gone] = np.inf
+
+        g = np.flatnonzero(passed)
+        if len(g):
+            rows = idx[g]
+            slot = np.argmin(active[g], axis=1)
+            newest = np.where(active[g], x[g], -np.inf).max(axis=1)
+            heights, gaps = self._draw(rows, 1)
+            self.spawned[rows] += 1
+            x[g, slot] = newest + PIPE_SPACING
+            active[g, slot] = True
+            self.height[rows, slot] = heights[:, 0]
+            self.gap[rows, slot] = gaps[:, 0]
+            self.passed[rows, slot] = False
+
+        self.x[idx] = x
+        self.active[idx] = active
+        return passed
+
+    def next_pipe(self):
+        """Slot of the first pipe still ahead of the birds in every lane."""
+        return np.argmin(np.where(self.x + PIPE_WIDTH > BIRD_X, self.x, np.inf), axis=1)
+
+    def nearest(self, dx=0.0):
+        """
+        Slot of the pipe horizontally closest to the birds in every lane.
+
+        Args:
+            dx (float or np.ndarray): Offset added to the pipes' ``x`` first,
+                e.g. the last step's scroll to find the nearest pipe before it.
+        """
+        x = self.x + np.reshape(dx, (-1, 1))
+        centre = np.abs(x + PIPE_WIDTH / 2 - (BIRD_X + BIRD_SIZE / 2))
+        return np.argmin(np.where(self.active, centre, np.inf), axis=1)
+
+    def pipes(self, slot):
+        """``(x, height, gap)`` of pipe ``slot[i]`` in every lane ``i``."""
+        rows = np.arange(self.n)
+        return self.x[rows, slot], self.height[rows, slot], self.gap[rows, slot]
+
+    def features(self, screen_height=SCREEN_HEIGHT):
+        """Shared next-pipe features of every lane, shape (n, len(SHARED_FEATURES))."""
+        x, height, gap = self.pipes(self.next_pipe())
+        return shared_features(x, height, gap, self.scroll_speed, screen_height=screen_height).T
@@ -4,25 +4,78 @@ class NeuralNetwork:
     """
     Simple feedforward neural network for Flappy Bird AI.
 
+    All weights and biases live in one contiguous flat buffer, laid out as
+    ``W1, b1, W2, b2``; the layer attributes are reshaped views into it.
+
     Attributes:
+        params (np.ndarray): Flat buffer holding every weight and bias.
+        sizes (tuple): (in_sz, hid_sz, out_sz).
         W1 (np.ndarray): Weights for input to hidden layer.
         b1 (np.ndarray): Biases for hidden layer.
         W2 (np.ndarray): Weights for hidden to output layer.
         b2 (np.ndarray): Biases for output layer.
     """
-    def __init__(self, in_sz=3, hid_sz=6, out_sz=1):
+    __slots__ = ("params", "sizes", "_layers")
+
+    def __init__(self, in_sz=3, hid_sz=6, out_sz=1, params=None):
         """
-        Initialize the neural network with random weights and zero biases.
+        Initialize the neural network with random weights and zero biases,
+        or wrap an existing flat parameter vector.
 
         Args:
             in_sz (int): Number of input neurons.
             hid_sz (int): Number of hidden neurons.
             out_sz (int): Number of output neurons.
+            params (np.ndarray, optional): Contiguous 1-D genome, e.g. a row of
+                a population matrix. It is used in place, not copied, so the
+                network and the owner of ``params`` see each other's writes.
+        """
+        n_params = hid_sz * in_sz + hid_sz + out_sz * hid_sz + out_sz
+        if params is None:
+            params = np.zeros(n_params)
+            params[:hid_sz * in_sz] = np.random.randn(hid_sz * in_sz)
+            w2 = hid_sz * in_sz + hid_sz
+            params[w2:w2 + out_sz * hid_sz] = np.random.randn(out_sz * hid_sz)
+        elif params.shape != (n_params,) or not params.flags.c_contiguous:
+            raise ValueError(f"params must be a contiguous vector of {n_params} values, "
+                             f"got shape {params.shape}")
+        self.params = params
+        self.sizes = (in_sz, hid_sz, out_sz)
+        self._layers = None
+
+    def layers(self):
         """
-        self.W1 = np.random.randn(hid_sz, in_sz)
-        self.b1 = np.zeros((hid_sz, 1))
-        self.W2 = np.random.randn(out_sz, hid_sz)
-        self.b2 = np.zeros((out_sz, 1))
+        Reshaped views ``(W1, b1, W2, b2)`` into the parameter buffer.
+
+        Built on first use, so networks that are only ever scored through a
+        ``PopulationNetwork`` never pay for the four view objects.
+        """
+        if self._layers is None:
+            in_sz, hid_sz, out_sz = self.sizes
+            views = []
+            i = 0
+            for shape in ((hid_sz, in_sz), (hid_sz, 1), (out_sz, hid_sz), (out_sz, 1)):
+                size = shape[0] * shape[1]
+                views.append(self.params[i:i+size].reshape(shape))
+                i += size
+            self._layers = tuple(views)
+        return self._layers
+
+    @property
+    def W1(self):
+        return self.layers()[0]
+
+    @property
+    def b1(self):
+        return self.layers()[1]
+
+    @property
+    def W2(self):
+        return self.layers()[2]
+
+    @property
+    def b2(self):
+        return self.layers()[3]
 
     def forward(self, x):
         """
@@ -34,9 +87,10 @@ class NeuralNetwork:
         Returns:
             np.ndarray: Output array after sigmoid activation.
         """
+        W1, b1, W2, b2 = self.layers()
         x = x.reshape(-1, 1)
-        a1 = np.tanh(self.W1 @ x + self.b1)
-        z2 = self.W2 @ a1 + self.b2
+        a1 = np.tanh(W1 @ x + b1)
+        z2 = W2 @ a1 + b2
         return 1 / (1 + np.exp(-z2))
 
     def get_weights(self):
@@ -44,14 +98,10 @@ class NeuralNetwork:
         Get all weights and biases as a flat array.
 
         Returns:
-            np.ndarray: Flattened weights and biases.
+            np.ndarray: The parameter buffer itself, not a copy; copy it
+            before changing the network if the old weights must be kept.
         """
-        return np.concatenate([
-            self.W1.flatten(),
-            self.b1.flatten(),
-            self.W2.flatten(),
-            self.b2.flatten(),
-        ])
+        return self.params
 
     def set_weights(self, flat):
         """
@@ -60,8 +110,113 @@ class NeuralNetwork:
         Args:
             flat (np.ndarray): Flattened weights and biases.
         """
+        self.params[:] = flat
+
+
+class PopulationNetwork:
+    """
+    Batched view of a whole population of NeuralNetworks.
+
+    Every genome's weights are stacked along a leading population axis so
+    that all living birds can be scored with a single batched matmul instead
+    of one tiny forward pass per bird.
+
+    Attributes:
+        W1 (np.ndarray): Stacked input to hidden weights, shape (pop, hid_sz, in_sz).
+        b1 (np.ndarray): Stacked hidden biases, shape (pop, hid_sz).
+        W2 (np.ndarray): Stacked hidden to output weights, shape (pop, out_sz, hid_sz).
+        b2 (np.ndarray): Stacked output biases, shape (pop, out_sz).
+    """
+    def __init__(self, W1, b1, W2, b2):
+        """
+        Initialize the population network from already stacked tensors.
+
+        Args:
+            W1 (np.ndarray): Input to hidden weights, shape (pop, hid_sz, in_sz).
+            b1 (np.ndarray): Hidden biases, shape (pop, hid_sz).
+            W2 (np.ndarray): Hidden to output weights, shape (pop, out_sz, hid_sz).
+            b2 (np.ndarray): Output biases, shape (pop, out_sz).
+        """
+        self.W1 = W1
+        self.b1 = b1
+        self.W2 = W2
+        self.b2 = b2
+
+    @classmethod
+    def from_networks(cls, networks):
+        """
+        Stack the weights of individual networks into one population network.
+
+        Args:
+            networks (list): NeuralNetwork instances sharing the same layer sizes.
+
+        Returns:
+            PopulationNetwork: Batched network, row ``i`` matching ``networks[i]``.
+        """
+        return cls.from_weights(np.stack([n.params for n in networks]), *networks[0].sizes)
+
+    @classmethod
+    def from_weights(cls, weights, in_sz=3, hid_sz=6, out_sz=1):
+        """
+        Build a population network from flat genomes.
+
+        Args:
+            weights (np.ndarray): Genomes of shape (pop, n_params), each laid
+                out like ``NeuralNetwork.get_weights``.
+            in_sz (int): Number of input neurons.
+            hid_sz (int): Number of hidden neurons.
+            out_sz (int): Number of output neurons.
+
+        Returns:
+            PopulationNetwork: Batched network, row ``i`` matching ``weights[i]``.
+        """
+        weights = np.asarray(weights)
+        n = len(weights)
+        parts = []
         i = 0
-        for mat in (self.W1, self.b1, self.W2, self.b2):
-            size = mat.size
-            mat[:] = flat[i:i+size].reshape(mat.shape)
+        for shape in ((hid_sz, in_sz), (hid_sz,), (out_sz, hid_sz), (out_sz,)):
+            size = int(np.prod(shape))
+            parts.append(weights[:, i:i+size].reshape((n,) + shape))
             i += size
+        return cls(*parts)
+
+    def __len__(self):
+        return self.W1.shape[0]
+
+    @property
+    def in_sz(self):
+        """Number of input neurons."""
+        return self.W1.shape[2]
+
+    def forward(self, X, idx=None):
+        """
+        Perform a batched forward pass, one input row per genome.
+
+        Args:
+            X (np.ndarray): Inputs of shape (n, in_sz).
+            idx (np.ndarray, optional): Population indices the rows of ``X``
+                belong to. Defaults to the whole population in order.
+
+        Returns:
+            np.ndarray: Outputs of shape (n, out_sz) after sigmoid activation.
+        """
+        if idx is None:
+            W1, b1, W2, b2 = self.W1, self.b1, self.W2, self.b2
+        else:
+            W1, b1, W2, b2 = self.W1[idx], self.b1[idx], self.W2[idx], self.b2[idx]
+        a1 = np.tanh(np.einsum('nhi,ni->nh', W1, X) + b1)
+        z2 = np.einsum('noh,nh->no', W2, a1) + b2
+        return 1 / (1 + np.exp(-z2))
+
+    def decide(self, X, idx=None):
+        """
+        Return the flap decision for every row of ``X``.
+
+        Args:
+            X (np.ndarray): Inputs of shape (n, in_sz).
+            idx (np.ndarray, optional): Population indices the rows belong to.
+
+        Returns:
+            np.ndarray: Boolean flap mask of shape (n,).
+        """
+        return self.forward(X, idx)[:, 0] > 0.5
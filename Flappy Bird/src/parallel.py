@@ -0,0 +1,110 @@
+"""
+Multi-core population evaluation with a pool of long-lived worker processes.
+
+The population is sharded across workers that all play the same seeded pipe
+course in the headless engine. Genomes travel as flat weight arrays (the
+``NeuralNetwork.get_weights`` layout) and only fitness vectors come back. A
+bird's fitness depends only on the course and its own genome, so the merged
+result matches a single-process run with the same seed.
+"""
+import multiprocessing
+import os
+
+import numpy as np
+
+import headless
+from course import shared_course
+from nn import PopulationNetwork
+
+
+def eval_shard(genomes, seed, sizes=(3, 6, 1), budget=None, clock=None, courses=None):
+    """
+    Evaluate one shard of genomes on the course generated from ``seed``, or
+    on every course of ``courses``.
+
+    Args:
+        genomes (np.ndarray): Flat genomes of shape (n, n_params).
+        seed (int): Pipe course seed.
+        sizes (tuple): (in_sz, hid_sz, out_sz) of the networks.
+        budget (EvalBudget, optional): Limits for this shard's run.
+        clock (SimClock, optional): Timestep, substeps and collision sweeping.
+        courses (CourseSet, optional): Play the K courses derived from ``seed``.
+
+    Returns:
+        np.ndarray: Pipes passed by every genome in the shard, or with
+        ``courses`` the per-course scores of shape (n, K).
+    """
+    if courses is not None:
+        if not len(genomes):
+            return np.zeros((0, courses.k))
+        brains = PopulationNetwork.from_weights(genomes, *sizes)
+        return headless.evaluate_courses(brains, courses.courses(seed), budget=budget, clock=clock)
+    if not len(genomes):
+        return np.zeros(0)
+    brains = PopulationNetwork.from_weights(genomes, *sizes)
+    return headless.evaluate(brains, course=shared_course(seed), budget=budget, clock=clock)
+
+
+def _eval_shard_with_reason(genomes, seed, sizes, budget, clock, courses):
+    # The budget is a copy in the worker, so send back which limit it hit
+    fitness = eval_shard(genomes, seed, sizes, budget, clock, courses)
+    return fitness, budget.reason if budget else None
+
+
+class ParallelEvaluator:
+    """
+    Process pool that scores a population shard by shard.
+
+    Workers are started once and reused for every generation, so the
+    interpreter, NumPy and the engine are imported only once per worker.
+
+    Attributes:
+        workers (int): Number of worker processes.
+        sizes (tuple): (in_sz, hid_sz, out_sz) of the evaluated networks.
+    """
+    def __init__(self, workers=None, sizes=(3, 6, 1)):
+        """
+        Start the worker pool.
+
+        Args:
+            workers (int, optional): Number of processes. Defaults to the CPU count.
+            sizes (tuple): (in_sz, hid_sz, out_sz) of the evaluated networks.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.sizes = sizes
+        self.pool = multiprocessing.Pool(self.workers)
+
+    def evaluate(self, genomes, seed, budget=None, clock=None, courses=None):
+        """
+        Score every genome on the course generated from ``seed``, or on every
+        course of ``courses``.
+
+        Args:
+            genomes (np.ndarray): Flat genomes of shape (pop, n_params).
+            seed (int): Pipe course seed shared by all workers.
+            budget (EvalBudget, optional): Limits applied to every shard. Its
+                ``reason`` is set if any shard exhausted it.
+            clock (SimClock, optional): Timestep, substeps and collision sweeping.
+            courses (CourseSet, optional): Play the K courses derived from ``seed``.
+
+        Returns:
+            np.ndarray: Pipes passed by every genome, in input order, or with
+            ``courses`` the per-course scores of shape (pop, K).
+        """
+        shards = np.array_split(np.asarray(genomes), self.workers)
+        results = self.pool.starmap(_eval_shard_with_reason,
+                                    [(s, seed, self.sizes, budget, clock, courses) for s in shards])
+        if budget:
+            budget.reason = next((r for _, r in results if r), None)
+        return np.concatenate([f for f, _ in results])
+
+    def close(self):
+        """Stop the worker processes."""
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,6 +1,5 @@
-import pygame
-import os
 import random
+import assets
 
 class Pipe:
     """
@@ -8,37 +7,56 @@ class Pipe:
     Handles both visual and headless modes.
     """
 
-    def __init__(self, x, display=True, screen_height=600, ground_height=100):
+    def __init__(self, x, display=True, screen_height=600, ground_height=100, height=None, gap=None):
         """
         Initialize a Pipe obstacle.
 
         Args:
             x (float): Horizontal position of the pipe.
             display (bool): Whether to load and display the pipe images.
+            height (int, optional): Top pipe height, e.g. from a seeded ``Course``.
+                Randomized together with ``gap`` when omitted.
+            gap (int, optional): Gap between the top and bottom pipe.
         """
         self.display = display
-        self.x = x
         self.width = 60
+
+        self.screen_height = screen_height
+        self.ground_height = ground_height
+
+        # Randomize height and gap unless both are given
+        if height is None or gap is None:
+            while True:
+                height = random.randint(200, 350)
+                gap = random.randint(120, 170)
+                bottom_h = screen_height - (height + gap) - ground_height
+                if bottom_h >= 50:  # MIN_BOTTOM_HEIGHT
+                    break
+        self.reset(x, height, gap)
+
+    def reset(self, x, height, gap):
+        """
+        Reuse this pipe for a new obstacle, e.g. when a ``PipePool`` recycles it.
+
+        Args:
+            x (float): Horizontal position of the pipe.
+            height (int): Top pipe height.
+            gap (int): Gap between the top and bottom pipe.
+        """
+        self.x = x
+        self.height, self.gap = height, gap
         self.passed = False
+        bottom_h = self.screen_height - (height + gap) - self.ground_height
 
-        # Always randomize height and gap
-        while True:
-            self.height = random.randint(200, 350)
-            self.gap = random.randint(120, 170)
-            bottom_h = screen_height - (self.height + self.gap) - ground_height
-            if bottom_h >= 50:  # MIN_BOTTOM_HEIGHT
-                break
-
-        # Always load images and create masks for proper collision detection
-        self.top_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "sprites", "pipe_top.png")).convert_alpha()
-        self.top_img = pygame.transform.scale(self.top_img, (self.width, self.height))
-        self.top_mask = pygame.mask.from_surface(self.top_img)
-        self.bottom_img = pygame.image.load(os.path.join(os.path.dirname(__file__), "sprites", "pipe_bottom.png")).convert_alpha()
-        self.bottom_img = pygame.transform.scale(self.bottom_img, (self.width, bottom_h))
-        self.bottom_mask = pygame.mask.from_surface(self.bottom_img)
-        
-        # Clear images in headless mode to save memory
-        if not display:
+        # Always look up images and masks for proper collision detection (cached per size)
+        # Headless pipes use the unconverted images, which need no display mode
+        self.top_mask = assets.mask("pipe_top.png", (self.width, height), self.display)
+        self.bottom_mask = assets.mask("pipe_bottom.png", (self.width, bottom_h), self.display)
+        # Skip image references in headless mode, they are never drawn
+        if self.display:
+            self.top_img = assets.scaled("pipe_top.png", (self.width, height), True)
+            self.bottom_img = assets.scaled("pipe_bottom.png", (self.width, bottom_h), True)
+        else:
             self.top_img = None
             self.bottom_img = None
 
@@ -59,7 +77,96 @@ class Pipe:
 
         Args:
             screen (pygame.Surface): The game screen to draw on.
+
+        Returns:
+            pygame.Rect or None: Screen area that was drawn on.
         """
         if self.display and self.top_img and self.bottom_img:
-            screen.blit(self.top_img, (self.x, 0))
-            screen.blit(self.bottom_img, (self.x, self.height + self.gap))
+            top = screen.blit(self.top_img, (self.x, 0))
+            return top.union(screen.blit(self.bottom_img, (self.x, self.height + self.gap)))
+        return None
+
+
+class PipePool:
+    """
+    Fixed-capacity ring buffer of recycled ``Pipe`` objects fed by a ``Course``.
+
+    Pipes scroll off the left edge in the order they were spawned on the
+    right, so the pipes on screen are always a contiguous run of slots.
+    Spawning resets the next free slot with the course's next height and gap
+    instead of building a new ``Pipe``.
+
+    Attributes:
+        course (Course): Source of pipe heights and gaps.
+        spawned (int): Pipes spawned so far, the index of the next course pipe.
+    """
+    def __init__(self, course, capacity=8, display=True, screen_height=600, ground_height=100):
+        """
+        Preallocate the pool.
+
+        Args:
+            course (Course): Source of pipe heights and gaps.
+            capacity (int): Pipes that can be on screen at once. The pool
+                grows if a spawn would overflow it.
+            display (bool): Whether the pipes are drawn.
+            screen_height (int): Height of the game screen.
+            ground_height (int): Height of the ground strip.
+        """
+        self.course = course
+        height, gap = course[0]
+        self._slots = [Pipe(0, display, screen_height, ground_height, height, gap) for _ in range(capacity)]
+        self._head = 0
+        self._count = 0
+        self.spawned = 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        slots, cap = self._slots, len(self._slots)
+        for i in range(self._head, self._head + self._count):
+            yield slots[i % cap]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("pipe index out of range")
+        return self._slots[(self._head + i) % len(self._slots)]
+
+    def spawn(self, x):
+        """
+        Place the course's next pipe at ``x``.
+
+        Returns:
+            Pipe: The recycled pipe.
+        """
+        if self._count == len(self._slots):
+            # Unroll the ring so the new slots follow the newest pipe
+            self._slots = self._slots[self._head:] + self._slots[:self._head]
+            self._slots += [Pipe(0, *self._pipe_args()) for _ in range(len(self._slots))]
+            self._head = 0
+        pipe = self._slots[(self._head + self._count) % len(self._slots)]
+        height, gap = self.course[self.spawned]
+        pipe.reset(x, height, gap)
+        self.spawned += 1
+        self._count += 1
+        return pipe
+
+    def _pipe_args(self):
+        p = self._slots[0]
+        return (p.display, p.screen_height, p.ground_height, p.height, p.gap)
+
+    def recycle(self):
+        """
+        Free the slots of pipes that have left the screen.
+
+        Returns:
+            int: Number of pipes recycled.
+        """
+        freed = 0
+        while self._count and self._slots[self._head].x + self._slots[self._head].width < 0:
+            self._head = (self._head + 1) % len(self._slots)
+            self._count -= 1
+            freed += 1
+        return freed
@@ -0,0 +1,137 @@
+"""
+Optional per-phase timing of the training loop.
+
+Code wraps each phase of a frame in ``with profiler.phase("think"):``. While
+the profiler is disabled, ``phase`` hands back a shared no-op context manager,
+so instrumented loops cost one method call per phase. Enabled, it accumulates
+wall time and call counts per phase, prints a per-generation breakdown with
+``report`` and can keep every span for a Chrome trace (``chrome://tracing``,
+Perfetto or speedscope) written by ``write_trace``.
+
+Enable it with ``--profile`` / ``--profile-trace PATH`` on ``flappy_ai.py``
+or the ``FLAPPY_PROFILE=1`` / ``FLAPPY_PROFILE_TRACE=PATH`` environment
+variables. Phases run inside ``ParallelEvaluator`` worker processes are not
+collected.
+"""
+import contextlib
+import json
+import os
+import time
+
+PROFILE_ENV = "FLAPPY_PROFILE"
+TRACE_ENV = "FLAPPY_PROFILE_TRACE"
+
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class PhaseProfiler:
+    """
+    Cumulative wall time and call count per named phase.
+
+    Attributes:
+        enabled (bool): Record phases; when False ``phase`` is a no-op.
+        trace_path (str or None): Where ``write_trace`` saves the spans.
+        max_events (int): Spans kept for the trace; later ones are dropped.
+        totals (dict): Phase name to [seconds, calls] since the last report.
+        cumulative (dict): Phase name to [seconds, calls] over the whole run.
+    """
+    def __init__(self, enabled=False, trace_path=None, max_events=1_000_000):
+        self.enabled = enabled
+        self.trace_path = trace_path
+        self.max_events = max_events
+        self.totals = {}
+        self.cumulative = {}
+        self.events = []
+        self._origin = time.perf_counter()
+
+    @classmethod
+    def from_env(cls):
+        """Profiler configured from ``FLAPPY_PROFILE`` and ``FLAPPY_PROFILE_TRACE``."""
+        trace_path = os.environ.get(TRACE_ENV) or None
+        enabled = os.environ.get(PROFILE_ENV, "") not in ("", "0") or trace_path is not None
+        return cls(enabled, trace_path)
+
+    def configure(self, enabled=True, trace_path=None):
+        """Turn recording on or off; a ``trace_path`` also keeps spans."""
+        self.enabled = enabled or trace_path is not None
+        if trace_path is not None:
+            self.trace_path = trace_path
+
+    def phase(self, name):
+        """Context manager timing one occurrence of phase ``name``."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, name, start, end):
+        """Add one span of phase ``name`` measured with ``time.perf_counter``."""
+        entry = self.totals.get(name)
+        if entry is None:
+            entry = self.totals[name] = [0.0, 0]
+        entry[0] += end - start
+        entry[1] += 1
+        if self.trace_path is not None and len(self.events) < self.max_events:
+            self.events.append((name, start, end - start))
+
+    def report(self, title="Profile"):
+        """
+        Print the phases recorded since the last report, slowest first, and
+        fold them into ``cumulative``.
+
+        Returns:
+            dict: Phase name to [seconds, calls] of the reported period.
+        """
+        totals, self.totals = self.totals, {}
+        if not totals:
+            return totals
+        for name, (seconds, calls) in totals.items():
+            entry = self.cumulative.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+        overall = sum(s for s, _ in totals.values())
+        print(f"  [{title}] {overall:.3f} s in {len(totals)} phases")
+        for name, (seconds, calls) in sorted(totals.items(), key=lambda kv: -kv[1][0]):
+            share = 100 * seconds / overall if overall else 0.0
+            print(f"    {name:<12} {seconds:8.3f} s {share:5.1f}%  {calls:>9,} calls "
+                  f"{1e6 * seconds / calls:9.1f} us/call")
+        return totals
+
+    def write_trace(self, path=None):
+        """
+        Save the recorded spans in Chrome trace event format.
+
+        Args:
+            path (str, optional): Output file. Defaults to ``trace_path``.
+
+        Returns:
+            str or None: The file written, or None without a path.
+        """
+        path = path or self.trace_path
+        if path is None:
+            return None
+        pid = os.getpid()
+        events = [{"name": name, "cat": "flappy", "ph": "X", "pid": pid, "tid": 0,
+                   "ts": 1e6 * (start - self._origin), "dur": 1e6 * dur}
+                  for name, start, dur in self.events]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+
+profiler = PhaseProfiler.from_env()
@@ -0,0 +1,152 @@
+"""
+Drawing for visual training.
+
+``Renderer`` owns the cached background and ground layers. In the classic
+mode it redraws the scrolling scene every frame and flips the display. In
+dirty-rect mode the background stays still: each rendered frame restores
+only the areas that pipes, birds, the ground strip and the score covered on
+the previous rendered frame, draws the new ones and pushes just those
+rectangles with ``pygame.display.update``.
+
+Rendering can also be thinned out to every Nth simulation step or to a
+target display rate, and limited to the first ``top_k`` living birds, so a
+visual generation costs little more than a headless one.
+"""
+import time
+
+import pygame
+
+import assets
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, GROUND_HEIGHT
+
+# Sky fill colour keyed out of the ground sprite
+SKY_COLORKEY = (112, 192, 238)
+
+
+class Renderer:
+    """
+    Draws the game scene, either fully every frame or with dirty rects.
+
+    Attributes:
+        screen (pygame.Surface): Display surface.
+        dirty_rects (bool): Static background and partial display updates.
+        top_k (int or None): Draw at most this many living birds.
+        render_every (int or None): Render every Nth simulation step.
+        render_fps (float or None): Render at most this many frames per second.
+        ground_y (int): Top of the ground strip.
+        frames (int): Frames rendered so far.
+    """
+    def __init__(self, screen, dirty_rects=False, top_k=None, render_every=None, render_fps=None):
+        """
+        Build the cached layers. Requires the display mode to be set.
+
+        Args:
+            screen (pygame.Surface): Display surface.
+            dirty_rects (bool): Use a static background and partial updates.
+            top_k (int, optional): Draw at most this many living birds.
+            render_every (int, optional): Render every Nth simulation step.
+            render_fps (float, optional): Render at most this many frames per
+                wall-clock second.
+        """
+        self.screen = screen
+        self.dirty_rects = dirty_rects
+        self.top_k = top_k
+        self.render_every = render_every
+        self.render_fps = render_fps
+        self.font = pygame.font.SysFont(None, 30)
+        self.frames = 0
+        self._steps = 0
+        self._last_render = None
+        self._dirty = []
+
+        bg = assets.scaled('background.png', (SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        ground = assets.load('ground.png').convert()
+        ground.set_colorkey(SKY_COLORKEY)
+        # Drawn at the physics ground line; the sprite's lower edge runs off screen
+        self.ground_y = SCREEN_HEIGHT - GROUND_HEIGHT
+
+        # Layers tiled one tile wider than the screen, so any scroll offset is a single blit
+        self._bg_w, self._ground_w = bg.get_width(), ground.get_width()
+        self.background = self._tiled(bg, SCREEN_WIDTH + self._bg_w)
+        self.ground = self._tiled(ground, SCREEN_WIDTH + self._ground_w, colorkey=SKY_COLORKEY)
+        self.scene = self.background.copy()
+        self.scene.blit(self.ground, (0, self.ground_y))
+
+    @staticmethod
+    def _tiled(tile, width, colorkey=None):
+        layer = pygame.Surface((width, tile.get_height())).convert()
+        if colorkey is not None:
+            layer.fill(colorkey)
+            layer.set_colorkey(colorkey)
+        for x in range(0, width, tile.get_width()):
+            layer.blit(tile, (x, 0))
+        return layer
+
+    def due(self):
+        """
+        Count one simulation step and tell whether it should be rendered.
+
+        Returns:
+            bool: True on the first step and whenever ``render_every`` steps
+            or ``1 / render_fps`` seconds have passed since the last render.
+        """
+        self._steps += 1
+        if self.render_fps:
+            now = time.perf_counter()
+            if self._last_render is not None and now - self._last_render < 1 / self.render_fps:
+                return False
+            self._last_render = now
+            return True
+        if self.render_every:
+            return (self._steps - 1) % self.render_every == 0
+        return True
+
+    def visible_birds(self, pop):
+        """
+        Living birds to draw, elites last so they end up on top.
+
+        With ``top_k`` only the first ``top_k`` living birds are drawn. Elites
+        and reinjected hall of fame birds lead the population, so these are
+        the most promising ones; elites are always included.
+        """
+        alive = [b for b in pop if b.alive]
+        if self.top_k is not None:
+            elites = [b for b in alive if b.is_elite]
+            alive = elites + [b for b in alive if not b.is_elite][:max(self.top_k - len(elites), 0)]
+        return [b for b in alive if not b.is_elite] + [b for b in alive if b.is_elite]
+
+    def draw(self, pipes, pop, best, bg_scroll=0, ground_scroll=0):
+        """
+        Render one frame.
+
+        Args:
+            pipes (iterable): Pipes on screen.
+            pop (list): Population; only living birds are drawn.
+            best (float): Score shown in the corner.
+            bg_scroll (float): Background scroll offset, ignored with dirty rects.
+            ground_scroll (float): Ground scroll offset.
+        """
+        self.frames += 1
+        screen = self.screen
+        if self.dirty_rects:
+            for r in self._dirty:
+                screen.blit(self.scene, r, r)
+        else:
+            screen.blit(self.background, (0, 0), pygame.Rect(int(bg_scroll) % self._bg_w, 0,
+                                                              SCREEN_WIDTH, SCREEN_HEIGHT))
+
+        drawn = [p.draw(screen) for p in pipes]
+        drawn += [b.draw(screen) for b in self.visible_birds(pop)]
+        drawn.append(screen.blit(self.ground, (0, self.ground_y),
+                                 pygame.Rect(int(ground_scroll) % self._ground_w, 0,
+                                             SCREEN_WIDTH, self.ground.get_height())))
+        txt = self.font.render(f"Pipes: {int(best)}", True, (255,255,255))
+        drawn.append(screen.blit(txt, (10,10)))
+
+        if self.dirty_rects:
+            bounds = screen.get_rect()
+            drawn = [r.clip(bounds) for r in drawn if r is not None]
+            pygame.display.update(self._dirty + drawn)
+            self._dirty = drawn
+        else:
+            pygame.display.flip()
@@ -0,0 +1,121 @@
+"""
+Fitness over several seeded courses at once.
+
+A genome scored on one course is partly scored on that course's luck. A
+``CourseSet`` plays every genome on K courses derived from the generation's
+seed, all in one ``headless.MultiCourseSim`` batch of (genomes x courses)
+birds, and combines the K scores into one fitness: their mean, their
+minimum, or a quantile such as ``q0.25``. ``course_report`` summarizes how
+much the scores vary from course to course.
+"""
+import numpy as np
+
+from course import shared_course
+
+AGGREGATES = ("mean", "min", "median")
+
+
+def parse_aggregate(name):
+    """
+    Validate an aggregate name.
+
+    Args:
+        name (str): ``mean``, ``min``, ``median`` or ``qP`` with P in [0, 1].
+
+    Returns:
+        str: ``name``, unchanged.
+
+    Raises:
+        ValueError: If the name is not one of the above.
+    """
+    if name in AGGREGATES:
+        return name
+    if name.startswith("q"):
+        try:
+            q = float(name[1:])
+        except ValueError:
+            q = -1.0
+        if 0.0 <= q <= 1.0:
+            return name
+    raise ValueError(f"Unknown aggregate {name!r}; use one of {', '.join(AGGREGATES)} or qP with 0 <= P <= 1")
+
+
+class CourseSet:
+    """
+    K seeded courses per evaluation and how their scores are combined.
+
+    Course ``j`` of a generation with seed ``s`` has seed ``s + j``, so the
+    first course is the one a single-course run would play.
+
+    Attributes:
+        k (int): Number of courses.
+        aggregate (str): ``mean``, ``min``, ``median`` or a quantile ``qP``.
+    """
+    def __init__(self, k=1, aggregate="mean"):
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        self.k = int(k)
+        self.aggregate = parse_aggregate(aggregate)
+
+    def seeds(self, seed):
+        """Course seeds derived from a generation seed."""
+        return [(seed + j) % 2**32 for j in range(self.k)]
+
+    def courses(self, seed):
+        """Per-process ``Course`` objects for a generation seed."""
+        return [shared_course(s) for s in self.seeds(seed)]
+
+    def combine(self, scores):
+        """
+        Fitness of every genome from its per-course scores.
+
+        Args:
+            scores (np.ndarray): Scores of shape (pop, k).
+
+        Returns:
+            np.ndarray: Fitness of shape (pop,).
+        """
+        scores = np.asarray(scores, dtype=float)
+        if self.aggregate == "mean":
+            return scores.mean(axis=1)
+        if self.aggregate == "min":
+            return scores.min(axis=1)
+        if self.aggregate == "median":
+            return np.median(scores, axis=1)
+        return np.quantile(scores, float(self.aggregate[1:]), axis=1)
+
+    def key(self):
+        """Cache namespace component; each set of courses and aggregate scores differently."""
+        return f"courses={self.k}:agg={self.aggregate}"
+
+    def __repr__(self):
+        return f"CourseSet(k={self.k}, aggregate={self.aggregate!r})"
+
+
+def course_report(scores):
+    """
+    Spread of per-course scores.
+
+    Args:
+        scores (np.ndarray): Scores of shape (pop, k).
+
+    Returns:
+        dict: Mean score of every course, the mean and largest per-genome
+        standard deviation across courses, and the share of genomes whose
+        best and worst course differ.
+    """
+    scores = np.asarray(scores, dtype=float)
+    std = scores.std(axis=1)
+    return {
+        "course_means": scores.mean(axis=0),
+        "mean_std": float(std.mean()),
+        "max_std": float(std.max()),
+        "inconsistent": float((scores.max(axis=1) > scores.min(axis=1)).mean()),
+    }
+
+
+def format_report(report):
+    """One-line summary of ``course_report`` for the training log."""
+    means = " ".join(f"{m:.1f}" for m in report["course_means"])
+    return (f"  [Courses] course means: {means}   std across courses: mean {report['mean_std']:.2f}, "
+            f"max {report['max_std']:.2f}   {report['inconsistent']:.0%} of genomes score differently")
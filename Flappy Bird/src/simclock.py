@@ -0,0 +1,140 @@
+"""
+Fixed-timestep simulation clock and a step-size consistency report.
+
+A ``SimClock`` fixes how simulated time advances, independently of how fast
+frames are drawn: the birds decide once per control step of ``dt_ms``, and
+each control step is integrated as ``substeps`` physics steps. With ``swept``
+set, every physics step also tests the path each bird took relative to the
+pipes, not just where it ended up, so coarse steps cannot skip through a pipe
+corner.
+
+Run ``python simclock.py`` to score one population at several step sizes and
+see how closely each ranks the genomes compared with the finest clock.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from constants import FPS, HEADLESS_DT_MS
+
+
+class SimClock:
+    """
+    Control timestep, physics substeps and swept collision of a simulation.
+
+    Attributes:
+        dt_ms (float): Simulated milliseconds per control step.
+        substeps (int): Physics steps per control step.
+        swept (bool): Test collisions along each physics step's motion.
+    """
+    def __init__(self, dt_ms=HEADLESS_DT_MS, substeps=1, swept=False):
+        if dt_ms <= 0:
+            raise ValueError(f"dt_ms must be positive, got {dt_ms}")
+        if substeps < 1:
+            raise ValueError(f"substeps must be at least 1, got {substeps}")
+        self.dt_ms = float(dt_ms)
+        self.substeps = int(substeps)
+        self.swept = bool(swept)
+
+    @property
+    def sub_dt_ms(self):
+        """Simulated milliseconds per physics step."""
+        return self.dt_ms / self.substeps
+
+    def key(self):
+        """Cache namespace component; runs under different clocks score differently."""
+        return f"dt={self.dt_ms:g}:sub={self.substeps}:swept={int(self.swept)}"
+
+    def __repr__(self):
+        return f"SimClock(dt_ms={self.dt_ms:g}, substeps={self.substeps}, swept={self.swept})"
+
+
+def rank_correlation(a, b):
+    """Spearman rank correlation of two fitness vectors, with tied ranks averaged."""
+    def ranks(x):
+        _, inverse, counts = np.unique(x, return_inverse=True, return_counts=True)
+        # Average rank of every distinct value, in ascending order
+        avg = np.cumsum(counts) - (counts - 1) / 2
+        return avg[inverse]
+    ra, rb = ranks(np.asarray(a)), ranks(np.asarray(b))
+    if ra.std() == 0 or rb.std() == 0:
+        return float("nan")
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def consistency_report(genomes, seed, clocks, budget=None, top_k=10):
+    """
+    Score the same genomes on the same course under several clocks.
+
+    The first clock is the reference the others are compared against, so
+    list the finest one first.
+
+    Args:
+        genomes (np.ndarray): Genomes of shape (pop, n_params).
+        seed (int): Course seed.
+        clocks (list): ``SimClock`` instances, reference first.
+        budget (EvalBudget, optional): Limits for every run, so good genomes
+            cannot run forever.
+        top_k (int): Size of the top group compared between clocks.
+
+    Returns:
+        list: One dict per clock with its wall time, mean fitness, rank
+        correlation and mean absolute fitness difference to the reference,
+        and the share of the reference's top ``top_k`` it also ranks there.
+    """
+    import headless
+    from course import shared_course
+    from nn import PopulationNetwork
+
+    brains = PopulationNetwork.from_weights(genomes)
+    rows = []
+    reference = None
+    for clock in clocks:
+        start = time.perf_counter()
+        fitness = headless.evaluate(brains, course=shared_course(seed), budget=budget, clock=clock).copy()
+        seconds = time.perf_counter() - start
+        if reference is None:
+            reference = fitness
+        k = min(top_k, len(fitness))
+        top_ref = set(np.argsort(-reference, kind="stable")[:k])
+        top = set(np.argsort(-fitness, kind="stable")[:k])
+        rows.append({
+            "clock": repr(clock), "seconds": seconds, "mean_fitness": float(fitness.mean()),
+            "rank_corr": rank_correlation(reference, fitness),
+            "mean_abs_diff": float(np.abs(fitness - reference).mean()),
+            "top_k_overlap": len(top & top_ref) / max(k, 1),
+        })
+    return rows
+
+
+def main():
+    from bench import hover_population
+    from budget import EvalBudget
+
+    parser = argparse.ArgumentParser(description="Compare fitness rankings at different simulation step sizes")
+    parser.add_argument("--pop", type=int, default=300, help="Population size")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the genomes and the course")
+    parser.add_argument("--noise", type=float, default=1.0,
+                        help="Weight noise of the hover genomes; larger spreads fitness more")
+    parser.add_argument("--max-sim-seconds", type=float, default=60.0, help="Simulated time per run")
+    parser.add_argument("--dt-ms", type=float, nargs="+", default=[1000 / FPS, 1000 / 60, 40.0, HEADLESS_DT_MS],
+                        help="Control timesteps to compare; the first is the reference")
+    parser.add_argument("--substeps", type=int, default=4, help="Substeps of the substepped variants")
+    args = parser.parse_args()
+
+    genomes = hover_population(args.pop, args.seed, args.noise)
+    reference, *coarse = args.dt_ms
+    clocks = [SimClock(reference)]
+    for dt in coarse:
+        clocks += [SimClock(dt), SimClock(dt, swept=True), SimClock(dt, args.substeps, swept=True)]
+    rows = consistency_report(genomes, args.seed, clocks, EvalBudget(max_sim_seconds=args.max_sim_seconds))
+
+    print(f"{'clock':<48} {'time':>8} {'mean fit':>9} {'rank corr':>9} {'|diff|':>7} {'top-10':>7}")
+    for r in rows:
+        print(f"{r['clock']:<48} {r['seconds']:7.2f}s {r['mean_fitness']:9.2f} {r['rank_corr']:9.3f} "
+              f"{r['mean_abs_diff']:7.2f} {r['top_k_overlap']:7.0%}")
+
+
+if __name__ == "__main__":
+    main()
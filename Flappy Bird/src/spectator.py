@@ -0,0 +1,74 @@
+"""
+Watch the champion of a running headless training job.
+
+Start training with ``--publish-champion PATH`` and, at any time, run
+``python spectator.py PATH`` in another terminal. The spectator plays the
+current best genome in real time and restarts with the new champion as soon
+as the trainer publishes a better one. Closing the window detaches it; the
+trainer never waits for the spectator and does not notice it leaving.
+"""
+import argparse
+import os
+import time
+
+from budget import EvalBudget
+from champion import ChampionReader
+
+
+class ChampionWatch(EvalBudget):
+    """Budget that ends the current run once a newer champion is published."""
+    def __init__(self, reader):
+        super().__init__()
+        self.reader = reader
+
+    def __bool__(self):
+        return True
+
+    def check(self, pipes_passed, sim_ms):
+        if self.reader.changed():
+            self.reason = "new champion"
+        return self.reason
+
+
+def wait_for_file(path, poll=0.5):
+    """Block until the trainer has created the champion file."""
+    while not (os.path.exists(path) and os.path.getsize(path) > 0):
+        time.sleep(poll)
+
+
+def spectate(path, poll=0.5):
+    """
+    Play the published champion until the window is closed.
+
+    Args:
+        path (str): Champion file written by ``ChampionPublisher``.
+        poll (float): Seconds between checks while nothing is published.
+    """
+    from flappy_ai import bird_from_weights, eval_population
+
+    print(f"Waiting for a champion in {path} ...")
+    wait_for_file(path, poll)
+    reader = ChampionReader(path)
+    try:
+        while True:
+            champ = reader.read()
+            if champ is None:
+                time.sleep(poll)
+                continue
+            genome, fitness, generation = champ
+            print(f"Playing the champion of generation {generation} (fitness {fitness:g})")
+            eval_population([bird_from_weights(genome, is_elite=True)], display=True,
+                            budget=ChampionWatch(reader))
+    finally:
+        reader.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch the champion of a running Flappy Bird AI training job")
+    parser.add_argument("path", help="Champion file passed to --publish-champion")
+    args = parser.parse_args()
+    spectate(args.path)
+
+
+if __name__ == "__main__":
+    main()
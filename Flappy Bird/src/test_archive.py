@@ -0,0 +1,47 @@
+import os
+import sys
+import numpy as np
+
+# Add the src directory to the import path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from archive import GenomeArchive
+
+
+def test_keeps_top_k_distinct():
+    rng = np.random.default_rng(0)
+    genomes = rng.standard_normal((100, 31))
+    fitness = rng.permutation(100)
+    archive = GenomeArchive(capacity=5)
+    archive.add_many(genomes, fitness)
+    archive.add_many(genomes, fitness)  # duplicates are ignored
+    assert len(archive) == 5
+    assert [f for f, _, _ in archive.best()] == [99, 98, 97, 96, 95]
+    assert genomes[np.argmax(fitness)] in archive
+
+
+def test_ties_keep_existing_entry():
+    archive = GenomeArchive(capacity=1)
+    a, b = np.zeros(3), np.ones(3)
+    assert archive.add(a, 10, payload="a")
+    assert not archive.add(b, 10, payload="b")
+    assert archive.best()[0][2] == "a"
+    assert archive.add(b, 11, payload="b")
+    assert a not in archive
+
+
+def test_duplicate_with_higher_fitness_updates_entry():
+    archive = GenomeArchive(capacity=3)
+    g = np.arange(4.0)
+    archive.add(g, 1)
+    archive.add(g.copy(), 5)
+    assert len(archive) == 1
+    assert archive.best()[0][0] == 5
+
+
+def test_quantized_near_duplicates():
+    archive = GenomeArchive(capacity=3, quantum=1e-3)
+    g = np.linspace(0, 1, 8)
+    archive.add(g, 1)
+    assert g + 1e-6 in archive
+    assert g + 0.1 not in archive
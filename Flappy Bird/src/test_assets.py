@@ -0,0 +1,65 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+import assets
+from bird import Bird
+from constants import BIRD_SIZE
+from nn import NeuralNetwork
+from pipe import Pipe
+
+SIZE = (BIRD_SIZE, BIRD_SIZE)
+
+
+@pytest.fixture
+def image_loads(monkeypatch):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    for cached in (assets.load, assets.scaled, assets.mask, assets.rotated):
+        cached.cache_clear()
+    calls = []
+    real_load = pygame.image.load
+
+    def counting_load(path):
+        calls.append(os.path.basename(path))
+        return real_load(path)
+
+    monkeypatch.setattr(pygame.image, "load", counting_load)
+    return calls
+
+
+def test_second_pipe_and_bird_do_not_reload_images(image_loads):
+    Pipe(0, display=True, height=250, gap=150)
+    assert sorted(image_loads) == ["pipe_bottom.png", "pipe_top.png"]
+    Pipe(100, display=True, height=300, gap=130)
+    Pipe(200, display=False, height=250, gap=150)
+    assert len(image_loads) == 2
+
+    bird = Bird(NeuralNetwork())
+    bird.sprite, bird.get_mask()
+    assert image_loads[2:] == [assets.BIRD_SPRITE]
+    other = Bird(NeuralNetwork())
+    other.angle = 20
+    other.sprite, other.get_mask()
+    assert len(image_loads) == 3
+
+
+@pytest.mark.parametrize("angle", [-25, -13, -1, 0, 1, 7, 25])
+def test_cached_rotation_matches_pygame_rotate(image_loads, angle):
+    base = assets.scaled(assets.BIRD_SPRITE, SIZE)
+    expected = pygame.transform.rotate(base, angle)
+    offset = expected.get_rect(center=(SIZE[0] // 2, SIZE[1] // 2)).topleft
+    for _ in range(2):
+        rot, mask, (dx, dy) = assets.rotated(assets.BIRD_SPRITE, SIZE, angle)
+        assert rot.get_size() == expected.get_size() and (dx, dy) == offset
+        assert pygame.image.tostring(rot, "RGBA") == pygame.image.tostring(expected, "RGBA")
+        assert mask.count() == pygame.mask.from_surface(expected).count()
+    assert assets.rotated.cache_info().hits == 1
+
+    bird = Bird(NeuralNetwork())
+    bird.angle = angle
+    _, rect = bird.get_mask()
+    assert rect == expected.get_rect(center=(bird.bird_x + SIZE[0] // 2, int(bird.y) + SIZE[1] // 2))
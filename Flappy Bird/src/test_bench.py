@@ -0,0 +1,41 @@
+import json
+
+import numpy as np
+import pytest
+
+from bench import TAIL_SURVIVORS, compare, hover_population, run_suite
+
+
+def test_suite_is_reproducible_and_serializable(capsys):
+    report = run_suite(("headless", "breed", "forward"), pop_sizes=(10,), steps=20, repeat=1, verbose=False)
+    names = {r["name"] for r in report["results"]}
+    assert {"headless.step", "ga.breed_population", "PopulationNetwork.forward"} <= names
+    json.loads(json.dumps(report))
+    again = run_suite(("headless",), pop_sizes=(10,), steps=20, repeat=1, verbose=False)
+    assert again["results"][0]["steps"] == report["results"][0]["steps"]
+    compare(report, again)
+    assert "headless.step" in capsys.readouterr().out
+
+
+def test_hover_population_is_seeded():
+    np.testing.assert_array_equal(hover_population(5, seed=1), hover_population(5, seed=1))
+
+
+def test_memory_suite_reports_bytes_per_agent():
+    report = run_suite(("memory",), pop_sizes=(50,), steps=5, repeat=1, verbose=False)
+    sizes = {r["name"]: r["bytes_per_agent"] for r in report["results"]}
+    assert sizes["memory.birds_compact"] < sizes["memory.birds"]
+
+
+def test_tail_frames_only_simulate_survivors(monkeypatch):
+    pytest.importorskip("pygame")
+    monkeypatch.setenv("SDL_VIDEODRIVER", "dummy")
+    report = run_suite(("pygame",), pop_sizes=(2_000,), steps=10, repeat=1, verbose=False)
+    (tail,) = report["results"]
+    assert tail["name"] == "eval_population.tail" and 0 < tail["survivors"] <= TAIL_SURVIVORS
+
+
+def test_courses_suite_times_batched_and_separate_runs():
+    report = run_suite(("courses",), pop_sizes=(20_000,), steps=5, repeat=1, verbose=False)
+    names = [r["name"] for r in report["results"]]
+    assert names == ["courses.batched", "courses.headless"]
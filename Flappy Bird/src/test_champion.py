@@ -0,0 +1,34 @@
+import numpy as np
+
+from champion import ChampionPublisher, ChampionReader
+from spectator import ChampionWatch
+
+
+def test_reader_sees_only_improving_champions(tmp_path):
+    path = str(tmp_path / "champion.bin")
+    pub = ChampionPublisher(path, n_params=4)
+    reader = ChampionReader(path)
+    assert reader.read() is None and not reader.changed()
+
+    assert pub.publish(np.arange(4.0), 2.5, generation=1)
+    assert not pub.publish(np.ones(4), 2.0, generation=2)
+    assert reader.changed()
+    genome, fitness, generation = reader.read()
+    np.testing.assert_array_equal(genome, np.arange(4.0))
+    assert (fitness, generation) == (2.5, 1)
+    assert not reader.changed()
+
+    watch = ChampionWatch(reader)
+    assert watch and watch.check(0, 0) is None
+    pub.publish(np.ones(4), 3.0, generation=3)
+    assert watch.check(0, 0) == "new champion"
+
+
+def test_new_run_reuses_the_file_of_attached_readers(tmp_path):
+    path = str(tmp_path / "champion.bin")
+    ChampionPublisher(path, n_params=4).publish(np.arange(4.0), 9.0, 5)
+    reader = ChampionReader(path)
+    reader.read()
+    ChampionPublisher(path, n_params=4).publish(np.zeros(4), 1.0, 1)
+    assert reader.changed()
+    assert reader.read()[1:] == (1.0, 1)
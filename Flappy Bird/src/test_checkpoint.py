@@ -0,0 +1,61 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+# Add the src directory to the import path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from checkpoint import (
+    CheckpointWriter, checkpoint_mode, latest_checkpoint, latest_run, load_checkpoint,
+    new_run_name, save_checkpoint,
+)
+from trainer import Trainer
+
+
+def test_resume_reproduces_uninterrupted_run(tmp_path):
+    straight = Trainer(pop_size=40, seed=5, verbose=False)
+    straight.run(4)
+
+    writer = CheckpointWriter(str(tmp_path), keep=2)
+    first = Trainer(pop_size=40, seed=5, verbose=False)
+    first.run(2, checkpoints=writer)
+    writer.close()
+    assert latest_checkpoint(str(tmp_path)).endswith("gen_000002.npz")
+    assert len(os.listdir(tmp_path)) == 2
+
+    resumed = Trainer(pop_size=40, seed=99, verbose=False)
+    resumed.restore(*load_checkpoint(latest_checkpoint(str(tmp_path))))
+    resumed.run(4)
+    assert resumed.history == straight.history
+    np.testing.assert_array_equal(resumed.genomes, straight.genomes)
+    np.testing.assert_array_equal(resumed.hall_of_fame, straight.hall_of_fame)
+
+
+def test_latest_checkpoint_empty_dir(tmp_path):
+    assert latest_checkpoint(str(tmp_path)) is None
+
+
+def test_runs_prune_and_resume_only_their_own_files(tmp_path):
+    old = os.path.join(str(tmp_path), "run_old")
+    os.makedirs(old)
+    for g in (38, 39, 40):
+        save_checkpoint(os.path.join(old, f"gen_{g:06d}.npz"), {}, {"generation": g})
+    os.utime(os.path.join(old, "gen_000040.npz"), (0, 0))
+
+    writer = CheckpointWriter(os.path.join(str(tmp_path), new_run_name()), keep=2)
+    Trainer(pop_size=20, seed=1, verbose=False).run(3, checkpoints=writer)
+    writer.close()
+    assert sorted(os.listdir(old)) == ["gen_000038.npz", "gen_000039.npz", "gen_000040.npz"]
+    assert sorted(os.listdir(writer.directory)) == ["gen_000002.npz", "gen_000003.npz"]
+    assert latest_run(str(tmp_path)) == os.path.normpath(writer.directory)
+
+
+def test_restore_rejects_a_checkpoint_of_the_object_ga(tmp_path):
+    path = os.path.join(str(tmp_path), "gen_000001.npz")
+    save_checkpoint(path, {}, {"generation": 1, "course_rng": {}, "python_rng": {}})
+    arrays, meta = load_checkpoint(path)
+    assert checkpoint_mode(meta) == "objects"
+    assert checkpoint_mode(Trainer(pop_size=4, seed=0, verbose=False).state()[1]) == "vector"
+    with pytest.raises(ValueError, match="--ga objects"):
+        Trainer(pop_size=4, seed=0, verbose=False).restore(arrays, meta)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from bench import hover_population
+from course import Course
+from env import OBS_FEATURES, BatchFlappyEnv
+from headless import HeadlessSim
+from nn import PopulationNetwork
+
+
+def test_episode_scores_match_the_headless_engine():
+    brains = PopulationNetwork.from_weights(hover_population(64, seed=1, noise=0.5))
+    course = Course(seed=3)
+    fitness = HeadlessSim(brains, course=course).run(max_steps=600)
+
+    env = BatchFlappyEnv(course=course)
+    obs = env.reset(64)
+    score = np.full(64, -1)
+    total = np.zeros(64, dtype=int)
+    for _ in range(600):
+        obs, reward, done, info = env.step(brains.decide(obs[:, :brains.in_sz]))
+        total += reward
+        first = done & (score < 0)
+        score[first] = info["score"][first]
+    score[score < 0] = total[score < 0]
+    np.testing.assert_array_equal(score, fitness)
+
+
+def test_finished_games_are_reset_in_place():
+    env = BatchFlappyEnv(max_episode_steps=5)
+    obs = env.reset(8, seed=0)
+    assert obs.shape == (8, len(OBS_FEATURES))
+    for _ in range(4):
+        obs, reward, done, info = env.step(np.zeros(8, dtype=bool))
+    assert not done.any()
+    obs, reward, done, info = env.step(np.zeros(8, dtype=bool))
+    assert done.all() and info["truncated"].all()
+    np.testing.assert_array_equal(info["steps"], 5)
+    np.testing.assert_allclose(obs[:, 0], env.y / 600)
+    assert (env.steps == 0).all() and env.total_steps == 40
@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+from features import next_pipe, population_inputs, shared_features
+
+
+def test_next_pipe_skips_pipes_behind_the_birds():
+    assert next_pipe(np.array([-20.0, 100.0, 300.0])) == 1
+    assert next_pipe(np.array([-5.0, 100.0])) == 0   # right edge still ahead
+    assert next_pipe(np.array([-80.0])) is None
+
+
+def test_population_inputs_match_the_original_three_inputs():
+    shared = shared_features(x=250, height=200, gap=150, scroll_speed=130)
+    X = population_inputs(np.array([120.0, 300.0]), shared)
+    np.testing.assert_allclose(X, [[120 / 600, 275 / 600, 200 / 400],
+                                   [300 / 600, 275 / 600, 200 / 400]])
+    assert population_inputs(np.array([120.0]), shared, in_sz=4)[0, 3] == pytest.approx(130 / 170)
+    with pytest.raises(ValueError):
+        population_inputs(np.array([120.0]), shared, in_sz=5)
@@ -0,0 +1,87 @@
+import os
+import sys
+import numpy as np
+
+# Add the src directory to the import path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import ga
+from nn import NeuralNetwork
+
+
+def test_init_population_layout():
+    genomes = ga.init_population(10, np.random.default_rng(0))
+    assert genomes.shape == (10, ga.param_count())
+    nn = NeuralNetwork()
+    nn.set_weights(genomes[0])
+    assert not nn.b1.any() and not nn.b2.any()
+    assert nn.W1.any()
+
+
+def test_breed_population_keeps_elites_and_size():
+    rng = np.random.default_rng(1)
+    genomes = ga.init_population(50, rng)
+    fitness = np.arange(50)
+    new = ga.breed_population(genomes, fitness, rng, elite_k=3)
+    assert new.shape == genomes.shape
+    np.testing.assert_array_equal(new[:3], genomes[[49, 48, 47]])
+
+
+def test_breed_population_is_seeded():
+    genomes = ga.init_population(20, np.random.default_rng(2))
+    fitness = np.random.default_rng(3).integers(0, 10, 20)
+    a = ga.breed_population(genomes, fitness, np.random.default_rng(4), reinject=genomes[:2])
+    b = ga.breed_population(genomes, fitness, np.random.default_rng(4), reinject=genomes[:2])
+    np.testing.assert_array_equal(a, b)
+    np.testing.assert_array_equal(a[3:5], genomes[:2])
+
+
+def test_children_mix_only_elite_genes_without_mutation():
+    rng = np.random.default_rng(5)
+    genomes = ga.init_population(30, rng)
+    fitness = np.arange(30)
+    new = ga.breed_population(genomes, fitness, rng, elite_k=2, mrate=0.0)
+    elites = genomes[[29, 28]]
+    assert ((new[2:] == elites[0]) | (new[2:] == elites[1])).all()
+
+
+def test_compact_population_shares_one_float32_matrix():
+    from flappy_ai import birds_from_genomes, next_gen
+    genomes = ga.init_population(6, np.random.default_rng(0), dtype=np.float32)
+    pop = birds_from_genomes(genomes)
+    assert not hasattr(pop[0], "__dict__")
+    assert all(np.shares_memory(b.brain.params, genomes) for b in pop)
+    for i, b in enumerate(pop):
+        b.fitness = i
+    children = next_gen(pop, [], elite_k=3, mrate=0.5)
+    assert all(b.brain.params.dtype == np.float32 for b in children)
+    base = children[0].brain.params.base
+    assert base is not None and base.shape == (6, genomes.shape[1])
+    assert all(b.brain.params.base is base for b in children)
+    grandchildren = next_gen(children, [], elite_k=3, mrate=0.5)
+    assert all(np.shares_memory(b.brain.params, grandchildren[0].brain.params.base) for b in grandchildren)
+
+
+def test_resumed_genomes_load_into_one_matrix():
+    from flappy_ai import birds_from_genomes
+    saved = ga.init_population(5, np.random.default_rng(1))
+    pop = birds_from_genomes(saved, dtype=np.float32)
+    base = pop[0].brain.params.base
+    assert base.dtype == np.float32 and base.shape == saved.shape
+    assert all(b.brain.params.base is base for b in pop)
+    np.testing.assert_array_equal(base, saved.astype(np.float32))
+
+
+def test_seeded_object_generations_repeat():
+    from bird import Bird
+    from checkpoint import seed_python_rngs
+    from flappy_ai import eval_population_headless, next_gen
+    from budget import EvalBudget
+
+    def generation(seed):
+        seed_python_rngs(seed)
+        pop = [Bird(brain=NeuralNetwork()) for _ in range(8)]
+        eval_population_headless(pop, 3, collision_mode="geometric", budget=EvalBudget(max_sim_seconds=5))
+        return np.stack([b.brain.get_weights() for b in next_gen(pop, [], mrate=0.5)])
+
+    np.testing.assert_array_equal(generation(11), generation(11))
@@ -0,0 +1,118 @@
+import os
+import sys
+import subprocess
+import numpy as np
+
+# Add the src directory to the import path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from nn import NeuralNetwork, PopulationNetwork
+from headless import HeadlessSim
+from constants import MIN_BOTTOM_HEIGHT, SCREEN_HEIGHT, GROUND_HEIGHT
+
+
+def make_brains(n, seed=0):
+    np.random.seed(seed)
+    return PopulationNetwork.from_networks([NeuralNetwork() for _ in range(n)])
+
+
+def test_import_without_pygame():
+    code = ("import sys, headless, nn, ga, trainer, parallel, bird, pipe, flappy_ai; "
+            "assert 'pygame' not in sys.modules")
+    subprocess.run([sys.executable, "-c", code], check=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_run_until_all_dead_is_deterministic():
+    fits = [HeadlessSim(make_brains(50), rng=np.random.default_rng(3)).run()
+            for _ in range(2)]
+    np.testing.assert_array_equal(fits[0], fits[1])
+
+
+def test_pipes_respect_bottom_height():
+    sim = HeadlessSim(make_brains(5), rng=np.random.default_rng(0))
+    bottom = SCREEN_HEIGHT - (sim.pipe_height + sim.pipe_gap) - GROUND_HEIGHT
+    assert (bottom >= MIN_BOTTOM_HEIGHT).all()
+
+
+def test_falling_bird_dies_on_ground():
+    brains = make_brains(1)
+    brains.b2[:] = -100.0  # never flap
+    sim = HeadlessSim(brains, rng=np.random.default_rng(0))
+    sim.run(max_steps=1000)
+    assert not sim.alive[0]
+    assert sim.fitness[0] == 0
+
+
+def test_geometric_collision_gap_and_pipe():
+    from collision import hits
+    px, ph, pg = np.array([40.0]), np.array([200.0]), np.array([150.0])
+    # centered in the gap: 200..350, sprite is 45 tall
+    assert not hits(np.array([250.0]), np.array([0]), px, ph, pg)[0]
+    assert hits(np.array([180.0]), np.array([0]), px, ph, pg)[0]
+    assert hits(np.array([330.0]), np.array([-25]), px, ph, pg)[0]
+    # far from any pipe
+    assert not hits(np.array([100.0]), np.array([25]), np.array([300.0]), ph, pg)[0]
+
+
+def test_bounding_circle_prefilter_keeps_every_hit():
+    from collision import BIRD_X, _overlaps, hits, hits_each, pipe_rects
+    rng = np.random.default_rng(0)
+    y = rng.uniform(0, 480, 5000)
+    angle = rng.integers(-25, 26, 5000)
+    for x in (BIRD_X - 60.0, BIRD_X - 20.0, BIRD_X + 10.0, BIRD_X + 40.0):
+        px, ph, pg = np.array([x]), np.array([180.0]), np.array([140.0])
+        exact = _overlaps(y, angle, pipe_rects(px, ph, pg)[None], BIRD_X)
+        np.testing.assert_array_equal(hits(y, angle, px, ph, pg), exact)
+        np.testing.assert_array_equal(hits_each(y, angle, np.full(5000, x), 180.0, 140.0), exact)
+
+
+def test_parallel_matches_single_process():
+    from parallel import ParallelEvaluator, eval_shard
+    np.random.seed(7)
+    genomes = np.stack([NeuralNetwork().get_weights() for _ in range(64)])
+    genomes[:, 6:12] = np.random.randn(64, 6)  # hidden biases, for varied play
+    single = eval_shard(genomes, seed=11)
+    with ParallelEvaluator(workers=3) as ev:
+        np.testing.assert_array_equal(ev.evaluate(genomes, seed=11), single)
+
+
+def test_fitness_cache_hits_match_fresh_evaluation():
+    from course import Course, FitnessCache
+    from headless import evaluate
+    np.random.seed(2)
+    genomes = np.stack([NeuralNetwork().get_weights() for _ in range(30)])
+    genomes[:, 6:12] = np.random.randn(30, 6)
+
+    def simulate(idx):
+        return evaluate(PopulationNetwork.from_weights(genomes[idx]), course=Course(42))
+
+    cache = FitnessCache()
+    first, hits = cache.evaluate(genomes, 42, "test", simulate)
+    assert hits == 0
+    again, hits = cache.evaluate(genomes[::-1], 42, "test", simulate)
+    assert hits == 30
+    np.testing.assert_array_equal(again, first[::-1])
+    _, hits = cache.evaluate(genomes, 43, "test", simulate)
+    assert hits == 0
+
+
+def test_course_is_deterministic():
+    from course import Course
+    a, b = Course(7), Course(7)
+    assert [a[i] for i in range(20)] == [b[i] for i in range(20)]
+
+
+def test_pipe_budget_caps_fitness_with_tiebreak():
+    from budget import EvalBudget
+    from course import Course
+    from headless import evaluate
+    rng = np.random.default_rng(5)
+    brains = PopulationNetwork.from_weights(rng.normal(size=(300, 31)))
+    budget = EvalBudget(max_pipes=1)
+    fitness = evaluate(brains, course=Course(9), budget=budget)
+    assert budget.reason == "pipes"
+    survivors = fitness[fitness > 1]
+    assert len(survivors)
+    assert (survivors <= 1.5).all()
+    np.testing.assert_array_equal(fitness, evaluate(brains, course=Course(9), budget=EvalBudget(max_pipes=1)))
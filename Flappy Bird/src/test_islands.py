@@ -0,0 +1,31 @@
+import numpy as np
+
+from budget import EvalBudget
+from islands import gather_migrants, route, run_islands
+
+
+def test_ring_route_sends_to_the_next_island():
+    assert route(4, "ring", np.random.default_rng(0)) == [1, 2, 3, 0]
+
+
+def test_random_route_never_sends_to_itself():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        dest = route(5, "random", rng)
+        assert all(d != i and 0 <= d < 5 for i, d in enumerate(dest))
+
+
+def test_every_source_migrants_arrive():
+    tops = [np.full((6, 3), float(i)) for i in range(4)]
+    incoming = gather_migrants(tops, [3, 3, 0, 0], migrants=2)
+    assert incoming[1] is None and incoming[2] is None
+    assert sorted(incoming[3][:, 0]) == [0, 0, 1, 1]
+    assert sorted(incoming[0][:, 0]) == [2, 2, 3, 3]
+    arrived = np.concatenate([m for m in incoming if m is not None])
+    assert sorted(arrived[:, 0]) == sorted(np.repeat(np.arange(4.0), 2))
+
+
+def test_budgeted_islands_finish():
+    result = run_islands(2, generations=2, interval=1, migrants=2, topology="random", pop_size=10,
+                         seed=0, verbose=False, budget=EvalBudget(max_sim_seconds=5))
+    assert result["island_best"].shape == (2, 2)
@@ -1,11 +1,12 @@
 import os
 import sys
 import numpy as np
+import pytest
 
 # Add the src directory to the import path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from nn import NeuralNetwork
+from nn import NeuralNetwork, PopulationNetwork
 
 
 def test_get_set_weights_roundtrip():
@@ -22,3 +23,44 @@ def test_forward_output_shape():
     out = nn.forward(x)
     assert isinstance(out, np.ndarray)
     assert out.shape == (1, 1)
+
+
+def test_population_forward_matches_single():
+    nets = [NeuralNetwork() for _ in range(4)]
+    for nn in nets:
+        nn.b1[:] = np.random.randn(*nn.b1.shape)
+    pop = PopulationNetwork.from_networks(nets)
+    X = np.random.rand(4, 3)
+    out = pop.forward(X)
+    assert out.shape == (4, 1)
+    for i, nn in enumerate(nets):
+        np.testing.assert_allclose(out[i], nn.forward(X[i])[:, 0])
+    sub = pop.forward(X[[1, 3]], np.array([3, 1]))
+    np.testing.assert_allclose(sub[0], nets[3].forward(X[1])[:, 0])
+
+
+def test_population_from_weights_matches_networks():
+    nets = [NeuralNetwork() for _ in range(3)]
+    a = PopulationNetwork.from_networks(nets)
+    b = PopulationNetwork.from_weights(np.stack([nn.get_weights() for nn in nets]))
+    for x, y in zip((a.W1, a.b1, a.W2, a.b2), (b.W1, b.b1, b.W2, b.b2)):
+        np.testing.assert_array_equal(x, y)
+
+
+def test_layers_are_views_of_one_buffer():
+    nn = NeuralNetwork()
+    assert nn.get_weights() is nn.params
+    nn.set_weights(np.arange(31.0))
+    assert nn.W1[1, 0] == 3 and nn.b1[0, 0] == 18 and nn.b2[0, 0] == 30
+    nn.W2[0, 0] = -1.0
+    assert nn.params[24] == -1.0
+
+
+def test_network_wraps_a_population_row_without_copying():
+    genomes = np.random.randn(4, 31)
+    nn = NeuralNetwork(params=genomes[2])
+    assert np.shares_memory(nn.W1, genomes)
+    genomes[2, 0] = 7.0
+    assert nn.W1[0, 0] == 7.0
+    with pytest.raises(ValueError):
+        NeuralNetwork(params=genomes[:, 0])
@@ -0,0 +1,41 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from course import Course, VALID_PIPES
+from pipe import PipePool
+
+
+def test_course_pipes_leave_room_for_the_bottom_pipe():
+    course = Course(3, length=1000)
+    bottom = 600 - (course.heights + course.gaps) - 100
+    assert bottom.min() >= 50
+    assert course[5000] == Course(3)[5000]
+    assert len(VALID_PIPES) == len({tuple(p) for p in VALID_PIPES.tolist()})
+
+
+def test_pool_recycles_slots_in_spawn_order():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    course = Course(1)
+    pool = PipePool(course, capacity=3, display=False)
+    first = [pool.spawn(x) for x in (0, 100, 200)]
+    assert [p.x for p in pool] == [0, 100, 200]
+    assert [(p.height, p.gap) for p in pool] == [course[i] for i in range(3)]
+
+    first[0].x = first[1].x = -100
+    assert pool.recycle() == 2
+    reused = pool.spawn(300)
+    assert reused is first[0] and not reused.passed
+    assert (reused.height, reused.gap) == course[3]
+    assert [p.x for p in pool] == [200, 300]
+    assert pool[-1] is reused
+
+    pool.spawn(400)
+    pool.spawn(500)  # grows past the initial capacity
+    assert [p.x for p in pool] == [200, 300, 400, 500]
+    with pytest.raises(IndexError):
+        pool[4]
@@ -0,0 +1,26 @@
+import json
+
+from profiling import PhaseProfiler
+
+
+def test_disabled_profiler_records_nothing():
+    prof = PhaseProfiler()
+    assert prof.phase("think") is prof.phase("update")
+    with prof.phase("think"):
+        pass
+    assert prof.totals == {}
+
+
+def test_phases_are_counted_reported_and_traced(tmp_path, capsys):
+    prof = PhaseProfiler(enabled=True, trace_path=str(tmp_path / "trace.json"))
+    for _ in range(3):
+        with prof.phase("think"):
+            pass
+    with prof.phase("update"):
+        pass
+    assert prof.report()["think"][1] == 3
+    assert "think" in capsys.readouterr().out
+    assert prof.totals == {} and prof.cumulative["update"][1] == 1
+    events = json.load(open(prof.write_trace()))["traceEvents"]
+    assert [e["name"] for e in events] == ["think"] * 3 + ["update"]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
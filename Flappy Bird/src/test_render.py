@@ -0,0 +1,56 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from types import SimpleNamespace
+
+import numpy as np
+import pygame
+
+from bench import hover_population
+from budget import EvalBudget
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from course import Course
+from headless import HeadlessSim
+from nn import PopulationNetwork
+from render import Renderer
+
+
+def make_renderer(**kw):
+    pygame.init()
+    return Renderer(pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT)), **kw)
+
+
+def test_render_every_nth_step():
+    r = make_renderer(render_every=3)
+    assert [r.due() for _ in range(7)] == [True, False, False, True, False, False, True]
+
+
+def test_top_k_keeps_elites_and_draws_them_last():
+    r = make_renderer(top_k=3)
+    pop = [SimpleNamespace(alive=a, is_elite=e) for a, e in
+           [(True, True), (False, False), (True, False), (True, False), (True, False)]]
+    assert r.visible_birds(pop) == [pop[2], pop[3], pop[0]]
+
+
+def test_dirty_rect_frame_updates_only_what_changed():
+    r = make_renderer(dirty_rects=True, top_k=0)
+    r.draw([], [], best=3)
+    assert r.frames == 1
+    assert all(rect.height < SCREEN_HEIGHT for rect in r._dirty)
+
+
+def test_fast_visual_fitness_matches_headless():
+    from flappy_ai import birds_from_genomes, eval_population
+    genomes = hover_population(200, seed=0, noise=0.8)
+    reference = HeadlessSim(PopulationNetwork.from_weights(genomes), course=Course(3)).run(
+        budget=EvalBudget(max_sim_seconds=15))
+
+    def play(display, collision_mode):
+        pop = birds_from_genomes(genomes)
+        eval_population(pop, display=display, collision_mode=collision_mode, course=Course(3),
+                        budget=EvalBudget(max_sim_seconds=15), render_every=10)
+        return np.array([b.fitness for b in pop])
+
+    np.testing.assert_array_equal(play(True, "geometric"), reference)
+    np.testing.assert_array_equal(play(True, "mask"), play(False, "mask"))
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from bench import hover_population
+from budget import EvalBudget
+from course import Course, FitnessCache, rules_key
+from headless import HeadlessSim, MultiCourseSim
+from nn import PopulationNetwork
+from robust import CourseSet, course_report, parse_aggregate
+from simclock import SimClock
+from trainer import Trainer
+
+
+@pytest.mark.parametrize("clock", [None, SimClock(40, 2, swept=True)])
+def test_each_course_matches_its_own_headless_run(clock):
+    brains = PopulationNetwork.from_weights(hover_population(40, seed=1, noise=0.8))
+    seeds = [3, 4, 5]
+    alone = np.stack([HeadlessSim(brains, course=Course(s), clock=clock).run(max_steps=500) for s in seeds], axis=1)
+    batched = MultiCourseSim(brains, [Course(s) for s in seeds], clock=clock).run(max_steps=500)
+    np.testing.assert_array_equal(batched, alone)
+
+
+def test_pipe_budget_caps_every_course_separately():
+    brains = PopulationNetwork.from_weights(hover_population(20, seed=0))
+    seeds = [7, 8]
+    alone = np.stack([HeadlessSim(brains, course=Course(s)).run(budget=EvalBudget(max_pipes=3)) for s in seeds],
+                     axis=1)
+    budget = EvalBudget(max_pipes=3)
+    batched = MultiCourseSim(brains, [Course(s) for s in seeds]).run(budget=budget)
+    np.testing.assert_array_equal(batched, alone)
+    assert budget.reason == "pipes" and batched.max() < 4
+
+
+def test_aggregates_and_report():
+    scores = np.array([[1.0, 3.0, 5.0], [2.0, 2.0, 2.0]])
+    assert CourseSet(3, "mean").combine(scores).tolist() == [3.0, 2.0]
+    assert CourseSet(3, "min").combine(scores).tolist() == [1.0, 2.0]
+    assert CourseSet(3, "q0.5").combine(scores).tolist() == [3.0, 2.0]
+    report = course_report(scores)
+    assert report["course_means"].tolist() == [1.5, 2.5, 3.5] and report["inconsistent"] == 0.5
+    assert CourseSet(2).seeds(2**32 - 1) == [2**32 - 1, 0]
+    assert rules_key("soa", courses=CourseSet(2)) != rules_key("soa", courses=CourseSet(2, "min"))
+    with pytest.raises(ValueError):
+        parse_aggregate("q2")
+
+
+def test_trainer_scores_the_aggregate_over_courses():
+    trainer = Trainer(12, seed=0, verbose=False, course_seed=4, courses=CourseSet(3, "min"),
+                      budget=EvalBudget(max_sim_seconds=10))
+    fitness = trainer.evaluate()
+    brains = PopulationNetwork.from_weights(trainer.genomes)
+    scores = MultiCourseSim(brains, CourseSet(3).courses(4)).run(budget=EvalBudget(max_sim_seconds=10))
+    np.testing.assert_array_equal(fitness, scores.min(axis=1))
+
+
+def test_pipe_budget_applies_to_cached_fitness():
+    budget = EvalBudget(max_pipes=3)
+    trainer = Trainer(10, seed=0, verbose=False, course_seed=6, cache=FitnessCache(), budget=budget)
+    trainer.cache.evaluate(trainer.genomes, 6, rules_key("soa", budget=budget),
+                           lambda idx: np.full(len(idx), 3.2))
+    fitness = trainer.evaluate()
+    assert fitness.max() == 3.2 and budget.reason == "pipes"
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import collision
+from bench import hover_population
+from budget import EvalBudget
+from course import Course, rules_key
+from headless import HeadlessSim
+from nn import PopulationNetwork
+from simclock import SimClock, consistency_report, rank_correlation
+
+
+def test_default_clock_matches_the_plain_timestep():
+    brains = PopulationNetwork.from_weights(hover_population(40, seed=2, noise=0.8))
+    plain = HeadlessSim(brains, course=Course(5)).run(max_steps=400)
+    clocked = HeadlessSim(brains, course=Course(5), clock=SimClock()).run(max_steps=400)
+    np.testing.assert_array_equal(plain, clocked)
+    assert rules_key("soa", clock=SimClock()) != rules_key("soa", clock=SimClock(substeps=2))
+    with pytest.raises(ValueError):
+        SimClock(substeps=0)
+
+
+def test_swept_collision_catches_a_pipe_that_scrolled_past():
+    y, angle = np.array([50.0]), np.array([0])
+    pipe = (np.array([-200.0]), np.array([300.0]), np.array([150.0]))
+    assert not collision.hits(y, angle, *pipe).any()
+    assert collision.hits_swept(y, y, angle, *pipe, scroll_dx=300.0).all()
+    assert not collision.hits_swept(y, y, angle, *pipe, scroll_dx=10.0).any()
+
+
+def test_consistency_report_compares_against_the_first_clock():
+    genomes = hover_population(30, seed=0, noise=1.0)
+    rows = consistency_report(genomes, 0, [SimClock(), SimClock(substeps=2, swept=True)],
+                              EvalBudget(max_sim_seconds=10), top_k=5)
+    assert rows[0]["rank_corr"] == pytest.approx(1.0) and rows[0]["mean_abs_diff"] == 0
+    assert -1 <= rows[1]["rank_corr"] <= 1
+    assert rank_correlation([1, 2, 2, 3], [3, 2, 2, 1]) == pytest.approx(-1.0)
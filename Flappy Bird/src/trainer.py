@@ -0,0 +1,225 @@
+"""
+Array-level training loop: the whole population is one (pop, n_params) genome
+matrix, evaluated by the headless engine and bred with the vectorized
+operators in ``ga``. Needs no pygame.
+"""
+import numpy as np
+
+import ga
+from archive import GenomeArchive, genome_key
+from checkpoint import checkpoint_mode
+import headless
+from course import rules_key, shared_course
+from nn import PopulationNetwork
+from profiling import profiler
+from robust import course_report, format_report
+
+
+class Trainer:
+    """
+    Genetic algorithm over a genome matrix.
+
+    Attributes:
+        genomes (np.ndarray): Current population, shape (pop, n_params).
+        fitness (np.ndarray or None): Fitness of ``genomes`` once evaluated.
+        archive (GenomeArchive): Hall of fame of the best distinct genomes.
+        history (list): (best, mean) fitness of every evaluated generation.
+        generation (int): Number of generations evaluated.
+        rng (np.random.Generator): Source of course seeds and breeding noise.
+    """
+    def __init__(self, pop_size=150, seed=None, evaluator=None, sizes=(3, 6, 1),
+                 elite_k=3, reinject_k=3, hof_size=5, mrate=0.04, verbose=True,
+                 course_seed=None, cache=None, budget=None, publisher=None, dtype=np.float64,
+                 clock=None, courses=None):
+        """
+        Initialize a random population.
+
+        Args:
+            pop_size (int): Number of genomes.
+            seed (int, optional): Seed for genomes, courses and breeding.
+            evaluator (ParallelEvaluator, optional): Multi-process evaluator.
+                Defaults to evaluating in this process.
+            sizes (tuple): (in_sz, hid_sz, out_sz) of the networks.
+            elite_k (int): Elites kept and used as parents.
+            reinject_k (int): Hall of fame genomes reinjected every generation.
+            hof_size (int): Hall of fame capacity.
+            mrate (float): Per-weight mutation probability.
+            verbose (bool): Print per-generation progress.
+            course_seed (int, optional): Play this one course every generation
+                instead of a fresh seeded course each time.
+            cache (FitnessCache, optional): Reuse the fitness of genomes
+                already scored on the same course.
+            budget (EvalBudget, optional): Per-generation evaluation limits.
+                Training stops after the first generation that exhausts it.
+            publisher (ChampionPublisher, optional): Receives every new best
+                genome, e.g. for ``spectator.py``.
+            dtype (np.dtype): Floating point type of the genome matrix;
+                float32 halves its memory for large populations.
+            clock (SimClock, optional): Timestep, substeps and collision
+                sweeping of the headless engine.
+            courses (CourseSet, optional): Score every genome on K seeded
+                courses per generation and combine the scores.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.sizes = sizes
+        self.evaluator = evaluator
+        self.elite_k = elite_k
+        self.reinject_k = reinject_k
+        self.hof_size = hof_size
+        self.mrate = mrate
+        self.verbose = verbose
+        self.course_seed = course_seed
+        self.cache = cache
+        self.budget = budget
+        self.publisher = publisher
+        self.clock = clock
+        self.courses = courses
+        self.genomes = ga.init_population(pop_size, self.rng, sizes, dtype)
+        self.fitness = None
+        self.archive = GenomeArchive(hof_size)
+        self.history = []
+        self.generation = 0
+
+    def _simulate(self, genomes, seed):
+        if self.courses is not None:
+            return self._simulate_courses(genomes, seed)
+        if self.evaluator is not None:
+            return self.evaluator.evaluate(genomes, seed, self.budget, self.clock)
+        brains = PopulationNetwork.from_weights(genomes, *self.sizes)
+        return headless.evaluate(brains, course=shared_course(seed), verbose=self.verbose,
+                                 budget=self.budget, clock=self.clock)
+
+    def _simulate_courses(self, genomes, seed):
+        if self.evaluator is not None:
+            scores = self.evaluator.evaluate(genomes, seed, self.budget, self.clock, self.courses)
+        else:
+            brains = PopulationNetwork.from_weights(genomes, *self.sizes)
+            scores = headless.evaluate_courses(brains, self.courses.courses(seed), verbose=self.verbose,
+                                               budget=self.budget, clock=self.clock)
+        if self.verbose and len(scores):
+            print(format_report(course_report(scores)))
+        return self.courses.combine(scores)
+
+    def evaluate(self):
+        """Score the current population on its seeded course."""
+        seed = self.course_seed if self.course_seed is not None else int(self.rng.integers(2**32))
+        if self.budget:
+            self.budget.reason = None
+        if self.cache is None or (self.budget and not self.budget.deterministic):
+            self.fitness = self._simulate(self.genomes, seed)
+        else:
+            self.fitness, hits = self.cache.evaluate(
+                self.genomes, seed, rules_key("soa", budget=self.budget, clock=self.clock, courses=self.courses),
+                lambda idx: self._simulate(self.genomes[idx], seed))
+            if self.budget:
+                self.budget.check_cached(self.fitness)
+            if hits and self.verbose:
+                print(f"  [Cache] {hits}/{len(self.genomes)} genomes already scored on this course, simulation skipped")
+        self.generation += 1
+        self.history.append((float(self.fitness.max()), float(self.fitness.mean())))
+        return self.fitness
+
+    @property
+    def hall_of_fame(self):
+        """Best distinct genomes seen so far, fittest first."""
+        best = self.archive.best()
+        return np.array([g for _, g, _ in best]).reshape(len(best), self.genomes.shape[1])
+
+    @property
+    def hof_fitness(self):
+        """Fitness of the hall of fame genomes."""
+        return np.array([f for f, _, _ in self.archive.best()], dtype=float)
+
+    def update_hall_of_fame(self):
+        """Offer the evaluated population to the hall of fame archive."""
+        self.archive.add_many(self.genomes, self.fitness)
+
+    def breed(self):
+        """Replace the population with the next generation."""
+        order = np.argsort(-self.fitness, kind="stable")
+        elites = {genome_key(self.genomes[i]) for i in order[:self.elite_k]}
+        reinject = [w for w in self.hall_of_fame[:self.reinject_k] if genome_key(w) not in elites]
+        reinject = np.array(reinject).reshape(-1, self.genomes.shape[1])
+        self.genomes = ga.breed_population(self.genomes, self.fitness, self.rng,
+                                           elite_k=self.elite_k, mrate=self.mrate, reinject=reinject)
+        self.fitness = None
+
+    def state(self):
+        """
+        Full training state for ``checkpoint.save_checkpoint``.
+
+        Returns:
+            tuple: (arrays dict, meta dict).
+        """
+        history = np.array(self.history, dtype=float).reshape(-1, 2)
+        arrays = {
+            "genomes": self.genomes,
+            "hof_genomes": self.hall_of_fame,
+            "hof_fitness": self.hof_fitness,
+            "history": history,
+        }
+        meta = {"ga": "vector", "generation": self.generation, "rng": self.rng.bit_generator.state,
+                "sizes": list(self.sizes)}
+        return arrays, meta
+
+    def restore(self, arrays, meta):
+        """
+        Resume from a state produced by ``state``.
+
+        Raises:
+            ValueError: If the checkpoint was written by the object GA.
+        """
+        mode = checkpoint_mode(meta)
+        if mode != "vector":
+            raise ValueError(f"Checkpoint was written by --ga {mode}, not by the vector GA")
+        self.genomes = arrays["genomes"]
+        self.fitness = None
+        self.archive = GenomeArchive(self.archive.capacity, self.archive.quantum)
+        self.archive.add_many(arrays["hof_genomes"], arrays["hof_fitness"])
+        self.history = [(float(b), float(m)) for b, m in arrays["history"]]
+        self.generation = meta["generation"]
+        self.sizes = tuple(meta["sizes"])
+        self.rng.bit_generator.state = meta["rng"]
+
+    def step(self):
+        """Evaluate, update the hall of fame and breed one generation."""
+        with profiler.phase("evaluate"):
+            self.evaluate()
+        with profiler.phase("hall_of_fame"):
+            self.update_hall_of_fame()
+        if self.publisher is not None:
+            fitness, genome, _ = self.archive.best(1)[0]
+            self.publisher.publish(genome, fitness, self.generation)
+        best, mean = self.history[-1]
+        if self.verbose:
+            print(f"  Best: {best:g}   Avg: {mean:.1f}")
+        with profiler.phase("breed"):
+            self.breed()
+        if self.verbose:
+            profiler.report()
+
+    def run(self, generations, checkpoints=None, checkpoint_every=1):
+        """
+        Train until ``generations`` generations have been evaluated or a
+        generation exhausts the evaluation budget.
+
+        Args:
+            generations (int): Total number of generations.
+            checkpoints (CheckpointWriter, optional): Background writer that
+                receives the state every ``checkpoint_every`` generations.
+            checkpoint_every (int): Generations between checkpoints.
+
+        Returns:
+            np.ndarray: Best genome found (top of the hall of fame).
+        """
+        while self.generation < generations:
+            if self.verbose:
+                print(f"Gen {self.generation + 1}/{generations} — display=OFF")
+            self.step()
+            if checkpoints is not None and self.generation % checkpoint_every == 0:
+                checkpoints.submit(self.generation, *self.state())
+            if self.budget and self.budget.reason:
+                if self.verbose:
+                    print(f"  [Budget] {self.budget.reason} limit reached, stopping training")
+                break
+        return self.hall_of_fame[0]